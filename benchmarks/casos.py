@@ -0,0 +1,201 @@
+# benchmarks/casos.py
+
+import os
+
+import numpy as np
+
+from simulador.datos import PARAMETROS_BASE
+
+
+# CASOS DE RENDIMIENTO
+#
+# Cada caso prepara sus datos fuera del tiempo medido y devuelve la función
+# que se cronometra. `iteraciones` es lo que cuenta para iteraciones/s:
+# llamadas, filas o corridas según el caso.
+
+PARAMETROS = PARAMETROS_BASE
+
+SEMILLA = 2025
+
+
+class Caso:
+    """
+    preparar(n) -> función sin argumentos a cronometrar.
+    requiere = módulos sin los cuales el caso se omite.
+    """
+
+    __slots__ = ("nombre", "preparar", "tamanos", "requiere")
+
+    def __init__(self, nombre, preparar, tamanos, requiere=()):
+        self.nombre = nombre
+        self.preparar = preparar
+        self.tamanos = tuple(tamanos)
+        self.requiere = tuple(requiere)
+
+
+def _simulacion(n):
+    from simulador.simulacion import correr_simulacion_lote
+    return correr_simulacion_lote(PARAMETROS, n, semilla=SEMILLA)
+
+
+# -- generadores --
+
+def _generar_discreta(n):
+    from simulador.generadores import generar_discreta
+
+    def medir():
+        for _ in range(n):
+            generar_discreta(PARAMETROS["cf_valores"], PARAMETROS["cf_probs"])
+    return medir
+
+
+def _generar_discreta_lote(n):
+    from simulador.generadores import generar_discreta_lote, fijar_semilla
+    fijar_semilla(SEMILLA)
+    return lambda: generar_discreta_lote(PARAMETROS["cf_valores"], PARAMETROS["cf_probs"], n)
+
+
+# -- finanzas y flujo de caja --
+
+def _calcular_van(n):
+    from simulador.finanzas import calcular_van
+    flujos = np.random.default_rng(SEMILLA).uniform(1e5, 2e5, (n, PARAMETROS["vida"])).tolist()
+
+    def medir():
+        for flujo in flujos:
+            calcular_van(PARAMETROS["inversion_inicial"], PARAMETROS["tasa_descuento"], flujo)
+    return medir
+
+
+def _calcular_van_lote(n):
+    from simulador.finanzas import calcular_van_lote
+    flujos = np.random.default_rng(SEMILLA).uniform(1e5, 2e5, (n, PARAMETROS["vida"]))
+    return lambda: calcular_van_lote(
+        PARAMETROS["inversion_inicial"], PARAMETROS["tasa_descuento"], flujos
+    )
+
+
+def _entradas(n):
+    from simulador.muestreo import muestrear_entradas
+    return muestrear_entradas(PARAMETROS, n, np.random.default_rng(SEMILLA))
+
+
+def _flujo_caja_anual(n):
+    from simulador.flujo_caja import flujo_caja_anual
+    entradas = list(zip(*(e.tolist() for e in _entradas(n))))
+
+    def medir():
+        for demanda, precio, cv, cf in entradas:
+            flujo_caja_anual(demanda, precio, cv, cf,
+                             PARAMETROS["depreciacion"], PARAMETROS["tasa_impuesto"])
+    return medir
+
+
+def _flujo_caja_anual_arreglos(n):
+    from simulador.flujo_caja import flujo_caja_anual
+    demanda, precio, cv, cf = _entradas(n)
+    return lambda: flujo_caja_anual(demanda, precio, cv, cf,
+                                    PARAMETROS["depreciacion"], PARAMETROS["tasa_impuesto"])
+
+
+# -- simulación --
+
+def _correr_simulacion(n):
+    from simulador.simulacion import correr_simulacion
+    return lambda: correr_simulacion(PARAMETROS, n)
+
+
+def _correr_simulacion_lote(n):
+    from simulador.simulacion import correr_simulacion_lote
+    return lambda: correr_simulacion_lote(PARAMETROS, n, semilla=SEMILLA)
+
+
+# -- validación y reportes --
+
+def _validar_aleatorios(n):
+    from simulador.validacion import validar_aleatorios
+    return lambda: validar_aleatorios(PARAMETROS, n, semilla=SEMILLA)
+
+
+def _tabla_frecuencias(n):
+    from simulador.reportes import tabla_frecuencias
+    vans = _simulacion(n).van
+    return lambda: tabla_frecuencias(vans)
+
+
+def _generar_reporte_pdf(n):
+    """Gráfica del VAN (matplotlib y PNG) más el PDF, n veces."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from simulador.pdf_report import generar_reporte_pdf
+    from simulador.simulacion import correr_simulacion_lote
+
+    resultado = correr_simulacion_lote(PARAMETROS, 10_000, semilla=SEMILLA, validar=True)
+    pruebas = resultado.validacion.resultados()
+
+    def medir():
+        for _ in range(n):
+            fig, ax = plt.subplots()
+            ax.hist(resultado.van, bins=40)
+            fig.savefig("grafica_van.png", dpi=200)
+            plt.close(fig)
+            generar_reporte_pdf(resultado.resumen, pruebas, "grafica_van.png")
+    return medir
+
+
+# -- persistencia --
+
+# Cadena de conexión de una base SQL Server de pruebas; sin ella el caso se omite
+VARIABLE_SQLSERVER = "DEVIMULATOR_BENCH_SQLSERVER"
+
+
+def _backend_sqlite():
+    from simulador.persistencia import BackendSQLite
+    return BackendSQLite()
+
+
+def _backend_sqlserver():
+    from simulador.persistencia import BackendSQLServer
+    return BackendSQLServer(os.environ[VARIABLE_SQLSERVER])
+
+
+def _guardar_simulacion(crear_backend):
+    """Parámetros, resumen y n iteraciones del VAN en una transacción."""
+    def preparar(n):
+        from simulador.persistencia import RepositorioSimulacion
+        resultado = _simulacion(n)
+        repositorio = RepositorioSimulacion(crear_backend())
+        return lambda: repositorio.guardar_simulacion(
+            PARAMETROS, n, resultado.resumen, resultado.van
+        )
+    return preparar
+
+
+CASOS = [
+    Caso("generar_discreta", _generar_discreta, (10**3, 10**5)),
+    Caso("generar_discreta_lote", _generar_discreta_lote, (10**5, 10**7)),
+    Caso("calcular_van", _calcular_van, (10**3, 10**5)),
+    Caso("calcular_van_lote", _calcular_van_lote, (10**5, 10**6)),
+    Caso("flujo_caja_anual", _flujo_caja_anual, (10**3, 10**5)),
+    Caso("flujo_caja_anual_arreglos", _flujo_caja_anual_arreglos, (10**5, 10**7)),
+    Caso("correr_simulacion", _correr_simulacion, (10**3, 10**4)),
+    Caso("correr_simulacion_lote", _correr_simulacion_lote, (10**3, 10**4, 10**5, 10**6, 10**7)),
+    Caso("validar_aleatorios", _validar_aleatorios, (10**4, 10**6)),
+    Caso("tabla_frecuencias", _tabla_frecuencias, (10**4, 10**6)),
+    Caso("generar_reporte_pdf", _generar_reporte_pdf, (1,), requiere=("matplotlib", "reportlab")),
+    Caso("guardar_simulacion_sqlite", _guardar_simulacion(_backend_sqlite), (10**4, 10**6)),
+    Caso("guardar_simulacion_sqlserver", _guardar_simulacion(_backend_sqlserver), (10**4, 10**6),
+         requiere=("pyodbc",)),
+]
+
+CASOS_POR_NOMBRE = {caso.nombre: caso for caso in CASOS}
+
+
+def faltantes(caso):
+    """Módulos (o la base de pruebas de SQL Server) que le faltan al caso."""
+    from importlib.util import find_spec
+    faltan = [m for m in caso.requiere if find_spec(m) is None]
+    if caso.nombre.endswith("_sqlserver") and not os.environ.get(VARIABLE_SQLSERVER):
+        faltan.append(VARIABLE_SQLSERVER)
+    return faltan
@@ -0,0 +1,317 @@
+# benchmarks/ejecutar.py
+"""
+Mide los casos de benchmarks/casos.py y los compara con una línea base.
+
+    python -m benchmarks.ejecutar                       # todos los casos
+    python -m benchmarks.ejecutar --casos correr_simulacion_lote --max-iteraciones 1000000
+    python -m benchmarks.ejecutar --guardar-linea-base  # fija la referencia
+
+Cada caso y tamaño corre en su propio proceso (para que la RSS máxima sea
+solo la suya; en Linux se mide desde el final de la preparación) dentro de una carpeta temporal, así que el PDF, la gráfica,
+la caché y la base SQLite no tocan el repositorio. Las corridas se agregan
+a benchmarks/resultados/historial.json. Si un caso tarda más que la línea
+base por encima del umbral, el comando termina con código 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.casos import CASOS, CASOS_POR_NOMBRE, faltantes
+
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CARPETA_RESULTADOS = os.path.join(RAIZ, "benchmarks", "resultados")
+RUTA_HISTORIAL = os.path.join(CARPETA_RESULTADOS, "historial.json")
+RUTA_LINEA_BASE = os.path.join(CARPETA_RESULTADOS, "linea_base.json")
+
+# Cuánto más lento que la línea base se considera una regresión
+UMBRAL_REGRESION = 0.20
+
+# Diferencias menores que esta se consideran ruido aunque superen el umbral
+DIFERENCIA_MINIMA_S = 0.002
+
+TIEMPO_MAXIMO_CASO = 1800
+
+
+def _estado_proceso_mb(campo):
+    """Campo de memoria de /proc/self/status en MB (None fuera de Linux)."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for linea in f:
+                if linea.startswith(campo + ":"):
+                    return int(linea.split()[1]) / 2**10
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def rss_actual_mb():
+    """RSS del proceso en este momento, en MB (None fuera de Linux)."""
+    return _estado_proceso_mb("VmRSS")
+
+
+def reiniciar_rss_maxima():
+    """
+    Lleva la RSS máxima del proceso a la RSS actual, para que el pico
+    medido después no incluya la preparación. False donde no se puede.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+    except OSError:
+        return False
+    return _estado_proceso_mb("VmHWM") is not None
+
+
+def rss_maxima_mb():
+    """RSS máxima del proceso en MB (None donde no hay módulo resource)."""
+    pico = _estado_proceso_mb("VmHWM")  # en Linux, desde el último reinicio
+    if pico is not None:
+        return pico
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux la da en KB, macOS en bytes
+    return rss / 2**20 if sys.platform == "darwin" else rss / 2**10
+
+
+def medir(nombre, n, repeticiones):
+    """
+    Ejecuta un caso en este proceso y devuelve sus métricas.
+
+    rss_preparacion_mb es la RSS después de preparar(n) y rss_max_mb el pico
+    durante las repeticiones; rss_medicion_mb es la diferencia, lo que
+    agrega la parte cronometrada. Si el sistema no permite reiniciar el
+    pico, rss_max_mb incluye la preparación y rss_medicion_mb es None.
+    """
+    funcion = CASOS_POR_NOMBRE[nombre].preparar(n)
+    rss_preparacion = rss_actual_mb()
+    reiniciada = reiniciar_rss_maxima()
+
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+
+    tiempo = min(tiempos)
+    rss_max = rss_maxima_mb()
+    return {
+        "caso": nombre,
+        "iteraciones": n,
+        "estado": "ok",
+        "tiempo_s": tiempo,
+        "tiempos_s": tiempos,
+        "iteraciones_por_s": n / tiempo if tiempo > 0 else None,
+        "rss_max_mb": rss_max,
+        "rss_preparacion_mb": rss_preparacion,
+        "rss_medicion_mb": (
+            max(rss_max - rss_preparacion, 0.0) if reiniciada and rss_preparacion is not None
+            else None
+        ),
+    }
+
+
+def medir_en_subproceso(nombre, n, repeticiones):
+    """medir() en un proceso nuevo dentro de una carpeta temporal."""
+    with tempfile.TemporaryDirectory(prefix="devimulator_bench_") as carpeta:
+        entorno = dict(
+            os.environ,
+            PYTHONPATH=os.pathsep.join(filter(None, [RAIZ, os.environ.get("PYTHONPATH")])),
+            DEVIMULATOR_CACHE=os.path.join(carpeta, "cache"),
+            MPLBACKEND="Agg",
+        )
+        inicio = time.perf_counter()
+        try:
+            proceso = subprocess.run(
+                [sys.executable, "-m", "benchmarks.ejecutar",
+                 "--medir", nombre, str(n), "--repeticiones", str(repeticiones)],
+                cwd=carpeta, env=entorno, capture_output=True, text=True,
+                timeout=TIEMPO_MAXIMO_CASO,
+            )
+        except subprocess.TimeoutExpired:
+            return {"caso": nombre, "iteraciones": n, "estado": "error",
+                    "motivo": f"más de {TIEMPO_MAXIMO_CASO} s"}
+        total = time.perf_counter() - inicio
+
+    if proceso.returncode != 0:
+        error = proceso.stderr.strip().splitlines()
+        return {"caso": nombre, "iteraciones": n, "estado": "error",
+                "motivo": error[-1] if error else f"código {proceso.returncode}"}
+
+    resultado = json.loads(proceso.stdout.strip().splitlines()[-1])
+    resultado["tiempo_proceso_s"] = total
+    return resultado
+
+
+def clave(resultado):
+    return f"{resultado['caso']}[{resultado['iteraciones']}]"
+
+
+def comparar(resultados, linea_base, umbral=UMBRAL_REGRESION):
+    """
+    Agrega a cada resultado medido el cambio frente a la línea base y si es
+    una regresión (tiempo > base * (1 + umbral) y al menos
+    DIFERENCIA_MINIMA_S más lento). Devuelve las regresiones.
+    """
+    base = {clave(r): r for r in linea_base.get("resultados", []) if r["estado"] == "ok"}
+    regresiones = []
+    for resultado in resultados:
+        anterior = base.get(clave(resultado))
+        if resultado["estado"] != "ok" or anterior is None:
+            continue
+        cambio = resultado["tiempo_s"] / anterior["tiempo_s"] - 1
+        resultado["cambio_vs_base"] = cambio
+        resultado["regresion"] = bool(
+            cambio > umbral
+            and resultado["tiempo_s"] - anterior["tiempo_s"] > DIFERENCIA_MINIMA_S
+        )
+        if resultado["regresion"]:
+            regresiones.append(resultado)
+    return regresiones
+
+
+def _leer_json(ruta, por_defecto):
+    if not os.path.exists(ruta):
+        return por_defecto
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _escribir_json(ruta, datos):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(datos, f, ensure_ascii=False, indent=2)
+    os.replace(temporal, ruta)
+
+
+def _commit_actual():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ,
+            capture_output=True, text=True, timeout=10,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _versiones():
+    import numpy
+    versiones = {"python": platform.python_version(), "numpy": numpy.__version__}
+    for modulo in ("scipy", "pandas", "reportlab", "matplotlib"):
+        try:
+            versiones[modulo] = __import__(modulo).__version__
+        except ImportError:
+            pass
+    return versiones
+
+
+def ejecutar(nombres=None, max_iteraciones=None, repeticiones=3, umbral=UMBRAL_REGRESION,
+             ruta_historial=RUTA_HISTORIAL, ruta_linea_base=RUTA_LINEA_BASE,
+             guardar_linea_base=False, salida=print):
+    """
+    Mide los casos pedidos (todos por defecto), guarda la corrida en el
+    historial y la compara con la línea base. Devuelve (corrida, regresiones).
+    """
+    casos = [c for c in CASOS if nombres is None or c.nombre in nombres]
+    resultados = []
+    for caso in casos:
+        faltan = faltantes(caso)
+        for n in caso.tamanos:
+            if max_iteraciones is not None and n > max_iteraciones:
+                continue
+            if faltan:
+                resultado = {"caso": caso.nombre, "iteraciones": n, "estado": "omitido",
+                             "motivo": "falta " + ", ".join(faltan)}
+            else:
+                # Los casos grandes se repiten una sola vez
+                resultado = medir_en_subproceso(
+                    caso.nombre, n, repeticiones if n < 10**6 else 1
+                )
+            resultados.append(resultado)
+            salida(_linea(resultado))
+
+    corrida = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_actual(),
+        "plataforma": platform.platform(),
+        "procesadores": os.cpu_count(),
+        "versiones": _versiones(),
+        "resultados": resultados,
+    }
+
+    linea_base = _leer_json(ruta_linea_base, {})
+    regresiones = comparar(resultados, linea_base, umbral)
+    if linea_base:
+        salida(f"\nComparado con la línea base del {linea_base.get('fecha')} "
+               f"(commit {linea_base.get('commit')}), umbral {umbral:.0%}:")
+        for resultado in resultados:
+            if "cambio_vs_base" in resultado:
+                marca = "  REGRESIÓN" if resultado["regresion"] else ""
+                salida(f"  {clave(resultado):45s} {resultado['cambio_vs_base']:+8.1%}{marca}")
+
+    historial = _leer_json(ruta_historial, [])
+    historial.append(corrida)
+    _escribir_json(ruta_historial, historial)
+    if guardar_linea_base:
+        _escribir_json(ruta_linea_base, corrida)
+        salida(f"\nLínea base guardada en {ruta_linea_base}")
+
+    return corrida, regresiones
+
+
+def _linea(resultado):
+    if resultado["estado"] != "ok":
+        return f"{clave(resultado):45s} {resultado['estado']}: {resultado['motivo']}"
+    rss = resultado.get("rss_medicion_mb")
+    return (
+        f"{clave(resultado):45s} {resultado['tiempo_s']:10.4f} s "
+        f"{resultado['iteraciones_por_s']:14,.0f} it/s "
+        f"{'' if rss is None else f'{rss:+8.1f} MB'}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--casos", nargs="+", choices=sorted(CASOS_POR_NOMBRE),
+                        help="solo estos casos")
+    parser.add_argument("--max-iteraciones", type=int,
+                        help="omite los tamaños mayores (para una corrida rápida)")
+    parser.add_argument("--repeticiones", type=int, default=3,
+                        help="se reporta el menor tiempo de las repeticiones")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_REGRESION,
+                        help="cambio relativo de tiempo que cuenta como regresión")
+    parser.add_argument("--historial", default=RUTA_HISTORIAL)
+    parser.add_argument("--linea-base", default=RUTA_LINEA_BASE)
+    parser.add_argument("--guardar-linea-base", action="store_true",
+                        help="usa esta corrida como nueva línea base")
+    parser.add_argument("--medir", nargs=2, metavar=("CASO", "N"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.medir:
+        nombre, n = args.medir
+        print(json.dumps(medir(nombre, int(n), args.repeticiones)))
+        return 0
+
+    _, regresiones = ejecutar(
+        args.casos, args.max_iteraciones, args.repeticiones, args.umbral,
+        args.historial, args.linea_base, args.guardar_linea_base,
+    )
+    if regresiones:
+        print(f"\n{len(regresiones)} regresión(es) por encima del {args.umbral:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
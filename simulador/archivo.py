@@ -0,0 +1,205 @@
+# simulador/archivo.py
+
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from simulador.estadisticas import AcumuladorMomentos
+from simulador.resultados import ResultadoSimulacion
+
+
+# ARCHIVO DE CORRIDAS EN FORMATO BINARIO POR COLUMNAS
+#
+# Cada corrida es una carpeta dentro de reports/corridas con un .npy por
+# columna (van, tir, codigos_tir, flujos y, si es una muestra,
+# indices_flujos) y un metadata.json con el resumen y los parámetros.
+# En la base de datos solo se registra la ruta de la carpeta.
+#
+# Una corrida que pasó por la caché se archiva con su clave como nombre, así
+# que repetirla no crea otra carpeta. Se conservan las MAXIMO_CORRIDAS
+# usadas más recientemente.
+
+CARPETA_CORRIDAS = os.path.join("reports", "corridas")
+
+MAXIMO_CORRIDAS = 50
+
+COLUMNAS = ("van", "tir", "codigos_tir", "flujos")
+
+# Elementos leídos por tramo al recorrer un arreglo mapeado en memoria
+TAMANO_TRAMO = 1 << 20
+
+
+def _a_json(valor):
+    """Escalares y arreglos de numpy como tipos de JSON."""
+    if isinstance(valor, np.ndarray):
+        return valor.tolist()
+    if isinstance(valor, np.generic):
+        return valor.item()
+    raise TypeError(f"no se puede guardar en JSON: {type(valor).__name__}")
+
+
+def guardar_corrida(resultado, parametros=None, carpeta=CARPETA_CORRIDAS, nombre=None,
+                    maximo=MAXIMO_CORRIDAS):
+    """
+    Escribe un ResultadoSimulacion como carpeta de archivos .npy más
+    metadata.json. Devuelve la ruta de la carpeta.
+
+    El nombre por defecto es resultado.clave (si tiene) o la fecha; si ya
+    existe una corrida con ese nombre no se escribe de nuevo. Después se
+    borran las corridas más viejas por encima de `maximo` (None = sin límite).
+    """
+    fecha = datetime.now()
+    nombre = nombre or resultado.clave or f"{fecha:%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:8]}"
+    ruta = os.path.join(carpeta, nombre)
+    if os.path.isfile(os.path.join(ruta, "metadata.json")):
+        os.utime(ruta)  # cuenta como recién usada para el límite
+        return ruta
+
+    # Se escribe en una carpeta temporal y se renombra: nunca queda a medias
+    temporal = f"{ruta}.tmp-{uuid.uuid4().hex[:8]}"
+    os.makedirs(temporal)
+    try:
+        for columna in COLUMNAS:
+            np.save(os.path.join(temporal, f"{columna}.npy"), getattr(resultado, columna))
+        if resultado.indices_flujos is not None:
+            np.save(os.path.join(temporal, "indices_flujos.npy"), resultado.indices_flujos)
+
+        metadata = {
+            "fecha": fecha.isoformat(timespec="seconds"),
+            "iteraciones": resultado.iteraciones,
+            "vida": resultado.vida,
+            "dtype": resultado.van.dtype.name,
+            "todos_los_flujos": resultado.indices_flujos is None,
+            "resumen": resultado.resumen,
+            "parametros": parametros,
+        }
+        with open(os.path.join(temporal, "metadata.json"), "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2, default=_a_json)
+
+        try:
+            os.rename(temporal, ruta)
+        except OSError:
+            # Otro proceso archivó la misma corrida primero
+            if not os.path.isfile(os.path.join(ruta, "metadata.json")):
+                raise
+    finally:
+        shutil.rmtree(temporal, ignore_errors=True)
+
+    if maximo is not None:
+        podar_corridas(carpeta, maximo)
+    return ruta
+
+
+def _carpetas_corridas(carpeta):
+    """Rutas de las corridas completas de la carpeta."""
+    if not os.path.isdir(carpeta):
+        return []
+    rutas = [os.path.join(carpeta, nombre) for nombre in os.listdir(carpeta)
+             if ".tmp-" not in nombre]
+    return [ruta for ruta in rutas if os.path.isfile(os.path.join(ruta, "metadata.json"))]
+
+
+def podar_corridas(carpeta=CARPETA_CORRIDAS, maximo=MAXIMO_CORRIDAS):
+    """Borra las corridas usadas hace más tiempo hasta dejar `maximo`. Devuelve cuántas borró."""
+    rutas = sorted(_carpetas_corridas(carpeta), key=os.path.getmtime, reverse=True)
+    for ruta in rutas[maximo:]:
+        shutil.rmtree(ruta, ignore_errors=True)
+    return max(len(rutas) - maximo, 0)
+
+
+def leer_metadata(ruta):
+    with open(os.path.join(ruta, "metadata.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def cargar_corrida(ruta, mmap_mode="r"):
+    """
+    ResultadoSimulacion de una corrida archivada. Con mmap_mode="r" los
+    arreglos quedan mapeados en memoria: solo se lee del disco lo que se usa.
+    """
+    metadata = leer_metadata(ruta)
+    columnas = {
+        c: np.load(os.path.join(ruta, f"{c}.npy"), mmap_mode=mmap_mode) for c in COLUMNAS
+    }
+    indices = None
+    if not metadata["todos_los_flujos"]:
+        indices = np.load(os.path.join(ruta, "indices_flujos.npy"), mmap_mode=mmap_mode)
+
+    return ResultadoSimulacion(
+        columnas["van"], columnas["tir"], columnas["codigos_tir"], columnas["flujos"],
+        metadata["resumen"], indices_flujos=indices, iteraciones=metadata["iteraciones"],
+    )
+
+
+def listar_corridas(carpeta=CARPETA_CORRIDAS):
+    """DataFrame con ruta, fecha, iteraciones y VAN medio de cada corrida archivada."""
+    filas = []
+    for ruta in _carpetas_corridas(carpeta):
+        metadata = leer_metadata(ruta)
+        filas.append({
+            "ruta": ruta,
+            "fecha": metadata["fecha"],
+            "iteraciones": metadata["iteraciones"],
+            "media_van": metadata["resumen"].get("media"),
+        })
+    tabla = pd.DataFrame(filas, columns=["ruta", "fecha", "iteraciones", "media_van"])
+    return tabla.sort_values(["fecha", "ruta"], ignore_index=True)
+
+
+# LECTURA POR TRAMOS
+
+
+def _tramos(arreglo, tamano_tramo=TAMANO_TRAMO):
+    """Valores finitos del arreglo, tramo por tramo (para arreglos mapeados)."""
+    for desde in range(0, len(arreglo), tamano_tramo):
+        tramo = np.asarray(arreglo[desde:desde + tamano_tramo], dtype=float)
+        yield tramo[np.isfinite(tramo)]
+
+
+def momentos_por_tramos(arreglo, tamano_tramo=TAMANO_TRAMO):
+    """AcumuladorMomentos (n, media, desviación, mín., máx.) recorriendo el arreglo por tramos."""
+    acumulador = AcumuladorMomentos()
+    for tramo in _tramos(arreglo, tamano_tramo):
+        acumulador.agregar(tramo)
+    return acumulador
+
+
+def histograma_por_tramos(arreglo, bins=50, rango=None, tamano_tramo=TAMANO_TRAMO):
+    """
+    Como np.histogram, pero sin cargar el arreglo entero: sin rango se hace
+    una primera pasada para el mínimo y el máximo. Ignora NaN e infinitos.
+    Devuelve (conteos, bordes).
+    """
+    if rango is None:
+        momentos = momentos_por_tramos(arreglo, tamano_tramo)
+        rango = (momentos.minimo, momentos.maximo) if momentos.n else (0.0, 1.0)
+
+    bordes = np.histogram_bin_edges([], bins=bins, range=rango)
+    conteos = np.zeros(len(bordes) - 1, dtype=np.int64)
+    for tramo in _tramos(arreglo, tamano_tramo):
+        conteos += np.histogram(tramo, bins=bordes)[0]
+    return conteos, bordes
+
+
+def comparar_corridas(rutas, columna="van", bins=50, tamano_tramo=TAMANO_TRAMO):
+    """
+    Histogramas de varias corridas archivadas sobre los mismos bordes.
+    Devuelve un DataFrame con lim_inf, lim_sup y una columna de
+    frecuencia relativa por corrida.
+    """
+    arreglos = {ruta: getattr(cargar_corrida(ruta), columna) for ruta in rutas}
+    momentos = [momentos_por_tramos(a, tamano_tramo) for a in arreglos.values()]
+    rango = (min(m.minimo for m in momentos), max(m.maximo for m in momentos))
+
+    tabla = None
+    for (ruta, arreglo), m in zip(arreglos.items(), momentos):
+        conteos, bordes = histograma_por_tramos(arreglo, bins, rango, tamano_tramo)
+        if tabla is None:
+            tabla = pd.DataFrame({"lim_inf": bordes[:-1], "lim_sup": bordes[1:]})
+        tabla[os.path.basename(ruta)] = conteos / max(m.n, 1)
+    return tabla
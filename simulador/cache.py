@@ -0,0 +1,269 @@
+# simulador/cache.py
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from simulador.resultados import ResultadoSimulacion
+from simulador.validacion import ValidacionEnLinea
+
+
+# Cambiar si cambia el motor: invalida las entradas viejas en disco
+VERSION_CACHE = 3
+
+CARPETA_CACHE = os.environ.get("DEVIMULATOR_CACHE", os.path.join(".cache", "simulaciones"))
+
+
+# CLAVE DE LA CORRIDA
+
+
+def normalizar(valor):
+    """
+    Convierte parámetros a una forma estable para el hash: diccionarios
+    ordenados, listas/tuplas/arreglos como listas y escalares de numpy como
+    números de Python. Los enteros se quedan exactos (una semilla de 64 bits
+    no pierde dígitos) y los float sin decimales pasan a int, así 10 y 10.0
+    dan la misma clave.
+    """
+    if isinstance(valor, dict):
+        return {str(k): normalizar(v) for k, v in sorted(valor.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(valor, (list, tuple, np.ndarray)):
+        return [normalizar(v) for v in valor]
+    if isinstance(valor, (bool, np.bool_)):
+        return bool(valor)
+    if isinstance(valor, (int, np.integer)):
+        return int(valor)
+    if isinstance(valor, (float, np.floating)):
+        valor = float(valor)
+        return int(valor) if valor.is_integer() else valor
+    if isinstance(valor, type) or isinstance(valor, np.dtype):
+        return np.dtype(valor).name
+    return valor
+
+
+def clave_simulacion(parametros, iteraciones, semilla, metodo_muestreo="mc", **opciones):
+    """
+    Hash sha256 de los parámetros normalizados, las iteraciones, la semilla,
+    el método de muestreo y las demás opciones que cambian el resultado.
+    """
+    contenido = normalizar({
+        "version": VERSION_CACHE,
+        "parametros": parametros,
+        "iteraciones": iteraciones,
+        "semilla": semilla,
+        "metodo_muestreo": metodo_muestreo,
+        "opciones": opciones,
+    })
+    texto = json.dumps(contenido, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+# CACHÉ EN MEMORIA Y EN DISCO
+
+
+def _solo_lectura(resultado):
+    for arreglo in (resultado.van, resultado.tir, resultado.codigos_tir, resultado.flujos):
+        arreglo.setflags(write=False)
+    return resultado
+
+
+def _copia(resultado):
+    """
+    Otro ResultadoSimulacion sobre los mismos arreglos (de solo lectura), con
+    su propio resumen y su propia validación.
+    """
+    validacion = resultado.validacion
+    if validacion is not None:
+        validacion = ValidacionEnLinea.desde_dict(validacion.a_dict())
+    return ResultadoSimulacion(
+        resultado.van, resultado.tir, resultado.codigos_tir, resultado.flujos,
+        dict(resultado.resumen), resultado.indices_flujos, resultado.iteraciones,
+        validacion,
+    )
+
+
+class CacheResultados:
+    """
+    Caché de ResultadoSimulacion por clave_simulacion en dos niveles:
+    - memoria: LRU de hasta max_bytes_memoria
+    - disco: un .npz por corrida en `carpeta`, hasta max_bytes_disco;
+      se borran primero los usados hace más tiempo.
+
+    Un resultado más grande que el límite de un nivel no se guarda en ese
+    nivel.
+
+    Los arreglos entregados son de solo lectura y se comparten entre
+    llamadas. estadisticas() cuenta aciertos y fallos.
+    """
+
+    def __init__(self, carpeta=CARPETA_CACHE, max_bytes_memoria=256 * 2**20,
+                 max_bytes_disco=1024 * 2**20):
+        self.carpeta = carpeta
+        self.max_bytes_memoria = max_bytes_memoria
+        self.max_bytes_disco = max_bytes_disco
+
+        self._memoria = OrderedDict()
+        self._bytes_memoria = 0
+        self._candado = threading.Lock()
+        self._estadisticas = dict.fromkeys(
+            ("aciertos_memoria", "aciertos_disco", "fallos", "guardados", "desalojos"), 0
+        )
+
+    def estadisticas(self):
+        with self._candado:
+            estad = dict(self._estadisticas)
+            estad["entradas_memoria"] = len(self._memoria)
+            estad["bytes_memoria"] = self._bytes_memoria
+        consultas = estad["aciertos_memoria"] + estad["aciertos_disco"] + estad["fallos"]
+        estad["tasa_aciertos"] = (
+            (estad["aciertos_memoria"] + estad["aciertos_disco"]) / consultas if consultas else 0.0
+        )
+        return estad
+
+    def obtener(self, clave):
+        """El resultado guardado con esa clave, o None."""
+        with self._candado:
+            resultado = self._memoria.get(clave)
+            if resultado is not None:
+                self._memoria.move_to_end(clave)
+                self._estadisticas["aciertos_memoria"] += 1
+                return _copia(resultado)
+
+        resultado = self._leer_disco(clave)
+        with self._candado:
+            if resultado is None:
+                self._estadisticas["fallos"] += 1
+                return None
+            self._estadisticas["aciertos_disco"] += 1
+        self._guardar_memoria(clave, resultado)
+        return _copia(resultado)
+
+    def guardar(self, clave, resultado):
+        """Guarda el resultado en los dos niveles y lo devuelve como lo entregaría obtener()."""
+        resultado = _solo_lectura(_copia(resultado))
+        self._guardar_memoria(clave, resultado)
+        self._escribir_disco(clave, resultado)
+        with self._candado:
+            self._estadisticas["guardados"] += 1
+        return _copia(resultado)
+
+    def limpiar(self):
+        """Vacía la memoria y borra los archivos de la caché."""
+        with self._candado:
+            self._memoria.clear()
+            self._bytes_memoria = 0
+        for ruta, _, _ in self._archivos():
+            os.remove(ruta)
+
+    # -- memoria --
+
+    def _guardar_memoria(self, clave, resultado):
+        tamano = resultado.memoria_bytes
+        if tamano > self.max_bytes_memoria:
+            return
+        with self._candado:
+            anterior = self._memoria.pop(clave, None)
+            if anterior is not None:
+                self._bytes_memoria -= anterior.memoria_bytes
+            self._memoria[clave] = resultado
+            self._bytes_memoria += tamano
+            while self._bytes_memoria > self.max_bytes_memoria:
+                _, viejo = self._memoria.popitem(last=False)
+                self._bytes_memoria -= viejo.memoria_bytes
+                self._estadisticas["desalojos"] += 1
+
+    # -- disco --
+
+    def _ruta(self, clave):
+        return os.path.join(self.carpeta, f"{clave}.npz")
+
+    def _archivos(self):
+        """(ruta, bytes, último uso) de cada archivo de la caché."""
+        if not os.path.isdir(self.carpeta):
+            return []
+        archivos = []
+        for nombre in os.listdir(self.carpeta):
+            if nombre.endswith(".npz"):
+                ruta = os.path.join(self.carpeta, nombre)
+                info = os.stat(ruta)
+                archivos.append((ruta, info.st_size, info.st_mtime))
+        return archivos
+
+    def _escribir_disco(self, clave, resultado):
+        if resultado.memoria_bytes > self.max_bytes_disco:
+            return
+        os.makedirs(self.carpeta, exist_ok=True)
+        ruta = self._ruta(clave)
+        temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        indices = resultado.indices_flujos
+        with open(temporal, "wb") as f:
+            np.savez(
+                f,
+                van=resultado.van,
+                tir=resultado.tir,
+                codigos_tir=resultado.codigos_tir,
+                flujos=resultado.flujos,
+                indices_flujos=np.empty(0, dtype=np.int64) if indices is None else indices,
+                todos_los_flujos=np.array(indices is None),
+                iteraciones=np.array(resultado.iteraciones),
+                resumen=np.array(json.dumps(resultado.resumen)),
+                validacion=np.array(json.dumps(
+                    None if resultado.validacion is None else resultado.validacion.a_dict()
+                )),
+            )
+        os.replace(temporal, ruta)
+        self._desalojar_disco()
+
+    def _leer_disco(self, clave):
+        ruta = self._ruta(clave)
+        try:
+            with np.load(ruta, allow_pickle=False) as datos:
+                resultado = ResultadoSimulacion(
+                    van=datos["van"],
+                    tir=datos["tir"],
+                    codigos_tir=datos["codigos_tir"],
+                    flujos=datos["flujos"],
+                    resumen=json.loads(str(datos["resumen"])),
+                    indices_flujos=None if datos["todos_los_flujos"] else datos["indices_flujos"],
+                    iteraciones=int(datos["iteraciones"]),
+                )
+                validacion = json.loads(str(datos["validacion"]))
+        except (OSError, KeyError, ValueError):
+            # No existe o quedó incompleto: se trata como fallo
+            return None
+
+        if validacion is not None:
+            resultado.validacion = ValidacionEnLinea.desde_dict(validacion)
+
+        os.utime(ruta)  # marca el último uso para el desalojo
+        return _solo_lectura(resultado)
+
+    def _desalojar_disco(self):
+        archivos = sorted(self._archivos(), key=lambda a: a[2])
+        total = sum(tamano for _, tamano, _ in archivos)
+        for ruta, tamano, _ in archivos:
+            if total <= self.max_bytes_disco:
+                break
+            try:
+                os.remove(ruta)
+            except FileNotFoundError:
+                pass
+            total -= tamano
+            with self._candado:
+                self._estadisticas["desalojos"] += 1
+
+
+_cache_compartida = None
+
+
+def obtener_cache():
+    """Caché por defecto del proceso (se crea la primera vez)."""
+    global _cache_compartida
+    if _cache_compartida is None:
+        _cache_compartida = CacheResultados()
+    return _cache_compartida
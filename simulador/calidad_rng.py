@@ -0,0 +1,240 @@
+# simulador/calidad_rng.py
+
+import math
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr
+from scipy.stats import chi2
+
+from simulador.muestreo import generar_uniformes, METODOS_MUESTREO, VARIABLES
+from simulador.paralelo import (
+    TAMANO_BLOQUE, dividir_en_bloques, semillas_por_bloque, iterar_bloques,
+)
+
+
+# BATERÍA DE CALIDAD DE LOS NÚMEROS R
+#
+# Cada columna de la matriz R de un método de muestreo es un flujo de
+# uniformes. Los flujos se generan por bloques, igual que en la simulación,
+# y cada bloque se resume en frecuencias y sumas que se combinan sumando:
+# la memoria no depende de cuántos números se prueben. Las pruebas seriales
+# se aplican dentro de cada bloque (cada bloque tiene su propia semilla).
+
+PRUEBA_RACHAS = "Rachas arriba/abajo de 0.5"
+PRUEBA_AUTOCORRELACION = "Autocorrelación serial"
+PRUEBA_ANDERSON_DARLING = "Anderson–Darling (por clases)"
+PRUEBA_HUECOS = "Huecos"
+PRUEBA_PARES = "Uniformidad de pares (2-D)"
+
+REZAGOS = (1, 2, 3)
+CLASES_AD = 1024
+INTERVALO_HUECOS = (0.0, 0.5)
+MAX_HUECO = 10
+CLASES_PARES = 16
+
+
+def adinf(z):
+    """
+    P(A² < z) asintótica de Anderson–Darling para uniformes
+    (Marsaglia y Marsaglia, 2004).
+    """
+    if z <= 0:
+        return 0.0
+    if z < 2:
+        return (math.exp(-1.2337141 / z) / math.sqrt(z)
+                * (2.00012 + (0.247105 - (0.0649821 - (0.0347962 - (0.011672 - 0.00168691 * z)
+                                                       * z) * z) * z) * z))
+    return math.exp(-math.exp(1.0776 - (2.30695 - (0.43424 - (0.082433 - (0.008056 - 0.0003146 * z)
+                                                               * z) * z) * z) * z))
+
+
+def _nodos_gauss(clases):
+    """Nodos y pesos de Gauss-Legendre (3 puntos) en cada clase de [0, 1]."""
+    x, w = np.polynomial.legendre.leggauss(3)
+    bordes = np.arange(clases) / clases
+    ancho = 1 / clases
+    nodos = bordes[:, None] + (x + 1) / 2 * ancho
+    return nodos, np.broadcast_to(w / 2 * ancho, nodos.shape)
+
+
+class EstadoCalidad:
+    """Sumas y frecuencias de un flujo de uniformes (combinables)."""
+
+    __slots__ = ("n", "rachas", "rachas_media", "rachas_varianza",
+                 "productos", "pares_rezago", "frecuencias_ad", "huecos", "frecuencias_pares")
+
+    def __init__(self):
+        self.n = 0
+        self.rachas = 0
+        self.rachas_media = 0.0
+        self.rachas_varianza = 0.0
+        self.productos = np.zeros(len(REZAGOS))
+        self.pares_rezago = np.zeros(len(REZAGOS), dtype=np.int64)
+        self.frecuencias_ad = np.zeros(CLASES_AD, dtype=np.int64)
+        self.huecos = np.zeros(MAX_HUECO + 1, dtype=np.int64)
+        self.frecuencias_pares = np.zeros(CLASES_PARES ** 2, dtype=np.int64)
+
+    def agregar(self, u):
+        """Incorpora un bloque de uniformes (en orden)."""
+        u = np.asarray(u, dtype=float)
+        n = u.size
+        if n < 2:
+            return self
+        self.n += n
+
+        # Rachas por encima y por debajo de 0.5 (Wald–Wolfowitz)
+        arriba = u >= 0.5
+        n1 = int(np.count_nonzero(arriba))
+        n2 = n - n1
+        self.rachas += 1 + int(np.count_nonzero(arriba[1:] != arriba[:-1]))
+        self.rachas_media += 2 * n1 * n2 / n + 1
+        self.rachas_varianza += 2 * n1 * n2 * (2 * n1 * n2 - n) / (n * n * (n - 1))
+
+        # Productos de valores separados k posiciones
+        for i, k in enumerate(REZAGOS):
+            if n > k:
+                self.productos[i] += float(u[:-k] @ u[k:])
+                self.pares_rezago[i] += n - k
+
+        # Frecuencias finas para Anderson–Darling
+        self.frecuencias_ad += np.bincount(
+            np.minimum((u * CLASES_AD).astype(np.int64), CLASES_AD - 1), minlength=CLASES_AD
+        )
+
+        # Huecos entre caídas en el intervalo
+        a, b = INTERVALO_HUECOS
+        caidas = np.flatnonzero((u >= a) & (u < b))
+        if caidas.size > 1:
+            self.huecos += np.bincount(
+                np.minimum(np.diff(caidas) - 1, MAX_HUECO), minlength=MAX_HUECO + 1
+            )
+
+        # Pares consecutivos sin solapar (u_2i, u_2i+1) en una rejilla k x k
+        m = n // 2 * 2
+        celda = np.minimum((u[:m] * CLASES_PARES).astype(np.int64), CLASES_PARES - 1)
+        self.frecuencias_pares += np.bincount(
+            celda[0::2] * CLASES_PARES + celda[1::2], minlength=CLASES_PARES ** 2
+        )
+        return self
+
+    def combinar(self, otro):
+        for campo in self.__slots__:
+            setattr(self, campo, getattr(self, campo) + getattr(otro, campo))
+        return self
+
+    # -- pruebas --
+
+    def _rachas(self):
+        z = (self.rachas - self.rachas_media) / math.sqrt(self.rachas_varianza)
+        return z, 2 * float(ndtr(-abs(z)))
+
+    def _autocorrelacion(self):
+        """
+        z_k = (Σ u_i u_i+k - m/4) / sqrt(13 m / 144) para cada rezago y
+        Σ z_k² ~ Chi-cuadrado con tantos gl como rezagos.
+        """
+        m = self.pares_rezago.astype(float)
+        z = (self.productos - m / 4) / np.sqrt(13 * m / 144)
+        estadistico = float(np.sum(z ** 2))
+        return estadistico, float(chi2.sf(estadistico, len(REZAGOS)))
+
+    def _anderson_darling(self):
+        """
+        A² = n ∫ (F_n(u) - u)² / (u (1-u)) du, con F_n lineal dentro de
+        cada clase fina; p-valor con ADinf.
+        """
+        acumulada = np.concatenate([[0.0], np.cumsum(self.frecuencias_ad) / self.n])
+        nodos, pesos = _nodos_gauss(CLASES_AD)
+        posicion = nodos * CLASES_AD - np.arange(CLASES_AD)[:, None]
+        F_n = acumulada[:-1, None] + posicion * (acumulada[1:] - acumulada[:-1])[:, None]
+        A2 = float(self.n * np.sum(pesos * (F_n - nodos) ** 2 / (nodos * (1 - nodos))))
+        return A2, 1 - adinf(A2)
+
+    def _huecos(self):
+        a, b = INTERVALO_HUECOS
+        p = b - a
+        r = np.arange(MAX_HUECO)
+        probs = np.append(p * (1 - p) ** r, (1 - p) ** MAX_HUECO)
+        return _chi_cuadrado(self.huecos, probs)
+
+    def _pares(self):
+        return _chi_cuadrado(self.frecuencias_pares, np.full(CLASES_PARES ** 2, CLASES_PARES ** -2))
+
+    def resultados(self, alfa=0.05):
+        """Lista de diccionarios prueba, estadistico, p_valor, acepta."""
+        filas = []
+        for prueba, funcion in (
+            (PRUEBA_RACHAS, self._rachas),
+            (PRUEBA_AUTOCORRELACION, self._autocorrelacion),
+            (PRUEBA_ANDERSON_DARLING, self._anderson_darling),
+            (PRUEBA_HUECOS, self._huecos),
+            (PRUEBA_PARES, self._pares),
+        ):
+            estadistico, p_valor = funcion()
+            filas.append({
+                "prueba": prueba,
+                "estadistico": float(estadistico),
+                "p_valor": float(p_valor),
+                "acepta": bool(p_valor >= alfa),
+            })
+        return filas
+
+
+def _chi_cuadrado(frecuencias, probs):
+    esperadas = frecuencias.sum() * probs
+    estadistico = float(np.sum((frecuencias - esperadas) ** 2 / esperadas))
+    return estadistico, float(chi2.sf(estadistico, len(probs) - 1))
+
+
+def _bloque_calidad(metodo, n, semilla_bloque, dimensiones):
+    """Estados de calidad de cada columna de un bloque de R."""
+    R = generar_uniformes(n, dimensiones, metodo, np.random.default_rng(semilla_bloque))
+    return [EstadoCalidad().agregar(R[:, j]) for j in range(dimensiones)]
+
+
+def bateria_calidad(n=1_000_000, metodos=METODOS_MUESTREO, dimensiones=len(VARIABLES),
+                    semilla=None, workers=1, alfa=0.05, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Aplica la batería (rachas, autocorrelación, Anderson–Darling, huecos y
+    pares 2-D) a n números R por columna de cada método de muestreo.
+
+    Los bloques de todos los métodos se reparten en `workers` procesos y se
+    combinan a medida que llegan, así que n puede ser 10^8 o más con
+    memoria fija.
+
+    Devuelve un DataFrame con una fila por método, variable y prueba.
+    LHS y Sobol cubren [0, 1) mejor que el azar, así que Anderson–Darling
+    da p-valores cercanos a 1; Sobol además no es una sucesión independiente
+    y es esperable que falle las pruebas seriales.
+    """
+    tamanos = dividir_en_bloques(n, tamano_bloque)
+    tareas = []
+    for metodo, raiz in zip(metodos, semillas_por_bloque(semilla, len(metodos))):
+        for m, s in zip(tamanos, semillas_por_bloque(raiz, len(tamanos))):
+            tareas.append((metodo, m, s, dimensiones))
+
+    estados = {metodo: [EstadoCalidad() for _ in range(dimensiones)] for metodo in metodos}
+    for (metodo, *_), bloque in zip(tareas, iterar_bloques(_bloque_calidad, tareas, workers)):
+        for total, estado in zip(estados[metodo], bloque):
+            total.combinar(estado)
+
+    nombres = VARIABLES if dimensiones == len(VARIABLES) else [f"R{j + 1}" for j in range(dimensiones)]
+    filas = [
+        {"metodo": metodo, "variable": nombre, "n": estado.n, **fila}
+        for metodo in metodos
+        for nombre, estado in zip(nombres, estados[metodo])
+        for fila in estado.resultados(alfa)
+    ]
+    return pd.DataFrame(filas, columns=["metodo", "variable", "n", "prueba",
+                                        "estadistico", "p_valor", "acepta"])
+
+
+def resumen_calidad(tabla):
+    """Por método y prueba: cuántas variables pasan y el menor p-valor."""
+    return (
+        tabla.groupby(["metodo", "prueba"], sort=False)
+        .agg(variables_aceptadas=("acepta", "sum"), variables=("acepta", "size"),
+             p_valor_minimo=("p_valor", "min"))
+        .reset_index()
+    )
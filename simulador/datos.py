@@ -0,0 +1,40 @@
+# simulador/datos.py
+
+# ESCENARIO BASE DEL PROYECTO
+#
+# Lo usan la app, los benchmarks y las pruebas. Quien lo vaya a modificar
+# debe trabajar sobre una copia (copy.deepcopy).
+
+PARAMETROS_BASE = {
+    # Demanda anual (Uniforme)
+    "demanda_min": 9061,
+    "demanda_max": 11915,
+
+    # Precio de venta (Normal)
+    "precio_mu": 26.48,
+    "precio_sigma": 0.83,
+
+    # Costo variable unitario (Uniforme)
+    "cv_min": 9.01,
+    "cv_max": 10.71,
+
+    # Costo fijo mensual (Discreta)
+    "cf_valores": [28000, 30000, 32000],
+    "cf_probs": [0.30, 0.3667, 0.3333],
+
+    # Impuesto y descuento
+    "tasa_impuesto": 0.10,
+    "tasa_descuento": 0.20,
+
+    # Horizonte del proyecto
+    "vida": 10,
+
+    # Depreciación anual
+    "depreciacion": 14000,
+
+    # Valor de desecho
+    "valor_desecho": 524000,
+
+    # Inversión inicial
+    "inversion_inicial": -812500,
+}
@@ -0,0 +1,252 @@
+# simulador/escenarios.py
+
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtri
+
+from simulador.generadores import distribucion_discreta
+from simulador.flujo_caja import flujo_caja_anual, matriz_flujos
+from simulador.finanzas import (
+    factor_anualidad, factores_descuento, calcular_van_lote, calcular_tir_lote,
+)
+from simulador.muestreo import generar_uniformes, correlacionar_uniformes, VARIABLES, METODO_MC
+from simulador.trayectorias import flujos_trayectorias
+from simulador.paralelo import dividir_en_bloques, semillas_por_bloque, iterar_bloques
+from simulador.resultados import ResultadoSimulacion, filas_conservadas, CONSERVAR_MUESTRA
+from simulador.simulacion import resumen_simulacion
+
+
+# EVALUACIÓN DE VARIOS ESCENARIOS CON LOS MISMOS NÚMEROS ALEATORIOS
+
+
+def _columna(escenarios, clave):
+    """Parámetro escalar de cada escenario como columna (S, 1)."""
+    return np.array([float(p[clave]) for p in escenarios])[:, None]
+
+
+def _costos_fijos(escenarios, R):
+    """Costo fijo (S, n): si todos comparten probabilidades, un solo searchsorted."""
+    probs = [tuple(p["cf_probs"]) for p in escenarios]
+    if len(set(probs)) == 1:
+        indices = distribucion_discreta(
+            escenarios[0]["cf_valores"], escenarios[0]["cf_probs"]
+        ).indices_desde_uniformes(R)
+        valores = np.array([p["cf_valores"] for p in escenarios], dtype=float)
+        return valores[:, indices]
+
+    return np.stack([
+        distribucion_discreta(p["cf_valores"], p["cf_probs"]).desde_uniformes(R).astype(float)
+        for p in escenarios
+    ])
+
+
+def evaluar_escenarios(R, escenarios):
+    """
+    Evalúa S escenarios sobre la misma matriz de uniformes R (n, 4).
+
+    Las variables se arman a lo largo de un eje de escenarios (S, n) con los
+    mismos R para todos (números aleatorios comunes), y el VAN sale de la
+    forma cerrada flujo · FA(r, vida) + desecho / (1+r)^vida de cada escenario.
+
+    Devuelve (flujo_anual, vans), ambos de forma (S, n).
+    """
+    demanda = _columna(escenarios, "demanda_min") + R[:, 0] * (
+        _columna(escenarios, "demanda_max") - _columna(escenarios, "demanda_min"))
+
+    z = ndtri(np.clip(R[:, 1], 1e-12, 1 - 1e-12))
+    precio = _columna(escenarios, "precio_mu") + _columna(escenarios, "precio_sigma") * z
+
+    costo_variable = _columna(escenarios, "cv_min") + R[:, 2] * (
+        _columna(escenarios, "cv_max") - _columna(escenarios, "cv_min"))
+
+    costo_fijo = _costos_fijos(escenarios, R[:, 3])
+
+    flujo_anual, _ = flujo_caja_anual(
+        demanda, precio, costo_variable, costo_fijo,
+        depreciacion_anual=_columna(escenarios, "depreciacion"),
+        tasa_impuesto=_columna(escenarios, "tasa_impuesto"),
+    )
+
+    anualidad = np.array([[factor_anualidad(p["tasa_descuento"], p["vida"])] for p in escenarios])
+    descuento_final = np.array([[factores_descuento(p["tasa_descuento"], p["vida"])[-1]]
+                                for p in escenarios])
+
+    vans = (-_columna(escenarios, "inversion_inicial")
+            + flujo_anual * anualidad
+            + _columna(escenarios, "valor_desecho") * descuento_final)
+
+    return flujo_anual, vans
+
+
+def correlacion_comun(escenarios):
+    """
+    Matriz de correlación compartida por los escenarios (o None).
+    Los números aleatorios comunes exigen la misma dependencia en todos.
+    """
+    correlaciones = [p.get("correlacion") for p in escenarios]
+    primera = correlaciones[0]
+    for c in correlaciones[1:]:
+        if (c is None) != (primera is None) or (
+                c is not None and not np.array_equal(np.asarray(c), np.asarray(primera))):
+            raise ValueError("todos los escenarios deben usar la misma matriz de correlación")
+    return primera
+
+
+def dinamica_comun(escenarios):
+    """
+    Dinámica anual compartida por los escenarios (o None). El ancho de R
+    depende del modelo y de la vida, así que los números aleatorios comunes
+    exigen la misma dinámica en todos y, si hay dinámica, la misma vida.
+    """
+    dinamicas = [p.get("dinamica") or None for p in escenarios]
+    primera = dinamicas[0]
+    if any(d != primera for d in dinamicas[1:]):
+        raise ValueError("todos los escenarios deben usar la misma dinámica anual")
+    if primera is not None and len({int(p["vida"]) for p in escenarios}) > 1:
+        raise ValueError("con dinámica anual todos los escenarios deben tener la misma vida")
+    return primera
+
+
+def vans_con_dinamica(escenarios, n, semilla_bloque, metodo_muestreo):
+    """
+    Flujos (n, vida) y VAN (n,) de cada escenario cuando traen
+    param["dinamica"] (la misma en todos, ver dinamica_comun). Cada
+    escenario arranca el generador con la misma semilla, así que comparten
+    los números aleatorios.
+    """
+    for p in escenarios:
+        flujos = flujos_trayectorias(
+            p, n, np.random.default_rng(semilla_bloque), metodo_muestreo
+        )
+        yield flujos, calcular_van_lote(p["inversion_inicial"], p["tasa_descuento"], flujos)
+
+
+def _bloque_escenarios(escenarios, n, semilla_bloque, metodo_muestreo, filas_flujos):
+    """Un bloque de n iteraciones evaluado en todos los escenarios."""
+    correlacion = correlacion_comun(escenarios)
+    if dinamica_comun(escenarios) is not None:
+        matrices, vans = zip(*vans_con_dinamica(escenarios, n, semilla_bloque, metodo_muestreo))
+        vans = np.stack(vans)
+    else:
+        rng = np.random.default_rng(semilla_bloque)
+        R = generar_uniformes(n, len(VARIABLES), metodo_muestreo, rng)
+        R = correlacionar_uniformes(R, correlacion)
+
+        flujo_anual, vans = evaluar_escenarios(R, escenarios)
+        matrices = [matriz_flujos(flujo_anual[s], p["valor_desecho"], p["vida"])
+                    for s, p in enumerate(escenarios)]
+
+    tirs = np.empty_like(vans)
+    codigos = np.empty(vans.shape, dtype=np.int8)
+    flujos = []
+    for s, (p, matriz) in enumerate(zip(escenarios, matrices)):
+        tirs[s], codigos[s] = calcular_tir_lote(matriz, inversion_inicial=p["inversion_inicial"])
+        flujos.append(matriz if filas_flujos is None else matriz[filas_flujos])
+
+    return vans, tirs, codigos, flujos
+
+
+class ComparacionEscenarios:
+    """
+    Resultado de comparar escenarios con números aleatorios comunes:
+    - resultados: nombre -> ResultadoSimulacion de cada escenario
+    - base: nombre del escenario de referencia
+    - diferencias: nombre -> estadísticas de VAN(escenario) - VAN(base)
+      calculadas iteración por iteración (diferencias pareadas)
+    """
+
+    __slots__ = ("resultados", "base", "diferencias", "confianza")
+
+    def __init__(self, resultados, base, confianza=0.95):
+        self.resultados = resultados
+        self.base = base
+        self.confianza = confianza
+        self.diferencias = {
+            nombre: diferencia_pareada(res.van, resultados[base].van, confianza)
+            for nombre, res in resultados.items() if nombre != base
+        }
+
+    def tabla_diferencias(self):
+        """DataFrame con una fila por escenario comparado contra la base."""
+        return pd.DataFrame([
+            {"Escenario": nombre, **estad} for nombre, estad in self.diferencias.items()
+        ])
+
+
+def diferencia_pareada(van, van_base, confianza=0.95):
+    """
+    Media de VAN - VAN_base por iteración y su intervalo de confianza.
+    Al usar los mismos números aleatorios, el ruido común se cancela.
+    """
+    d = np.asarray(van, dtype=float) - np.asarray(van_base, dtype=float)
+    n = d.size
+    z = NormalDist().inv_cdf(0.5 + confianza / 2)
+    media = float(d.mean())
+    desviacion = float(d.std(ddof=1)) if n > 1 else np.nan
+    semiancho = z * desviacion / np.sqrt(n)
+
+    return {
+        "media_diferencia": media,
+        "desviacion_diferencia": desviacion,
+        "ic_inf": media - semiancho,
+        "ic_sup": media + semiancho,
+        "prob_mejora": float(np.mean(d > 0)),
+    }
+
+
+def comparar_escenarios(escenarios, iteraciones=1000, semilla=None, base=None,
+                        metodo_muestreo=METODO_MC, workers=1,
+                        conservar_flujos=CONSERVAR_MUESTRA, muestra_flujos=1000,
+                        confianza=0.95):
+    """
+    Simula varios escenarios en una sola pasada de muestreo.
+
+    escenarios = diccionario nombre -> parámetros (como parametros_base).
+    Todos los escenarios usan los mismos números aleatorios en cada
+    iteración, así que las diferencias entre ellos reflejan el cambio de
+    parámetros y no el ruido de muestreo. base = escenario de referencia
+    para las diferencias (por defecto, el primero).
+
+    Devuelve un ComparacionEscenarios.
+    """
+    nombres = list(escenarios)
+    lista = [escenarios[nombre] for nombre in nombres]
+    base = nombres[0] if base is None else base
+
+    tamanos = dividir_en_bloques(iteraciones)
+    semillas = semillas_por_bloque(semilla, len(tamanos))
+    inicios = np.cumsum([0] + tamanos)
+
+    indices = filas_conservadas(iteraciones, conservar_flujos, muestra_flujos)
+    tareas = []
+    for b, (n, s) in enumerate(zip(tamanos, semillas)):
+        filas = None
+        if indices is not None:
+            desde, hasta = np.searchsorted(indices, [inicios[b], inicios[b + 1]])
+            filas = indices[desde:hasta] - inicios[b]
+        tareas.append((lista, n, s, metodo_muestreo, filas))
+
+    resultados = {
+        nombre: ResultadoSimulacion.reservar(iteraciones, p["vida"], indices)
+        for nombre, p in zip(nombres, lista)
+    }
+
+    fila_flujos = 0
+    for b, (vans, tirs, codigos, flujos) in enumerate(
+        iterar_bloques(_bloque_escenarios, tareas, workers=workers)
+    ):
+        inicio, fin = inicios[b], inicios[b + 1]
+        for s, nombre in enumerate(nombres):
+            res = resultados[nombre]
+            res.van[inicio:fin] = vans[s]
+            res.tir[inicio:fin] = tirs[s]
+            res.codigos_tir[inicio:fin] = codigos[s]
+            res.flujos[fila_flujos:fila_flujos + len(flujos[s])] = flujos[s]
+        fila_flujos += len(flujos[0])
+
+    for res in resultados.values():
+        res.resumen = resumen_simulacion(res.van, res.tir)
+
+    return ComparacionEscenarios(resultados, base, confianza)
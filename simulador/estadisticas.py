@@ -0,0 +1,201 @@
+# simulador/estadisticas.py
+
+import numpy as np
+
+
+# ESTADÍSTICAS EN LÍNEA (memoria constante y combinables entre bloques)
+
+
+class AcumuladorMomentos:
+    """
+    Media, varianza (Welford/Chan), mínimo y máximo sin guardar la muestra.
+    Dos acumuladores de bloques distintos se pueden combinar con combinar().
+    """
+
+    __slots__ = ("n", "media", "m2", "minimo", "maximo")
+
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
+        self.minimo = np.inf
+        self.maximo = -np.inf
+
+    def agregar(self, valores):
+        """Incorpora un arreglo de valores."""
+        valores = np.asarray(valores, dtype=float).ravel()
+        if valores.size == 0:
+            return self
+
+        otro = AcumuladorMomentos()
+        otro.n = valores.size
+        otro.media = float(valores.mean())
+        otro.m2 = float(np.sum((valores - otro.media) ** 2))
+        otro.minimo = float(valores.min())
+        otro.maximo = float(valores.max())
+        return self.combinar(otro)
+
+    def combinar(self, otro):
+        """Une otro acumulador a este (fórmula de Chan para la varianza)."""
+        if otro.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.media, self.m2 = otro.n, otro.media, otro.m2
+            self.minimo, self.maximo = otro.minimo, otro.maximo
+            return self
+
+        n = self.n + otro.n
+        delta = otro.media - self.media
+        self.media += delta * otro.n / n
+        self.m2 += otro.m2 + delta * delta * self.n * otro.n / n
+        self.n = n
+        self.minimo = min(self.minimo, otro.minimo)
+        self.maximo = max(self.maximo, otro.maximo)
+        return self
+
+    @property
+    def varianza(self):
+        """Varianza poblacional, igual que np.var."""
+        return self.m2 / self.n if self.n else np.nan
+
+    @property
+    def desviacion(self):
+        """Desviación estándar poblacional, igual que np.std."""
+        return float(np.sqrt(self.varianza))
+
+
+class BosquejoCuantiles:
+    """
+    Bosquejo de cuantiles con error relativo acotado (tipo DDSketch).
+
+    Cada valor cae en una cubeta logarítmica de ancho gamma = (1+a)/(1-a),
+    así que cualquier cuantil se recupera con error relativo menor que a.
+    La memoria depende del rango de los datos, no de cuántos sean, y dos
+    bosquejos se combinan sumando cuentas.
+    """
+
+    __slots__ = ("precision", "_log_gamma", "_positivos", "_negativos", "ceros")
+
+    def __init__(self, precision=0.001):
+        self.precision = precision
+        self._log_gamma = np.log((1 + precision) / (1 - precision))
+        # (índices de cubeta ordenados, cuentas)
+        self._positivos = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+        self._negativos = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+        self.ceros = 0
+
+    @property
+    def n(self):
+        return int(self._positivos[1].sum() + self._negativos[1].sum() + self.ceros)
+
+    @staticmethod
+    def _unir(cubetas, indices, cuentas):
+        todos = np.concatenate([cubetas[0], indices])
+        pesos = np.concatenate([cubetas[1], cuentas])
+        unicos, inversa = np.unique(todos, return_inverse=True)
+        return unicos, np.bincount(inversa, weights=pesos, minlength=unicos.size).astype(np.int64)
+
+    def _indices(self, magnitudes):
+        return np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+
+    def agregar(self, valores):
+        """Incorpora un arreglo de valores."""
+        valores = np.asarray(valores, dtype=float).ravel()
+        valores = valores[np.isfinite(valores)]
+
+        positivos = valores[valores > 0]
+        negativos = -valores[valores < 0]
+        self.ceros += int(valores.size - positivos.size - negativos.size)
+
+        if positivos.size:
+            indices, cuentas = np.unique(self._indices(positivos), return_counts=True)
+            self._positivos = self._unir(self._positivos, indices, cuentas)
+        if negativos.size:
+            indices, cuentas = np.unique(self._indices(negativos), return_counts=True)
+            self._negativos = self._unir(self._negativos, indices, cuentas)
+        return self
+
+    def combinar(self, otro):
+        """Une otro bosquejo con la misma precisión."""
+        if otro.precision != self.precision:
+            raise ValueError("solo se pueden combinar bosquejos con la misma precisión")
+        self._positivos = self._unir(self._positivos, *otro._positivos)
+        self._negativos = self._unir(self._negativos, *otro._negativos)
+        self.ceros += otro.ceros
+        return self
+
+    def cuantiles(self, qs):
+        """Cuantiles aproximados para las probabilidades qs (entre 0 y 1)."""
+        qs = np.atleast_1d(np.asarray(qs, dtype=float))
+        n = self.n
+        if n == 0:
+            return np.full(qs.shape, np.nan)
+
+        gamma = np.exp(self._log_gamma)
+
+        def representante(indices):
+            return 2 * np.exp(indices * self._log_gamma) / (gamma + 1)
+
+        # Orden ascendente: negativos (de mayor a menor magnitud), ceros, positivos
+        valores = np.concatenate([
+            -representante(self._negativos[0][::-1]),
+            [0.0],
+            representante(self._positivos[0]),
+        ])
+        cuentas = np.concatenate([self._negativos[1][::-1], [self.ceros], self._positivos[1]])
+
+        acumulada = np.cumsum(cuentas)
+        rangos = qs * (n - 1)
+        return valores[np.searchsorted(acumulada, rangos, side="right")]
+
+    def cuantil(self, q):
+        return float(self.cuantiles([q])[0])
+
+
+class Reservorio:
+    """
+    Muestra aleatoria acotada (k filas) de un flujo de datos.
+
+    Cada fila recibe una clave uniforme y se conservan las k claves más
+    pequeñas; por eso dos reservorios se combinan sin perder uniformidad.
+    """
+
+    __slots__ = ("k", "claves", "columnas")
+
+    def __init__(self, k):
+        self.k = int(k)
+        self.claves = np.empty(0)
+        self.columnas = None
+
+    def agregar(self, claves, **columnas):
+        """Agrega filas (mismo largo que claves) identificadas por nombre."""
+        if self.k <= 0:
+            return self
+
+        claves = np.asarray(claves, dtype=float)
+        if self.columnas is not None:
+            claves = np.concatenate([self.claves, claves])
+            columnas = {
+                nombre: np.concatenate([self.columnas[nombre], valores])
+                for nombre, valores in columnas.items()
+            }
+
+        if claves.size > self.k:
+            elegidas = np.argpartition(claves, self.k - 1)[:self.k]
+        else:
+            elegidas = np.arange(claves.size)
+        elegidas = elegidas[np.argsort(claves[elegidas], kind="stable")]
+
+        self.claves = claves[elegidas]
+        self.columnas = {nombre: valores[elegidas] for nombre, valores in columnas.items()}
+        return self
+
+    def combinar(self, otro):
+        if otro.columnas is None:
+            return self
+        return self.agregar(otro.claves, **otro.columnas)
+
+    def columna(self, nombre):
+        if self.columnas is None:
+            return np.empty(0)
+        return self.columnas[nombre]
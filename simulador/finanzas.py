@@ -1,31 +1,236 @@
-import numpy as np
-
-
-# Cálculo de VAN igual que Excel
-
-def calcular_van(inversion_inicial, tasa_descuento, flujo):
-    """
-    flujo = lista con los flujos de caja de cada año.
-    VAN = -inversión inicial + Σ (FC_t / (1+r)^t)
-    """
-
-    van = -inversion_inicial
-
-    for t, fc in enumerate(flujo, start=1):
-        van += fc / ((1 + tasa_descuento) ** t)
-
-    return van
-
-
-
-# Resumen estadístico del VAN
-
-def resumen_van(lista_vanes):
-
-    return {
-        "van_promedio": float(np.mean(lista_vanes)),
-        "van_min": float(np.min(lista_vanes)),
-        "van_max": float(np.max(lista_vanes)),
-        "desviacion": float(np.std(lista_vanes)),
-        "mediana": float(np.median(lista_vanes))
-    }
+from functools import lru_cache
+
+import numpy as np
+
+
+# Cálculo de VAN igual que Excel
+
+def calcular_van(inversion_inicial, tasa_descuento, flujo):
+    """
+    flujo = lista con los flujos de caja de cada año.
+    VAN = -inversión inicial + Σ (FC_t / (1+r)^t)
+    """
+
+    van = -inversion_inicial
+
+    for t, fc in enumerate(flujo, start=1):
+        van += fc / ((1 + tasa_descuento) ** t)
+
+    return van
+
+
+
+# Factores de descuento (se calculan una vez por tasa y vida)
+
+@lru_cache(maxsize=256)
+def _factores_descuento(tasa_descuento, vida):
+    t = np.arange(1, vida + 1, dtype=float)
+    factores = (1 + tasa_descuento) ** -t
+    factores.setflags(write=False)
+    return factores
+
+
+def factores_descuento(tasa_descuento, vida):
+    """
+    Vector (vida,) con 1/(1+r)^t para t = 1..vida.
+    Queda guardado por (tasa_descuento, vida) y es de solo lectura.
+    """
+    return _factores_descuento(float(tasa_descuento), int(vida))
+
+
+@lru_cache(maxsize=256)
+def _factor_anualidad(tasa_descuento, vida):
+    return float(_factores_descuento(tasa_descuento, vida).sum())
+
+
+def factor_anualidad(tasa_descuento, vida):
+    """Σ 1/(1+r)^t para t = 1..vida: valor presente de 1 por año."""
+    return _factor_anualidad(float(tasa_descuento), int(vida))
+
+
+
+# VAN en lote
+
+def calcular_van_lote(inversion_inicial, tasa_descuento, flujos):
+    """
+    VAN de muchas iteraciones a la vez.
+    flujos = matriz (n, vida) con los flujos de cada iteración.
+    Devuelve un arreglo (n,) con el mismo criterio que calcular_van;
+    el descuento es un solo producto matriz-vector.
+    """
+    flujos = np.asarray(flujos)
+    if flujos.dtype not in (np.float32, np.float64):
+        flujos = flujos.astype(float)
+
+    return -inversion_inicial + flujos @ factores_descuento(tasa_descuento, flujos.shape[-1])
+
+
+def calcular_van_anualidad(inversion_inicial, tasa_descuento, vida, flujo_anual,
+                           valor_desecho=0):
+    """
+    VAN cuando el flujo es el mismo todos los años y el último año suma el
+    valor de desecho (el caso del modelo base), sin armar la matriz:
+
+        VAN = -inversión + flujo_anual · FA(r, vida) + desecho / (1+r)^vida
+
+    flujo_anual puede ser un número o un arreglo (n,).
+    """
+    factores = factores_descuento(tasa_descuento, vida)
+
+    return (-inversion_inicial
+            + np.asarray(flujo_anual, dtype=float) * factor_anualidad(tasa_descuento, vida)
+            + valor_desecho * factores[-1])
+
+
+
+# TIR vectorizada (sin np.irr, que ya no existe en NumPy)
+
+# Códigos que acompañan a cada TIR calculada
+TIR_VALIDA = 0
+TIR_SIN_RAIZ = 1            # el VAN no cambia de signo en [tasa_min, tasa_max]
+TIR_RAICES_MULTIPLES = 2    # los flujos cambian de signo más de una vez
+TIR_NO_CONVERGE = 3         # se agotaron las iteraciones sin converger
+
+
+def _van_en_tasa(columnas, v):
+    """
+    VAN y su derivada respecto a la tasa, por Horner en v = 1/(1+r).
+    columnas[t] = flujos del período t para todas las filas.
+    """
+    van = columnas[-1] + np.zeros_like(v)
+    dvan = np.zeros_like(v)
+    for col in columnas[-2::-1]:
+        dvan = dvan * v + van
+        van = van * v + col
+
+    # dv/dr = -v²
+    return van, -dvan * v * v
+
+
+def _cambios_de_signo(columnas):
+    """Número de cambios de signo por fila, ignorando los flujos en cero."""
+    anterior = np.zeros(columnas[0].shape)
+    cambios = np.zeros(columnas[0].shape, dtype=np.int64)
+    for col in columnas:
+        signo = np.sign(col)
+        cambios += (signo * anterior) < 0
+        anterior = np.where(signo != 0, signo, anterior)
+    return cambios
+
+
+def _tir_bloque(columnas, tasa_min, tasa_max, tol, max_iter):
+    n = columnas[0].shape[0]
+    tirs = np.full(n, np.nan)
+    codigos = np.full(n, TIR_SIN_RAIZ, dtype=np.int8)
+
+    cambios = _cambios_de_signo(columnas)
+
+    lo = np.full(n, float(tasa_min))
+    hi = np.full(n, float(tasa_max))
+    f_lo, _ = _van_en_tasa(columnas, 1 / (1 + lo))
+    f_hi, _ = _van_en_tasa(columnas, 1 / (1 + hi))
+
+    codigos[cambios > 1] = TIR_RAICES_MULTIPLES
+    activos = np.flatnonzero(
+        (cambios == 1) & np.isfinite(f_lo) & np.isfinite(f_hi)
+        & (np.sign(f_lo) != np.sign(f_hi))
+    )
+    if activos.size == 0:
+        return tirs, codigos
+
+    columnas = [c[activos] for c in columnas]
+    lo, hi = lo[activos], hi[activos]
+    signo_lo = np.sign(f_lo[activos])
+
+    # Aproximación inicial: rendimiento "promedio" de los flujos positivos
+    # frente a los negativos, repartido en la mitad del horizonte.
+    positivos = sum(np.maximum(c, 0) for c in columnas)
+    negativos = sum(np.maximum(-c, 0) for c in columnas)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = (positivos / negativos) ** (2.0 / len(columnas)) - 1
+    r = np.where(np.isfinite(r), r, 0.1)
+    r = np.clip(r, lo + 1e-6, hi - 1e-6)
+
+    for _ in range(max_iter):
+        f, df = _van_en_tasa(columnas, 1 / (1 + r))
+
+        # Mantener el intervalo [lo, hi] que encierra la raíz
+        mismo_lado = np.sign(f) == signo_lo
+        lo = np.where(mismo_lado, r, lo)
+        hi = np.where(mismo_lado, hi, r)
+
+        # Paso de Newton; si sale del intervalo, bisección
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r_nuevo = r - f / df
+        fuera = ~((r_nuevo > lo) & (r_nuevo < hi))
+        r_nuevo = np.where(fuera, 0.5 * (lo + hi), r_nuevo)
+
+        # Si r ya es raíz exacta, se queda r (el intervalo acaba de cerrarse en r)
+        exacta = f == 0
+        r_nuevo = np.where(exacta, r, r_nuevo)
+
+        listo = (np.abs(r_nuevo - r) <= tol * (1 + np.abs(r))) | exacta
+        r = r_nuevo
+
+        if listo.any():
+            tirs[activos[listo]] = r[listo]
+            codigos[activos[listo]] = TIR_VALIDA
+
+            sigue = ~listo
+            activos = activos[sigue]
+            if activos.size == 0:
+                break
+            columnas = [c[sigue] for c in columnas]
+            r, lo, hi, signo_lo = r[sigue], lo[sigue], hi[sigue], signo_lo[sigue]
+
+    codigos[activos] = TIR_NO_CONVERGE
+    return tirs, codigos
+
+
+def calcular_tir_lote(flujos, inversion_inicial=None, tasa_min=-0.99, tasa_max=10.0,
+                      tol=1e-10, max_iter=100, tamano_bloque=65536):
+    """
+    TIR de cada fila de la matriz flujos (n, periodos).
+
+    Si se da inversion_inicial, se usa tal cual como flujo del año 0 (con su
+    signo: una salida va negativa, a diferencia de calcular_van, que la
+    resta) y flujos contiene solo los años 1..vida; si no, la primera
+    columna de flujos es el año 0.
+
+    Usa pasos de Newton con respaldo de bisección dentro de [tasa_min, tasa_max].
+    Devuelve (tirs, codigos): donde no hay una TIR única la tasa es NaN y el
+    código dice por qué (TIR_SIN_RAIZ, TIR_RAICES_MULTIPLES, TIR_NO_CONVERGE).
+    """
+    flujos = np.atleast_2d(np.asarray(flujos, dtype=float))
+    n = flujos.shape[0]
+
+    tirs = np.empty(n)
+    codigos = np.empty(n, dtype=np.int8)
+
+    for inicio in range(0, n, tamano_bloque):
+        fin = min(inicio + tamano_bloque, n)
+        bloque = flujos[inicio:fin]
+
+        columnas = [np.ascontiguousarray(bloque[:, t]) for t in range(bloque.shape[1])]
+        if inversion_inicial is not None:
+            columnas.insert(0, np.full(fin - inicio, float(inversion_inicial)))
+
+        tirs[inicio:fin], codigos[inicio:fin] = _tir_bloque(
+            columnas, tasa_min, tasa_max, tol, max_iter
+        )
+
+    return tirs, codigos
+
+
+
+# Resumen estadístico del VAN
+
+def resumen_van(lista_vanes):
+
+    return {
+        "van_promedio": float(np.mean(lista_vanes)),
+        "van_min": float(np.min(lista_vanes)),
+        "van_max": float(np.max(lista_vanes)),
+        "desviacion": float(np.std(lista_vanes)),
+        "mediana": float(np.median(lista_vanes))
+    }
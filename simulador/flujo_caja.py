@@ -1,65 +1,88 @@
-import numpy as np
-
-
-def flujo_caja_anual(demanda, precio, costo_variable, costo_fijo,
-                     depreciacion_anual, tasa_impuesto, valor_desecho=0, ultimo_anio=False):
-    """
-    Calcula el flujo de caja anual igual que en Excel.
-
-    Fórmulas Excel equivalentes:
-        Ingresos = Demanda * Precio
-        CV = Demanda * CostoVariable
-        Utilidad antes de impuestos = Ingresos - CV - CF - Depreciación
-        Impuesto = Utilidad * tasa
-        Utilidad neta = Utilidad - Impuesto
-        Flujo = Utilidad neta + Depreciación + Valor de desecho (solo último año)
-    """
-
-    ingresos = demanda * precio
-    cv = demanda * costo_variable
-
-    utilidad = ingresos - cv - costo_fijo - depreciacion_anual
-    impuesto_total = utilidad * tasa_impuesto
-
-    utilidad_neta = utilidad - impuesto_total
-
-    flujo = utilidad_neta + depreciacion_anual
-
-    # Valor de desecho si es último año
-    if ultimo_anio:
-        flujo += valor_desecho
-
-    return flujo, {
-        "ingresos": ingresos,
-        "cv": cv,
-        "utilidad": utilidad,
-        "impuesto": impuesto_total,
-        "utilidad_neta": utilidad_neta,
-        "flujo": flujo,
-        "valor_desecho": valor_desecho if ultimo_anio else 0
-    }
-def calcular_flujo_proyecto(parametros, ultimo_anio=False):
-    """
-    Wrapper para conectar con simulacion.py
-    Parámetros esperados:
-        parametros = {
-            "demanda": ...,
-            "precio": ...,
-            "costo_variable": ...,
-            "costo_fijo": ...,
-            "depreciacion": ...,
-            "tasa_impuesto": ...,
-            "valor_desecho": ...
-        }
-    """
-
-    return flujo_caja_anual(
-        demanda=parametros["demanda"],
-        precio=parametros["precio"],
-        costo_variable=parametros["costo_variable"],
-        costo_fijo=parametros["costo_fijo"],
-        depreciacion_anual=parametros["depreciacion"],
-        tasa_impuesto=parametros["tasa_impuesto"],
-        valor_desecho=parametros.get("valor_desecho", 0),
-        ultimo_anio=ultimo_anio
-    )
+import numpy as np
+
+
+def flujo_caja_anual(demanda, precio, costo_variable, costo_fijo,
+                     depreciacion_anual, tasa_impuesto, valor_desecho=0, ultimo_anio=False):
+    """
+    Calcula el flujo de caja anual igual que en Excel.
+
+    Fórmulas Excel equivalentes:
+        Ingresos = Demanda * Precio
+        CV = Demanda * CostoVariable
+        Utilidad antes de impuestos = Ingresos - CV - CF - Depreciación
+        Impuesto = Utilidad * tasa
+        Utilidad neta = Utilidad - Impuesto
+        Flujo = Utilidad neta + Depreciación + Valor de desecho (solo último año)
+    """
+
+    ingresos = demanda * precio
+    cv = demanda * costo_variable
+
+    utilidad = ingresos - cv - costo_fijo - depreciacion_anual
+    impuesto_total = utilidad * tasa_impuesto
+
+    utilidad_neta = utilidad - impuesto_total
+
+    flujo = utilidad_neta + depreciacion_anual
+
+    # Valor de desecho si es último año
+    if ultimo_anio:
+        flujo += valor_desecho
+
+    return flujo, {
+        "ingresos": ingresos,
+        "cv": cv,
+        "utilidad": utilidad,
+        "impuesto": impuesto_total,
+        "utilidad_neta": utilidad_neta,
+        "flujo": flujo,
+        "valor_desecho": valor_desecho if ultimo_anio else 0
+    }
+def calcular_flujo_proyecto(parametros, ultimo_anio=False):
+    """
+    Wrapper para conectar con simulacion.py
+    Parámetros esperados:
+        parametros = {
+            "demanda": ...,
+            "precio": ...,
+            "costo_variable": ...,
+            "costo_fijo": ...,
+            "depreciacion": ...,
+            "tasa_impuesto": ...,
+            "valor_desecho": ...
+        }
+    """
+
+    return flujo_caja_anual(
+        demanda=parametros["demanda"],
+        precio=parametros["precio"],
+        costo_variable=parametros["costo_variable"],
+        costo_fijo=parametros["costo_fijo"],
+        depreciacion_anual=parametros["depreciacion"],
+        tasa_impuesto=parametros["tasa_impuesto"],
+        valor_desecho=parametros.get("valor_desecho", 0),
+        ultimo_anio=ultimo_anio
+    )
+
+
+def flujo_anual_lote(demanda, precio, costo_variable, costo_fijo,
+                     depreciacion_anual, tasa_impuesto):
+    """Flujo anual (sin valor de desecho) de cada iteración, arreglo (n,)."""
+    flujo, _ = flujo_caja_anual(
+        demanda=np.asarray(demanda, dtype=float),
+        precio=np.asarray(precio, dtype=float),
+        costo_variable=np.asarray(costo_variable, dtype=float),
+        costo_fijo=np.asarray(costo_fijo, dtype=float),
+        depreciacion_anual=depreciacion_anual,
+        tasa_impuesto=tasa_impuesto,
+    )
+    return flujo
+
+
+def matriz_flujos(flujo_anual, valor_desecho, vida):
+    """Matriz (n, vida) con el flujo anual repetido y el desecho en el último año."""
+    flujos = np.empty((flujo_anual.shape[0], vida))
+    flujos[:] = flujo_anual[:, None]
+    flujos[:, -1] += valor_desecho
+
+    return flujos
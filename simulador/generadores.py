@@ -1,46 +1,228 @@
-import random
-import numpy as np
-
-
-# DISTRIBUCIONES BÁSICAS
-
-
-def generar_uniforme(a, b):
-    """Distribución uniforme: igual que Excel =a+R*(b-a)"""
-    R = random.random()
-    return a + R * (b - a)
-
-def generar_normal(mu, sigma):
-    """Distribución normal: NORM.INV(R; mu; sigma)"""
-    return np.random.normal(mu, sigma)
-
-def generar_discreta(valores, probabilidades):
-    """Distribución discreta para costos fijos"""
-    R = random.random()
-    acumulada = 0
-    for valor, prob in zip(valores, probabilidades):
-        acumulada += prob
-        if R <= acumulada:
-            return valor
-    return valores[-1]  # fallback
-
-
-
-# FUNCIONES DE ALTO NIVEL PARA EL PROYECTO
-
-
-def generar_demanda(a, b):
-    """Genera demanda usando distribución uniforme"""
-    return generar_uniforme(a, b)
-
-def generar_precio(mu, sigma):
-    """Genera precio con distribución normal"""
-    return generar_normal(mu, sigma)
-
-def generar_costo_variable(a, b):
-    """Costo variable por unidad: uniforme"""
-    return generar_uniforme(a, b)
-
-def generar_costo_fijo(valores, probabilidades):
-    """Costo fijo anual elegido por probabilidad"""
-    return generar_discreta(valores, probabilidades)
+from functools import lru_cache
+
+import numpy as np
+from scipy.special import ndtri
+
+
+# GENERADOR COMPARTIDO
+# Todas las funciones usan un solo numpy.random.Generator; se puede pasar
+# otro con rng=... (por ejemplo, uno por proceso o con semilla fija).
+
+_rng = np.random.default_rng()
+
+
+def fijar_semilla(semilla=None):
+    """Reinicia el generador compartido para poder repetir resultados."""
+    global _rng
+    _rng = np.random.default_rng(semilla)
+    return _rng
+
+
+def obtener_generador(rng=None):
+    """Devuelve rng si se pasa uno; si no, el generador compartido."""
+    return _rng if rng is None else rng
+
+
+
+# TRANSFORMACIÓN DE UNIFORMES R (como en Excel)
+# Sirven para muestreos que generan sus propios R (antitético, LHS, Sobol).
+
+
+def uniforme_desde_R(a, b, R):
+    """=a+R*(b-a)"""
+    return a + np.asarray(R) * (b - a)
+
+def normal_desde_R(mu, sigma, R):
+    """=NORM.INV(R; mu; sigma)"""
+    R = np.clip(R, 1e-12, 1 - 1e-12)  # evita ±infinito en R = 0 o 1
+    return mu + sigma * ndtri(R)
+
+def discreta_desde_R(valores, probabilidades, R):
+    """Primer valor cuya probabilidad acumulada alcanza R"""
+    return distribucion_discreta(valores, probabilidades).desde_uniformes(R)
+
+
+
+# DISTRIBUCIONES BÁSICAS (EN LOTE)
+
+
+def generar_uniforme_lote(a, b, size, rng=None):
+    """n valores uniformes: igual que Excel =a+R*(b-a) con R = ALEATORIO()"""
+    return uniforme_desde_R(a, b, obtener_generador(rng).random(size))
+
+def generar_normal_lote(mu, sigma, size, rng=None):
+    """n valores normales: NORM.INV(R; mu; sigma)"""
+    return obtener_generador(rng).normal(mu, sigma, size)
+
+def generar_discreta_lote(valores, probabilidades, size, rng=None):
+    """n valores de la distribución discreta (costos fijos)"""
+    return distribucion_discreta(valores, probabilidades).muestrear(size, rng)
+
+
+
+# DISTRIBUCIÓN DISCRETA COMPILADA
+
+
+class DistribucionDiscreta:
+    """
+    Distribución discreta preparada una sola vez por juego de parámetros.
+
+    Valida y normaliza las probabilidades y guarda dos tablas:
+    - la acumulada, para muestrear por inversa de la CDF con searchsorted
+      (igual que Excel: el primer valor cuya acumulada alcanza R);
+    - la tabla de alias de Walker, para muestrear en O(1) por valor
+      aunque haya cientos de categorías.
+    """
+
+    # Con pocas categorías la búsqueda en la acumulada es igual de rápida
+    # y conserva el orden de R (útil para LHS, Sobol, etc.).
+    MAX_CATEGORIAS_TABLA = 16
+
+    def __init__(self, valores, probabilidades, tolerancia=1e-3):
+        # Copia propia: se congela sin tocar el arreglo de quien llama
+        valores = np.array(valores, dtype=float)
+        probs = np.asarray(probabilidades, dtype=float)
+
+        if valores.ndim != 1 or valores.size == 0:
+            raise ValueError("valores debe ser una lista no vacía")
+        if probs.shape != valores.shape:
+            raise ValueError("valores y probabilidades deben tener el mismo largo")
+        if not np.all(np.isfinite(probs)) or np.any(probs < 0):
+            raise ValueError("las probabilidades deben ser números no negativos")
+
+        total = probs.sum()
+        if abs(total - 1) > tolerancia:
+            raise ValueError(f"las probabilidades suman {total:.6f}, no 1")
+
+        self.valores = valores
+        self.probabilidades = probs / total
+
+        self.acumulada = np.cumsum(self.probabilidades)
+        self.acumulada[-1] = 1.0
+
+        self.prob_alias, self.alias = self._tabla_alias(self.probabilidades)
+
+        for arr in (self.valores, self.probabilidades, self.acumulada,
+                    self.prob_alias, self.alias):
+            arr.setflags(write=False)
+
+    @staticmethod
+    def _tabla_alias(probs):
+        """Tabla de alias de Walker (método de Vose)."""
+        k = probs.size
+        escalada = probs * k
+        prob_alias = np.ones(k)
+        alias = np.arange(k)
+
+        pequenos = [i for i in range(k) if escalada[i] < 1]
+        grandes = [i for i in range(k) if escalada[i] >= 1]
+
+        while pequenos and grandes:
+            p = pequenos.pop()
+            g = grandes[-1]
+            prob_alias[p] = escalada[p]
+            alias[p] = g
+            escalada[g] -= 1 - escalada[p]
+            if escalada[g] < 1:
+                pequenos.append(grandes.pop())
+
+        return prob_alias, alias
+
+    def indices_desde_uniformes(self, R):
+        """Inversa de la CDF: posición del primer valor cuya acumulada alcanza R."""
+        indices = np.searchsorted(self.acumulada, R, side="left")
+        return np.minimum(indices, self.valores.size - 1)
+
+    def desde_uniformes(self, R):
+        """Valores que corresponden a los uniformes R (inversa de la CDF)."""
+        return self.valores[self.indices_desde_uniformes(R)]
+
+    def muestrear_indices(self, size, rng=None, metodo=None):
+        """
+        Posiciones muestreadas con metodo "tabla" (inversa de la CDF) o
+        "alias" (Walker). Por defecto se elige según el número de categorías.
+        """
+        rng = obtener_generador(rng)
+        if metodo is None:
+            metodo = "tabla" if self.valores.size <= self.MAX_CATEGORIAS_TABLA else "alias"
+
+        if metodo == "tabla":
+            return self.indices_desde_uniformes(rng.random(size))
+        if metodo == "alias":
+            columna = rng.integers(0, self.valores.size, size)
+            return np.where(rng.random(size) < self.prob_alias[columna],
+                            columna, self.alias[columna])
+        raise ValueError(f"método de muestreo desconocido: {metodo}")
+
+    def muestrear(self, size, rng=None, metodo=None):
+        """n valores de la distribución."""
+        return self.valores[self.muestrear_indices(size, rng, metodo)]
+
+
+@lru_cache(maxsize=128)
+def _distribucion_discreta(valores, probabilidades):
+    return DistribucionDiscreta(valores, probabilidades)
+
+
+def distribucion_discreta(valores, probabilidades):
+    """
+    DistribucionDiscreta para estos parámetros, construida una sola vez
+    y reutilizada en las llamadas siguientes.
+    """
+    return _distribucion_discreta(tuple(valores), tuple(probabilidades))
+
+
+
+# DISTRIBUCIONES BÁSICAS (UN VALOR)
+
+
+def generar_uniforme(a, b):
+    """Distribución uniforme: igual que Excel =a+R*(b-a)"""
+    return float(generar_uniforme_lote(a, b, 1)[0])
+
+def generar_normal(mu, sigma):
+    """Distribución normal: NORM.INV(R; mu; sigma)"""
+    return float(generar_normal_lote(mu, sigma, 1)[0])
+
+def generar_discreta(valores, probabilidades):
+    """Distribución discreta para costos fijos"""
+    indice = distribucion_discreta(valores, probabilidades).muestrear_indices(1)[0]
+    return valores[int(indice)]
+
+
+
+# FUNCIONES DE ALTO NIVEL PARA EL PROYECTO
+
+
+def generar_demanda(a, b):
+    """Genera demanda usando distribución uniforme"""
+    return generar_uniforme(a, b)
+
+def generar_precio(mu, sigma):
+    """Genera precio con distribución normal"""
+    return generar_normal(mu, sigma)
+
+def generar_costo_variable(a, b):
+    """Costo variable por unidad: uniforme"""
+    return generar_uniforme(a, b)
+
+def generar_costo_fijo(valores, probabilidades):
+    """Costo fijo anual elegido por probabilidad"""
+    return generar_discreta(valores, probabilidades)
+
+
+def generar_demanda_lote(a, b, size, rng=None):
+    """n demandas con distribución uniforme"""
+    return generar_uniforme_lote(a, b, size, rng)
+
+def generar_precio_lote(mu, sigma, size, rng=None):
+    """n precios con distribución normal"""
+    return generar_normal_lote(mu, sigma, size, rng)
+
+def generar_costo_variable_lote(a, b, size, rng=None):
+    """n costos variables por unidad: uniforme"""
+    return generar_uniforme_lote(a, b, size, rng)
+
+def generar_costo_fijo_lote(valores, probabilidades, size, rng=None):
+    """n costos fijos anuales elegidos por probabilidad"""
+    return generar_discreta_lote(valores, probabilidades, size, rng)
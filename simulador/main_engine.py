@@ -1,36 +1,159 @@
-# simulador/main_engine.py
-
-from simulador.simulacion import correr_simulacion
-from simulador.validacion import validar_aleatorios
-from simulador.pdf_report import generar_reporte_pdf
-
-def ejecutar_simulacion(parametros, iteraciones=1000):
-    """
-    Correr la simulación COMPLETA y devolver:
-    - vans: lista de VAN por iteración
-    - tirs: lista de TIR por iteración
-    - flujos: flujos de caja año por año
-    - resumen: estadísticas del VAN y TIR
-    """
-    vans, tirs, flujos, resumen = correr_simulacion(parametros, iteraciones)
-    return vans, tirs, flujos, resumen
-
-
-def generar_reporte(parametros, iteraciones=1000):
-    """
-    Generar el PDF completo usando:
-    - simulación del VAN
-    - validación estadística
-    - gráfica del VAN
-    """
-    vans, tirs, flujos, resumen = ejecutar_simulacion(parametros, iteraciones)
-
-    resultados_pruebas = validar_aleatorios(parametros)
-
-    ruta_pdf = generar_reporte_pdf(
-        resumen=resumen,
-        resultados_pruebas=resultados_pruebas,
-        ruta_grafica="grafica_van.png"
-    )
-    
-    return ruta_pdf
+# simulador/main_engine.py
+
+from contextlib import nullcontext
+
+import numpy as np
+
+from simulador.simulacion import (
+    correr_simulacion_lote, correr_simulacion_streaming, correr_simulacion_adaptativa,
+)
+from simulador.pdf_report import generar_reporte_pdf
+from simulador.sensibilidad import barrido_sensibilidad, tabla_tornado
+from simulador.cache import clave_simulacion, obtener_cache
+from simulador.perfil import perfilar, tramo
+
+def ejecutar_simulacion(parametros, iteraciones=1000, semilla=None, workers=1,
+                        streaming=False, reservorio=10000,
+                        conservar_flujos="todos", muestra_flujos=1000,
+                        dtype=np.float64, precision_objetivo=None,
+                        objetivo="media_van", max_iteraciones=1_000_000,
+                        metodo_muestreo="mc", validar=False, cache=True,
+                        medir_tiempos=False):
+    """
+    Correr la simulación COMPLETA y devolver un ResultadoSimulacion, que se
+    desempaqueta como:
+    - vans: arreglo con el VAN de cada iteración
+    - tirs: arreglo con la TIR de cada iteración
+    - flujos: matriz (iteraciones, vida) con los flujos de caja año por año
+    - resumen: estadísticas del VAN y TIR
+
+    semilla permite repetir exactamente la misma corrida; workers reparte
+    las iteraciones en varios procesos (None = todos los núcleos) sin
+    cambiar el resultado.
+
+    Con streaming=True las iteraciones no se guardan: el resumen sale de
+    acumuladores en línea y vans/tirs/flujos son solo una muestra aleatoria
+    de hasta `reservorio` iteraciones (para gráficas).
+
+    conservar_flujos ("todos", "muestra" o "ninguno") y dtype=np.float32
+    controlan cuánta memoria ocupa el resultado en modo normal.
+
+    Con precision_objetivo (modo adaptativo) se simula por tandas hasta que
+    el semiancho del IC 95% del objetivo ("media_van" o "prob_van_negativo")
+    llegue a ese valor o se gasten max_iteraciones; `iteraciones` es el
+    mínimo. El resumen informa iteraciones_usadas y precision_alcanzada.
+
+    metodo_muestreo = "mc", "antitetico", "lhs" o "sobol" reduce la varianza
+    de los estimadores para el mismo número de iteraciones.
+
+    validar=True acumula durante la corrida las frecuencias de las entradas
+    que realmente se usaron; resultado.validacion.resultados() aplica las
+    pruebas de bondad de ajuste sin sortear muestras aparte.
+
+    Con semilla fija (entera) el resultado se guarda en la caché (memoria y disco) y
+    una corrida idéntica se devuelve sin simular; cache=False lo evita, y
+    también puede pasarse una CacheResultados propia. Los arreglos de un
+    resultado en caché son de solo lectura.
+
+    medir_tiempos=True deja en resultado.perfil el tiempo de cada fase
+    (muestreo, flujos, van, tir, resumen, caché...) y las iteraciones/s;
+    ver perfil.py.
+    """
+    # Opciones que cambian el resultado (workers no lo cambia)
+    opciones = dict(
+        streaming=streaming, reservorio=reservorio,
+        conservar_flujos=conservar_flujos, muestra_flujos=muestra_flujos,
+        dtype=dtype, precision_objetivo=precision_objetivo, objetivo=objetivo,
+        max_iteraciones=max_iteraciones, validar=validar,
+    )
+
+    with perfilar() if medir_tiempos else nullcontext() as perfil:
+        resultado = _simular_con_cache(
+            parametros, iteraciones, semilla, workers, metodo_muestreo, cache, opciones
+        )
+    if perfil is not None:
+        resultado.perfil = perfil.resumen()
+    return resultado
+
+
+def _simular_con_cache(parametros, iteraciones, semilla, workers, metodo_muestreo, cache,
+                       opciones):
+    """Resultado de la caché (con semilla entera) o simulado y guardado en ella."""
+    if cache is False or not isinstance(semilla, (int, np.integer)):
+        return _simular(parametros, iteraciones, semilla, workers, metodo_muestreo, **opciones)
+
+    almacen = obtener_cache() if cache is True else cache
+    clave = clave_simulacion(parametros, iteraciones, semilla, metodo_muestreo, **opciones)
+    with tramo("cache.obtener"):
+        resultado = almacen.obtener(clave)
+    if resultado is None:
+        resultado = _simular(parametros, iteraciones, semilla, workers, metodo_muestreo, **opciones)
+        with tramo("cache.guardar"):
+            resultado = almacen.guardar(clave, resultado)
+    resultado.clave = clave
+    return resultado
+
+
+def _simular(parametros, iteraciones, semilla, workers, metodo_muestreo, streaming,
+             reservorio, conservar_flujos, muestra_flujos, dtype, precision_objetivo,
+             objetivo, max_iteraciones, validar):
+    """Elige el motor (adaptativo, streaming o en lote) y corre la simulación."""
+    if precision_objetivo is not None:
+        return correr_simulacion_adaptativa(
+            parametros, precision_objetivo, objetivo=objetivo,
+            iteraciones_min=iteraciones, max_iteraciones=max_iteraciones,
+            semilla=semilla, workers=workers, reservorio=reservorio,
+            metodo_muestreo=metodo_muestreo, validar=validar,
+        )
+
+    if streaming:
+        return correr_simulacion_streaming(
+            parametros, iteraciones, semilla=semilla, workers=workers,
+            reservorio=reservorio, metodo_muestreo=metodo_muestreo, validar=validar,
+        )
+
+    return correr_simulacion_lote(
+        parametros, iteraciones, semilla=semilla, workers=workers,
+        conservar_flujos=conservar_flujos, muestra_flujos=muestra_flujos,
+        dtype=dtype, metodo_muestreo=metodo_muestreo, validar=validar,
+    )
+
+
+def generar_reporte(parametros, iteraciones=1000, incluir_sensibilidad=False,
+                    semilla=None, metodo_muestreo="mc"):
+    """
+    Generar el PDF completo usando:
+    - simulación del VAN
+    - validación estadística
+    - gráfica del VAN
+    - (opcional) tabla de sensibilidad del VAN medio
+
+    Las pruebas estadísticas se aplican a las entradas que realmente usó
+    la simulación. Con la misma semilla que la simulación ya mostrada, el
+    resultado sale de la caché en lugar de simularse de nuevo.
+    """
+    resultado = ejecutar_simulacion(
+        parametros, iteraciones, semilla=semilla, metodo_muestreo=metodo_muestreo,
+        validar=True,
+    )
+    resumen = resultado.resumen
+
+    with tramo("validacion.pruebas"):
+        resultados_pruebas = resultado.validacion.resultados()
+
+    tornado = None
+    if incluir_sensibilidad:
+        with tramo("sensibilidad"):
+            tornado = tabla_tornado(barrido_sensibilidad(
+                parametros, iteraciones=iteraciones, semilla=semilla,
+                metodo_muestreo=metodo_muestreo,
+            ))
+
+    ruta_pdf = generar_reporte_pdf(
+        resumen_van=resumen,
+        resultados_pruebas=resultados_pruebas,
+        ruta_grafica="grafica_van.png",
+        tabla_sensibilidad=tornado,
+    )
+    
+    return ruta_pdf
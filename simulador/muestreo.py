@@ -0,0 +1,156 @@
+# simulador/muestreo.py
+
+import warnings
+from functools import lru_cache
+
+import numpy as np
+from scipy.special import ndtr, ndtri
+from scipy.stats import qmc
+
+from simulador.generadores import (
+    obtener_generador,
+    uniforme_desde_R,
+    normal_desde_R,
+    discreta_desde_R,
+    generar_demanda_lote,
+    generar_precio_lote,
+    generar_costo_variable_lote,
+    generar_costo_fijo_lote,
+)
+
+
+# MÉTODOS DE MUESTREO
+
+METODO_MC = "mc"                    # Monte Carlo simple (pseudoaleatorio)
+METODO_ANTITETICO = "antitetico"    # pares R y 1-R
+METODO_LHS = "lhs"                  # hipercubo latino
+METODO_SOBOL = "sobol"              # cuasi Monte Carlo, Sobol aleatorizado
+
+METODOS_MUESTREO = (METODO_MC, METODO_ANTITETICO, METODO_LHS, METODO_SOBOL)
+
+# Orden de las columnas de la matriz de uniformes
+VARIABLES = ("demanda", "precio", "costo_variable", "costo_fijo")
+
+
+def generar_uniformes(n, d, metodo=METODO_MC, rng=None):
+    """
+    Matriz (n, d) de números R en [0, 1) según el método de muestreo.
+
+    - mc: R independientes.
+    - antitetico: la segunda mitad es 1-R de la primera.
+    - lhs: cada columna tiene exactamente un R en cada franja [i/n, (i+1)/n).
+    - sobol: secuencia de Sobol con aleatorización de Owen (mejor con n
+      potencia de 2).
+    """
+    rng = obtener_generador(rng)
+
+    if metodo == METODO_MC:
+        return rng.random((n, d))
+
+    if metodo == METODO_ANTITETICO:
+        mitad = rng.random(((n + 1) // 2, d))
+        return np.concatenate([mitad, 1 - mitad])[:n]
+
+    if metodo == METODO_LHS:
+        franjas = np.argsort(rng.random((n, d)), axis=0)
+        return (franjas + rng.random((n, d))) / n
+
+    if metodo == METODO_SOBOL:
+        sobol = qmc.Sobol(d, scramble=True, seed=rng)
+        with warnings.catch_warnings():
+            # Sobol avisa si n no es potencia de 2; la muestra sigue siendo válida
+            warnings.simplefilter("ignore", UserWarning)
+            return sobol.random(n)
+
+    raise ValueError(f"método de muestreo desconocido: {metodo}")
+
+
+# CORRELACIÓN ENTRE VARIABLES (CÓPULA GAUSSIANA)
+
+
+def _como_tupla(correlacion):
+    """Matriz de correlación como tupla de tuplas (clave de la caché)."""
+    return tuple(tuple(float(x) for x in fila) for fila in np.asarray(correlacion, dtype=float))
+
+
+@lru_cache(maxsize=32)
+def _factor_cholesky(correlacion):
+    """
+    Factor de Cholesky L de la matriz de correlación de rangos (Spearman).
+
+    La correlación de Spearman rs se pasa a la correlación de la normal
+    subyacente con 2·sin(π·rs/6), de modo que las variables simuladas
+    conserven la correlación de rangos pedida.
+    """
+    rs = np.array(correlacion)
+    d = len(VARIABLES)
+
+    if rs.shape != (d, d):
+        raise ValueError(f"la matriz de correlación debe ser {d}x{d} ({', '.join(VARIABLES)})")
+    if not np.allclose(rs, rs.T):
+        raise ValueError("la matriz de correlación debe ser simétrica")
+    if not np.allclose(np.diag(rs), 1) or np.any(np.abs(rs) > 1):
+        raise ValueError("la matriz de correlación debe tener unos en la diagonal y valores en [-1, 1]")
+
+    rho = 2 * np.sin(np.pi * rs / 6)
+    np.fill_diagonal(rho, 1.0)
+
+    try:
+        L = np.linalg.cholesky(rho)
+    except np.linalg.LinAlgError:
+        raise ValueError("la matriz de correlación no es definida positiva") from None
+
+    L.setflags(write=False)
+    return L
+
+
+def factor_cholesky(correlacion):
+    """Factor de Cholesky (en caché) de una matriz de correlación de Spearman."""
+    return _factor_cholesky(_como_tupla(correlacion))
+
+
+def correlacionar_uniformes(R, correlacion=None):
+    """
+    Aplica la cópula gaussiana a la matriz R (n, 4): z = NORM.S.INV(R),
+    z·Lᵀ y de vuelta a uniformes con NORM.S.DIST. Las marginales no cambian;
+    solo se induce la correlación de rangos. Sin correlación devuelve R.
+    """
+    if correlacion is None:
+        return R
+
+    L = factor_cholesky(correlacion)
+    z = ndtri(np.clip(R, 1e-12, 1 - 1e-12))
+    return ndtr(z @ L.T)
+
+
+def transformar_entradas(R, param):
+    """
+    Convierte la matriz R (n, 4) en las variables del modelo con los mismos
+    generadores de siempre: uniforme, NORM.INV y discreta por acumulada.
+    """
+    demanda = uniforme_desde_R(param["demanda_min"], param["demanda_max"], R[:, 0])
+    precio = normal_desde_R(param["precio_mu"], param["precio_sigma"], R[:, 1])
+    costo_variable = uniforme_desde_R(param["cv_min"], param["cv_max"], R[:, 2])
+    costo_fijo = discreta_desde_R(param["cf_valores"], param["cf_probs"], R[:, 3])
+
+    return demanda, precio, costo_variable, costo_fijo
+
+
+def muestrear_entradas(param, n, rng=None, metodo=METODO_MC):
+    """
+    Las cuatro variables aleatorias como arreglos (n,).
+    Con "mc" se usan directamente los generadores en lote; con los demás
+    métodos, o si param trae "correlacion", se generan los R, se
+    correlacionan y se transforman.
+    """
+    correlacion = param.get("correlacion")
+
+    if metodo == METODO_MC and correlacion is None:
+        demanda = generar_demanda_lote(param["demanda_min"], param["demanda_max"], n, rng)
+        precio = generar_precio_lote(param["precio_mu"], param["precio_sigma"], n, rng)
+        costo_variable = generar_costo_variable_lote(param["cv_min"], param["cv_max"], n, rng)
+        costo_fijo = generar_costo_fijo_lote(param["cf_valores"], param["cf_probs"], n, rng)
+        return demanda, precio, costo_variable, costo_fijo
+
+    R = generar_uniformes(n, len(VARIABLES), metodo, rng)
+    return transformar_entradas(correlacionar_uniformes(R, correlacion), param)
@@ -0,0 +1,84 @@
+# simulador/paralelo.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from simulador.generadores import obtener_generador
+
+
+# La simulación se reparte siempre en bloques del mismo tamaño, cada uno con
+# su propio flujo de números aleatorios. Así el resultado depende solo de la
+# semilla (y del tamaño de bloque), no de cuántos procesos se usen.
+TAMANO_BLOQUE = 65536
+
+
+def dividir_en_bloques(iteraciones, tamano_bloque=TAMANO_BLOQUE):
+    """Tamaños de los bloques en que se reparten las iteraciones."""
+    completos, resto = divmod(int(iteraciones), tamano_bloque)
+    return [tamano_bloque] * completos + ([resto] if resto else [])
+
+
+def semillas_por_bloque(semilla, n_bloques):
+    """
+    Un SeedSequence independiente por bloque (SeedSequence.spawn).
+    Sin semilla, la raíz sale del generador compartido de generadores.py,
+    de modo que fijar_semilla también fija la simulación por bloques.
+    """
+    if isinstance(semilla, np.random.SeedSequence):
+        raiz = semilla
+    else:
+        if semilla is None:
+            semilla = int(obtener_generador().integers(2**63))
+        raiz = np.random.SeedSequence(semilla)
+    return raiz.spawn(n_bloques)
+
+
+def numero_de_procesos(workers):
+    """workers=None usa todos los núcleos; cualquier otro valor se respeta."""
+    if workers is None:
+        return os.cpu_count() or 1
+    return max(1, int(workers))
+
+
+class PoolBloques:
+    """
+    Pool de procesos que se mantiene abierto entre varias tandas de bloques
+    (por ejemplo, en el modo adaptativo). Con un solo proceso trabaja en serie.
+
+        with PoolBloques(workers) as pool:
+            for resultado in pool.iterar(funcion, tareas):
+                ...
+    """
+
+    def __init__(self, workers=1):
+        self.workers = numero_de_procesos(workers)
+        self._pool = None
+
+    def __enter__(self):
+        if self.workers > 1:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self
+
+    def __exit__(self, *exc):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def iterar(self, funcion, tareas):
+        """Resultados de funcion(*tarea) en el mismo orden de las tareas."""
+        if self._pool is None or len(tareas) <= 1:
+            for tarea in tareas:
+                yield funcion(*tarea)
+            return
+        yield from self._pool.map(funcion, *zip(*tareas))
+
+
+def iterar_bloques(funcion, tareas, workers=1):
+    """
+    Aplica funcion(*tarea) a cada tarea y entrega los resultados uno a uno,
+    en el mismo orden de las tareas. Con workers > 1 usa un pool de procesos.
+    """
+    with PoolBloques(min(numero_de_procesos(workers), max(len(tareas), 1))) as pool:
+        yield from pool.iterar(funcion, tareas)
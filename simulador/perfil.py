@@ -0,0 +1,165 @@
+# simulador/perfil.py
+
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import wraps
+
+
+# TIEMPOS POR FASE
+#
+# El código del motor marca sus fases con tramo("nombre") y sus volúmenes
+# con contar("nombre", n). Si no hay una medición activa (perfilar()),
+# ambas funciones regresan de inmediato sin medir nada.
+#
+#     with perfilar() as perfil:
+#         ejecutar_simulacion(parametros, 100_000)
+#     perfil.resumen()
+#
+# La medición vive en una ContextVar: cada sesión o hilo mide lo suyo.
+# Los bloques que corren en otros procesos (workers > 1) no se desglosan;
+# su tiempo queda dentro del tramo que los espera. El trabajo que otro hilo
+# hace por encargo (la cola de persistencia) se suma con combinar() a la
+# medición que estaba activa al encargarlo, aunque ya haya terminado.
+
+_perfil_activo = ContextVar("perfil_activo", default=None)
+
+_NULO = nullcontext()
+
+# Tasas derivadas: nombre -> (contador, tramo)
+TASAS = {
+    "iteraciones_por_s": ("iteraciones", "simulacion"),
+    "filas_insertadas_por_s": ("filas_insertadas", "bd.insertar"),
+}
+
+
+class Perfil:
+    """Tiempo acumulado y llamadas por tramo, más contadores."""
+
+    __slots__ = ("tramos", "contadores", "_inicio", "_fin", "_candado")
+
+    def __init__(self):
+        self.tramos = {}
+        self.contadores = {}
+        self._inicio = time.perf_counter()
+        self._fin = None
+        self._candado = threading.Lock()
+
+    @contextmanager
+    def tramo(self, nombre):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(nombre, time.perf_counter() - inicio)
+
+    def registrar(self, nombre, segundos, llamadas=1):
+        with self._candado:
+            acumulado = self.tramos.setdefault(nombre, [0, 0.0])
+            acumulado[0] += llamadas
+            acumulado[1] += segundos
+
+    def contar(self, nombre, cantidad=1):
+        with self._candado:
+            self.contadores[nombre] = self.contadores.get(nombre, 0) + cantidad
+
+    def combinar(self, otro):
+        with otro._candado:
+            tramos = [(nombre, *valores) for nombre, valores in otro.tramos.items()]
+            contadores = list(otro.contadores.items())
+        for nombre, llamadas, segundos in tramos:
+            self.registrar(nombre, segundos, llamadas)
+        for nombre, cantidad in contadores:
+            self.contar(nombre, cantidad)
+        return self
+
+    def terminar(self):
+        """Fija el total en el tiempo transcurrido hasta ahora."""
+        self._fin = time.perf_counter()
+
+    def resumen(self):
+        """
+        Diccionario con total_s, tramos (llamadas, segundos y % del total),
+        contadores y tasas (por segundo), listo para JSON. total_s es la
+        duración del bloque perfilar() (o hasta ahora, si sigue activo).
+        """
+        total = (self._fin or time.perf_counter()) - self._inicio
+        with self._candado:
+            tramos = {nombre: tuple(valores) for nombre, valores in self.tramos.items()}
+            contadores = dict(self.contadores)
+        tasas = {}
+        for tasa, (contador, tramo) in TASAS.items():
+            segundos = tramos.get(tramo, (0, 0.0))[1]
+            if contador in contadores and segundos > 0:
+                tasas[tasa] = contadores[contador] / segundos
+        return {
+            "total_s": total,
+            "tramos": {
+                nombre: {
+                    "llamadas": llamadas,
+                    "segundos": segundos,
+                    "porcentaje": 100 * segundos / total if total > 0 else 0.0,
+                }
+                for nombre, (llamadas, segundos) in sorted(
+                    tramos.items(), key=lambda t: -t[1][1]
+                )
+            },
+            "contadores": contadores,
+            "tasas": tasas,
+        }
+
+    def a_json(self, **kwargs):
+        return json.dumps(self.resumen(), ensure_ascii=False, **kwargs)
+
+
+@contextmanager
+def perfilar():
+    """
+    Activa una medición nueva durante el bloque with. Si ya había una
+    activa, al salir le suma lo medido.
+    """
+    anterior = _perfil_activo.get()
+    perfil = Perfil()
+    marca = _perfil_activo.set(perfil)
+    try:
+        yield perfil
+    finally:
+        _perfil_activo.reset(marca)
+        perfil.terminar()
+        if anterior is not None:
+            anterior.combinar(perfil)
+
+
+def perfil_activo():
+    """La medición activa o None."""
+    return _perfil_activo.get()
+
+
+def tramo(nombre):
+    """Context manager que mide el bloque si hay una medición activa."""
+    perfil = _perfil_activo.get()
+    if perfil is None:
+        return _NULO
+    return perfil.tramo(nombre)
+
+
+def contar(nombre, cantidad=1):
+    perfil = _perfil_activo.get()
+    if perfil is not None:
+        perfil.contar(nombre, cantidad)
+
+
+def medido(nombre):
+    """Decorador: cada llamada a la función es un tramo."""
+    def decorador(funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            perfil = _perfil_activo.get()
+            if perfil is None:
+                return funcion(*args, **kwargs)
+            with perfil.tramo(nombre):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
@@ -0,0 +1,578 @@
+# simulador/persistencia.py
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from itertools import repeat
+
+import numpy as np
+
+from simulador.perfil import tramo, contar, perfilar, perfil_activo
+
+
+log = logging.getLogger(__name__)
+
+# Filas por executemany: cada lote es un viaje al servidor
+TAMANO_LOTE = 10_000
+
+CADENA_SQLSERVER = (
+    'DRIVER={SQL Server};'
+    'SERVER=KAREN-CASTELLAN\\SQLEXPRESS;'
+    'DATABASE=DevimulatorDB;'
+    'Trusted_Connection=yes;'
+)
+
+
+# BACKENDS
+#
+# Un backend sabe abrir conexiones, las pocas diferencias de SQL entre
+# motores (cómo recuperar el id insertado) y qué errores del driver son
+# transitorios. SQLite sirve para pruebas locales sin SQL Server.
+
+# Errores de red o de tiempo de espera, con cualquier driver
+ERRORES_TRANSITORIOS = (ConnectionError, TimeoutError)
+
+# sqlite3 usa OperationalError también para errores permanentes (tabla
+# inexistente, sintaxis); solo estos mensajes son pasajeros
+MENSAJES_TRANSITORIOS_SQLITE = ("database is locked", "database table is locked", "busy",
+                                "unable to open database file", "disk i/o error")
+
+
+class BackendSQLServer:
+    """SQL Server por pyodbc, con fast_executemany para los lotes."""
+
+    nombre = "sqlserver"
+
+    def __init__(self, cadena_conexion=CADENA_SQLSERVER):
+        self.cadena_conexion = cadena_conexion
+
+    def conectar(self):
+        import pyodbc
+        return pyodbc.connect(self.cadena_conexion, autocommit=False)
+
+    def cursor_lote(self, conn):
+        """Cursor que manda cada executemany como un solo arreglo de parámetros."""
+        cur = conn.cursor()
+        cur.fast_executemany = True
+        return cur
+
+    def insertar_con_id(self, cur, tabla, columnas, valores):
+        """INSERT de una fila; devuelve el id generado."""
+        sql = (
+            f"INSERT INTO {tabla} ({', '.join(columnas)}) OUTPUT INSERTED.id "
+            f"VALUES ({', '.join('?' * len(columnas))})"
+        )
+        return cur.execute(sql, *valores).fetchone()[0]
+
+    def es_transitorio(self, error):
+        """Conexión caída, tiempo de espera o bloqueo: vale la pena reintentar."""
+        try:
+            import pyodbc
+        except ImportError:
+            return isinstance(error, ERRORES_TRANSITORIOS)
+        return isinstance(error, ERRORES_TRANSITORIOS + (pyodbc.OperationalError,
+                                                         pyodbc.InterfaceError))
+
+
+ESQUEMA_SQLITE = """
+CREATE TABLE IF NOT EXISTS ParametrosSimulacion (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    demanda_min REAL, demanda_max REAL, precio_mu REAL, precio_sigma REAL,
+    cv_min REAL, cv_max REAL, cf_28k_prob REAL, cf_30k_prob REAL, cf_32k_prob REAL,
+    tasa_impuesto REAL, tasa_descuento REAL, vida INTEGER, depreciacion REAL,
+    valor_desecho REAL, inversion_inicial REAL, iteraciones INTEGER
+);
+CREATE TABLE IF NOT EXISTS ResultadosVAN (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    simulacion_id INTEGER REFERENCES ParametrosSimulacion(id),
+    media REAL, mediana REAL, desviacion REAL, minimo REAL, maximo REAL
+);
+CREATE TABLE IF NOT EXISTS IteracionesVAN (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    simulacion_id INTEGER REFERENCES ParametrosSimulacion(id),
+    van REAL
+);
+CREATE TABLE IF NOT EXISTS VariablesAleatorias (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    simulacion_id INTEGER REFERENCES ParametrosSimulacion(id),
+    demanda REAL, costo_variable REAL, precio REAL, costo_fijo REAL
+);
+CREATE TABLE IF NOT EXISTS ArchivosGenerados (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    simulacion_id INTEGER REFERENCES ParametrosSimulacion(id),
+    tipo TEXT, ruta TEXT
+);
+"""
+
+
+class BackendSQLite:
+    """Archivo SQLite con las mismas tablas que DevimulatorDB (se crean si faltan)."""
+
+    nombre = "sqlite"
+
+    def __init__(self, ruta="devimulator.db"):
+        self.ruta = ruta
+        with sqlite3.connect(self.ruta) as conn:
+            conn.executescript(ESQUEMA_SQLITE)
+        conn.close()
+
+    def conectar(self):
+        # La conexión puede pasar de un hilo a otro (pool y cola de escritura)
+        return sqlite3.connect(self.ruta, check_same_thread=False)
+
+    def cursor_lote(self, conn):
+        return conn.cursor()
+
+    def insertar_con_id(self, cur, tabla, columnas, valores):
+        sql = f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES ({', '.join('?' * len(columnas))})"
+        cur.execute(sql, valores)
+        return cur.lastrowid
+
+    def es_transitorio(self, error):
+        """Base bloqueada por otra conexión o archivo no disponible."""
+        if isinstance(error, ERRORES_TRANSITORIOS):
+            return True
+        if not isinstance(error, sqlite3.OperationalError):
+            return False
+        mensaje = str(error).lower()
+        return any(m in mensaje for m in MENSAJES_TRANSITORIOS_SQLITE)
+
+
+def crear_backend(nombre=None, **opciones):
+    """
+    Backend por nombre ("sqlserver" o "sqlite"). Sin nombre se usa la
+    variable de entorno DEVIMULATOR_BD y, si no existe, SQL Server.
+    """
+    nombre = nombre or os.environ.get("DEVIMULATOR_BD", BackendSQLServer.nombre)
+    if nombre == BackendSQLServer.nombre:
+        return BackendSQLServer(**opciones)
+    if nombre == BackendSQLite.nombre:
+        return BackendSQLite(**opciones)
+    raise ValueError(f"backend de base de datos desconocido: {nombre}")
+
+
+# INSERCIÓN POR LOTES
+
+
+def _filas(simulacion_id, columnas, desde, hasta):
+    """Filas (simulacion_id, c1, c2, ...) como tipos de Python para el driver."""
+    return list(zip(repeat(simulacion_id), *(c[desde:hasta].tolist() for c in columnas)))
+
+
+def insertar_lotes(backend, conn, tabla, nombres, simulacion_id, columnas,
+                   tamano_lote=TAMANO_LOTE):
+    """
+    Inserta las columnas (arreglos del mismo largo) en tabla con un
+    executemany por lote, dentro de la transacción abierta en conn.
+    Devuelve el número de filas insertadas.
+    """
+    columnas = [np.asarray(c, dtype=float) for c in columnas]
+    total = len(columnas[0])
+    sql = (
+        f"INSERT INTO {tabla} (simulacion_id, {', '.join(nombres)}) "
+        f"VALUES ({', '.join('?' * (len(nombres) + 1))})"
+    )
+
+    inicio = time.perf_counter()
+    with tramo("bd.insertar"):
+        cur = backend.cursor_lote(conn)
+        for desde in range(0, total, tamano_lote):
+            cur.executemany(sql, _filas(simulacion_id, columnas, desde, desde + tamano_lote))
+    contar("filas_insertadas", total)
+
+    segundos = time.perf_counter() - inicio
+    log.info(
+        "%s: %d filas en %.2f s (%.0f filas/s, lotes de %d, %s)",
+        tabla, total, segundos, total / segundos if segundos > 0 else float("inf"),
+        tamano_lote, backend.nombre,
+    )
+    return total
+
+
+# POOL DE CONEXIONES
+
+
+class PoolConexiones:
+    """
+    Hasta `maximo` conexiones abiertas que se reutilizan entre sesiones.
+    Si todas están ocupadas, tomar() espera hasta `espera` segundos.
+    """
+
+    def __init__(self, backend, maximo=4, espera=30.0):
+        self.backend = backend
+        self.maximo = maximo
+        self.espera = espera
+        self._libres = queue.LifoQueue(maxsize=maximo)
+        self._abiertas = 0
+        self._candado = threading.Lock()
+
+    def tomar(self):
+        try:
+            return self._libres.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._candado:
+            crear = self._abiertas < self.maximo
+            if crear:
+                self._abiertas += 1
+        if crear:
+            try:
+                return self.backend.conectar()
+            except Exception:
+                with self._candado:
+                    self._abiertas -= 1
+                raise
+
+        try:
+            return self._libres.get(timeout=self.espera)
+        except queue.Empty:
+            raise TimeoutError(
+                f"no se liberó ninguna conexión del pool en {self.espera} s"
+            ) from None
+
+    def devolver(self, conn):
+        self._libres.put_nowait(conn)
+
+    def descartar(self, conn):
+        """Cierra una conexión dañada y libera su lugar en el pool."""
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._candado:
+            self._abiertas -= 1
+
+    def cerrar(self):
+        while True:
+            try:
+                self.descartar(self._libres.get_nowait())
+            except queue.Empty:
+                return
+
+
+# UNIDAD DE TRABAJO POR SIMULACIÓN
+
+
+class SesionSimulacion:
+    """
+    Escrituras de una corrida sobre una sola conexión y una sola
+    transacción. Se obtiene con RepositorioSimulacion.sesion(); nada queda
+    guardado hasta que el bloque with termina sin errores.
+    """
+
+    def __init__(self, backend, conn, tamano_lote=TAMANO_LOTE):
+        self.backend = backend
+        self.conn = conn
+        self.tamano_lote = tamano_lote
+        self.simulacion_id = None
+
+    def guardar_parametros(self, params, iteraciones):
+        """Fila de ParametrosSimulacion; su id queda como simulacion_id de la sesión."""
+        with tramo("bd.insertar"):
+            self.simulacion_id = self.backend.insertar_con_id(
+                self.conn.cursor(),
+                "ParametrosSimulacion",
+                ("demanda_min", "demanda_max", "precio_mu", "precio_sigma",
+                 "cv_min", "cv_max", "cf_28k_prob", "cf_30k_prob", "cf_32k_prob",
+                 "tasa_impuesto", "tasa_descuento", "vida", "depreciacion", "valor_desecho",
+                 "inversion_inicial", "iteraciones"),
+                (params["demanda_min"], params["demanda_max"],
+                 params["precio_mu"], params["precio_sigma"],
+                 params["cv_min"], params["cv_max"],
+                 params["cf_probs"][0], params["cf_probs"][1], params["cf_probs"][2],
+                 params["tasa_impuesto"], params["tasa_descuento"],
+                 params["vida"], params["depreciacion"], params["valor_desecho"],
+                 params["inversion_inicial"], int(iteraciones)),
+            )
+        contar("filas_insertadas")
+        return self.simulacion_id
+
+    def _id(self, simulacion_id):
+        if simulacion_id is None:
+            simulacion_id = self.simulacion_id
+        if simulacion_id is None:
+            raise ValueError("falta simulacion_id: guarde primero los parámetros")
+        return simulacion_id
+
+    def guardar_resumen_van(self, resumen, simulacion_id=None):
+        fila = (self._id(simulacion_id),
+                *(float(resumen[k]) for k in ("media", "mediana", "desviacion", "minimo", "maximo")))
+        with tramo("bd.insertar"):
+            self.conn.cursor().execute(
+                "INSERT INTO ResultadosVAN (simulacion_id, media, mediana, desviacion, minimo, maximo) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                fila,
+            )
+        contar("filas_insertadas")
+
+    def guardar_iteraciones_van(self, vans, simulacion_id=None):
+        return insertar_lotes(
+            self.backend, self.conn, "IteracionesVAN", ("van",),
+            self._id(simulacion_id), [vans], self.tamano_lote,
+        )
+
+    def guardar_archivo(self, tipo, ruta, simulacion_id=None):
+        fila = (self._id(simulacion_id), tipo, ruta)
+        with tramo("bd.insertar"):
+            self.conn.cursor().execute(
+                "INSERT INTO ArchivosGenerados (simulacion_id, tipo, ruta) VALUES (?, ?, ?)", fila,
+            )
+        contar("filas_insertadas")
+
+    def guardar_simulacion(self, params, iteraciones, resumen, vans=None, archivos=()):
+        """Parámetros, resumen, iteraciones y archivos de una corrida. Devuelve el id."""
+        simulacion_id = self.guardar_parametros(params, iteraciones)
+        self.guardar_resumen_van(resumen)
+        if vans is not None:
+            self.guardar_iteraciones_van(vans)
+        for tipo, ruta in archivos:
+            self.guardar_archivo(tipo, ruta)
+        return simulacion_id
+
+
+class RepositorioSimulacion:
+    """
+    Punto de entrada a la base de datos: un pool de conexiones y sesiones
+    transaccionales.
+
+        repo = RepositorioSimulacion(crear_backend())
+        with repo.sesion() as sesion:
+            sesion.guardar_parametros(params, iteraciones)
+            sesion.guardar_resumen_van(resumen)
+            sesion.guardar_iteraciones_van(vans)
+    """
+
+    def __init__(self, backend, tamano_pool=4, tamano_lote=TAMANO_LOTE):
+        self.backend = backend
+        self.pool = PoolConexiones(backend, tamano_pool)
+        self.tamano_lote = tamano_lote
+
+    @contextmanager
+    def sesion(self):
+        """Confirma todo al salir del bloque o revierte todo si hubo un error."""
+        conn = self.pool.tomar()
+        try:
+            yield SesionSimulacion(self.backend, conn, self.tamano_lote)
+            conn.commit()
+        except BaseException:
+            try:
+                conn.rollback()
+            except Exception:
+                self.pool.descartar(conn)
+                raise
+            self.pool.devolver(conn)
+            raise
+        else:
+            self.pool.devolver(conn)
+
+    def guardar_simulacion(self, params, iteraciones, resumen, vans=None, archivos=()):
+        """
+        Parámetros, resumen, iteraciones y archivos de una corrida en una
+        sola transacción. archivos = pares (tipo, ruta). Devuelve el id.
+        """
+        with self.sesion() as sesion:
+            return sesion.guardar_simulacion(params, iteraciones, resumen, vans, archivos)
+
+    def cerrar(self):
+        self.pool.cerrar()
+
+
+# ESCRITURA EN SEGUNDO PLANO
+#
+# La interfaz entrega la corrida a la cola y sigue; un hilo la guarda
+# después, agrupando varias corridas por transacción.
+
+TRABAJO_PENDIENTE = "pendiente"
+TRABAJO_GUARDANDO = "guardando"
+TRABAJO_GUARDADO = "guardado"
+TRABAJO_FALLIDO = "fallido"
+
+
+class TrabajoPersistencia:
+    """
+    Una corrida entregada a la cola. La interfaz consulta `estado`
+    (pendiente, guardando, guardado o fallido), `simulacion_id`,
+    `intentos`, `error` y `segundos` (lo que tardó la transacción que lo
+    guardó), o espera con esperar().
+
+    Si al crearlo había una medición activa (perfilar()), al guardarse se le
+    suman sus tramos bd.insertar, sus filas y `segundos` como tramo bd.cola.
+    """
+
+    def __init__(self, params, iteraciones, resumen, vans=None, archivos=()):
+        self.datos = (params, iteraciones, resumen, vans, tuple(archivos))
+        self.estado = TRABAJO_PENDIENTE
+        self.simulacion_id = None
+        self.intentos = 0
+        self.error = None
+        self.segundos = None
+        self._perfil = perfil_activo()
+        self._terminado = threading.Event()
+
+    @property
+    def terminado(self):
+        return self._terminado.is_set()
+
+    def esperar(self, timeout=None):
+        """True si el trabajo terminó (guardado o fallido) dentro del plazo."""
+        return self._terminado.wait(timeout)
+
+    def _terminar(self, estado, error=None):
+        self.estado = estado
+        self.error = error
+        self._terminado.set()
+
+
+class ColaPersistencia:
+    """
+    Cola acotada de corridas por guardar, atendida por un hilo.
+
+    - encolar() devuelve enseguida un TrabajoPersistencia; si ya hay
+      `maximo_pendientes` corridas esperando, bloquea hasta `timeout`
+      segundos y luego lanza queue.Full (contrapresión).
+    - El hilo toma hasta `tamano_grupo` corridas y las guarda en una sola
+      transacción. Si falla por un error transitorio (backend.es_transitorio),
+      reintenta con espera exponencial; los demás errores (datos faltantes,
+      integridad) no se reintentan. Si el grupo falla, guarda cada corrida
+      por separado para que una corrida mala no arrastre a las demás.
+    - cerrar() guarda lo pendiente y detiene el hilo; después encolar()
+      lanza RuntimeError.
+    """
+
+    def __init__(self, repositorio, maximo_pendientes=8, tamano_grupo=4,
+                 reintentos=3, espera_inicial=0.5):
+        self.repositorio = repositorio
+        self.tamano_grupo = tamano_grupo
+        self.reintentos = reintentos
+        self.espera_inicial = espera_inicial
+
+        self._cola = queue.Queue(maxsize=maximo_pendientes)
+        self._candado = threading.Lock()
+        self._guardados = 0
+        self._fallidos = 0
+        self._ultimo_error = None
+        self._cerrada = False
+        self._hilo = threading.Thread(target=self._atender, name="cola-persistencia", daemon=True)
+        self._hilo.start()
+
+    def encolar(self, params, iteraciones, resumen, vans=None, archivos=(), timeout=None):
+        if self._cerrada:
+            raise RuntimeError("la cola de persistencia está cerrada")
+        trabajo = TrabajoPersistencia(params, iteraciones, resumen, vans, archivos)
+        self._cola.put(trabajo, timeout=timeout)
+        return trabajo
+
+    def estado(self):
+        """Resumen para la interfaz: pendientes, guardados, fallidos y último error."""
+        with self._candado:
+            return {
+                "pendientes": self._cola.unfinished_tasks,
+                "guardados": self._guardados,
+                "fallidos": self._fallidos,
+                "ultimo_error": self._ultimo_error,
+            }
+
+    def cerrar(self, timeout=None):
+        """Termina de guardar lo pendiente y detiene el hilo."""
+        with self._candado:
+            cerrada, self._cerrada = self._cerrada, True
+        if not cerrada:
+            self._cola.put(None)
+        self._hilo.join(timeout)
+        if self._hilo.is_alive():
+            return
+
+        # Corridas que entraron mientras se cerraba, detrás del fin del hilo
+        while True:
+            try:
+                trabajo = self._cola.get_nowait()
+            except queue.Empty:
+                return
+            if trabajo is not None:
+                self._registrar(trabajo, TRABAJO_FALLIDO,
+                                RuntimeError("la cola de persistencia está cerrada"))
+            self._cola.task_done()
+
+    def _atender(self):
+        while True:
+            trabajo = self._cola.get()
+            if trabajo is None:
+                self._cola.task_done()
+                return
+
+            grupo = [trabajo]
+            fin = False
+            while len(grupo) < self.tamano_grupo:
+                try:
+                    siguiente = self._cola.get_nowait()
+                except queue.Empty:
+                    break
+                if siguiente is None:
+                    fin = True
+                    break
+                grupo.append(siguiente)
+
+            if not self._guardar_con_reintentos(grupo) and len(grupo) > 1:
+                for trabajo in grupo:
+                    self._guardar_con_reintentos([trabajo])
+
+            for trabajo in grupo:
+                if not trabajo.terminado:
+                    self._registrar(trabajo, TRABAJO_FALLIDO, trabajo.error)
+                self._cola.task_done()
+
+            if fin:
+                self._cola.task_done()
+                return
+
+    def _guardar_con_reintentos(self, grupo):
+        espera = self.espera_inicial
+        for intento in range(self.reintentos + 1):
+            for trabajo in grupo:
+                trabajo.estado = TRABAJO_GUARDANDO
+                trabajo.intentos += 1
+            inicio = time.perf_counter()
+            ids, mediciones = [], []
+            try:
+                with self.repositorio.sesion() as sesion:
+                    for trabajo in grupo:
+                        with perfilar() as medicion:
+                            ids.append(sesion.guardar_simulacion(*trabajo.datos))
+                        mediciones.append(medicion)
+            except Exception as e:
+                log.warning("error al guardar %d corrida(s), intento %d: %s",
+                            len(grupo), intento + 1, e)
+                for trabajo in grupo:
+                    trabajo.error = e
+                if not self.repositorio.backend.es_transitorio(e):
+                    return False
+                if intento < self.reintentos:
+                    time.sleep(espera)
+                    espera *= 2
+                continue
+
+            segundos = time.perf_counter() - inicio
+            for trabajo, simulacion_id, medicion in zip(grupo, ids, mediciones):
+                trabajo.simulacion_id = simulacion_id
+                trabajo.segundos = segundos
+                if trabajo._perfil is not None:
+                    medicion.registrar("bd.cola", segundos)
+                    trabajo._perfil.combinar(medicion)
+                self._registrar(trabajo, TRABAJO_GUARDADO)
+            return True
+
+        return False
+
+    def _registrar(self, trabajo, estado, error=None):
+        with self._candado:
+            if estado == TRABAJO_GUARDADO:
+                self._guardados += 1
+            else:
+                self._fallidos += 1
+                self._ultimo_error = repr(error)
+        trabajo._terminar(estado, error)
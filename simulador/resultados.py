@@ -0,0 +1,102 @@
+# simulador/resultados.py
+
+import numpy as np
+import pandas as pd
+
+
+# Qué flujos se conservan de cada corrida
+CONSERVAR_TODOS = "todos"
+CONSERVAR_MUESTRA = "muestra"
+CONSERVAR_NINGUNO = "ninguno"
+
+
+def filas_conservadas(iteraciones, conservar_flujos=CONSERVAR_TODOS, muestra_flujos=1000):
+    """
+    Índices de las iteraciones cuyos flujos se guardan, o None si son todas.
+    La muestra está repartida a lo largo de la corrida e incluye la primera.
+    """
+    if conservar_flujos == CONSERVAR_TODOS:
+        return None
+    if conservar_flujos == CONSERVAR_NINGUNO:
+        return np.empty(0, dtype=np.int64)
+    if conservar_flujos == CONSERVAR_MUESTRA:
+        k = min(int(muestra_flujos), int(iteraciones))
+        return np.unique(np.linspace(0, iteraciones - 1, k).astype(np.int64))
+    raise ValueError(f"opción de flujos desconocida: {conservar_flujos}")
+
+
+class ResultadoSimulacion:
+    """
+    Resultado de una corrida guardado por columnas en arreglos contiguos:
+    - van, tir: arreglos (iteraciones,)
+    - codigos_tir: código de finanzas.TIR_* por iteración
+    - flujos: matriz (filas conservadas, vida)
+    - indices_flujos: iteración a la que corresponde cada fila de flujos
+      (None si se conservaron todas)
+    - resumen: diccionario de resumen_simulacion
+    - validacion: ValidacionEnLinea con las frecuencias de las entradas
+      usadas (None si no se pidió validar)
+    - perfil: tiempos por fase de perfil.Perfil.resumen() (None si no se
+      pidió medir)
+    - clave: clave_simulacion con la que la corrida está en la caché (None
+      si no pasó por ella)
+
+    Se puede desempaquetar como la tupla de siempre:
+        vans, tirs, flujos, resumen = resultado
+    """
+
+    __slots__ = ("van", "tir", "codigos_tir", "flujos", "indices_flujos",
+                 "resumen", "iteraciones", "vida", "validacion", "perfil", "clave")
+
+    def __init__(self, van, tir, codigos_tir, flujos, resumen,
+                 indices_flujos=None, iteraciones=None, validacion=None, perfil=None,
+                 clave=None):
+        self.van = van
+        self.tir = tir
+        self.codigos_tir = codigos_tir
+        self.flujos = flujos
+        self.indices_flujos = indices_flujos
+        self.resumen = resumen
+        self.iteraciones = len(van) if iteraciones is None else int(iteraciones)
+        self.vida = flujos.shape[1] if flujos.ndim == 2 else 0
+        self.validacion = validacion
+        self.perfil = perfil
+        self.clave = clave
+
+    @classmethod
+    def reservar(cls, iteraciones, vida, indices_flujos=None, dtype=np.float64):
+        """Arreglos vacíos para llenar bloque por bloque."""
+        filas = iteraciones if indices_flujos is None else len(indices_flujos)
+        return cls(
+            van=np.empty(iteraciones, dtype=dtype),
+            tir=np.empty(iteraciones, dtype=dtype),
+            codigos_tir=np.empty(iteraciones, dtype=np.int8),
+            flujos=np.empty((filas, vida), dtype=dtype),
+            resumen={},
+            indices_flujos=indices_flujos,
+        )
+
+    def __iter__(self):
+        return iter((self.van, self.tir, self.flujos, self.resumen))
+
+    def __len__(self):
+        return self.iteraciones
+
+    def a_dataframe(self):
+        """VAN y TIR por iteración como DataFrame, sin copiar los arreglos."""
+        return pd.DataFrame({"VAN": self.van, "TIR": self.tir}, copy=False)
+
+    def flujos_dataframe(self):
+        """Flujos conservados (una fila por iteración, una columna por año), sin copiar."""
+        indice = None if self.indices_flujos is None else pd.Index(self.indices_flujos, name="Iteración")
+        return pd.DataFrame(
+            self.flujos,
+            index=indice,
+            columns=[f"Año {t}" for t in range(1, self.vida + 1)],
+            copy=False,
+        )
+
+    @property
+    def memoria_bytes(self):
+        """Memoria que ocupan los arreglos del resultado."""
+        return sum(a.nbytes for a in (self.van, self.tir, self.codigos_tir, self.flujos))
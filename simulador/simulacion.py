@@ -1,71 +1,475 @@
-import numpy as np
-from .generadores import generar_uniforme, generar_normal, generar_discreta
-from .flujo_caja import calcular_flujo_proyecto
-from .finanzas import calcular_van
-
-
-def calcular_tir(flujos):
-    try:
-        tir = np.irr(flujos)
-        return tir if tir is not None else 0
-    except:
-        return 0
-
-
-def correr_simulacion(param, iteraciones=1000):
-
-    lista_van = []
-    lista_tir = []
-    flujos_registrados = []
-
-    for _ in range(iteraciones):
-
-        demanda = generar_uniforme(param["demanda_min"], param["demanda_max"])
-        precio = generar_normal(param["precio_mu"], param["precio_sigma"])
-        costo_variable = generar_uniforme(param["cv_min"], param["cv_max"])
-        costo_fijo = generar_discreta(param["cf_valores"], param["cf_probs"])
-
-        flujo_anual = []
-        for anio in range(1, param["vida"] + 1):
-
-            es_ultimo = (anio == param["vida"])
-
-            flujo, _ = calcular_flujo_proyecto({
-                "demanda": demanda,
-                "precio": precio,
-                "costo_variable": costo_variable,
-                "costo_fijo": costo_fijo,
-                "depreciacion": param["depreciacion"],
-                "tasa_impuesto": param["tasa_impuesto"],
-                "valor_desecho": param["valor_desecho"],
-            }, ultimo_anio=es_ultimo)
-
-            flujo_anual.append(flujo)
-
-        flujos_registrados.append(flujo_anual)
-
-        van = calcular_van(
-            inversion_inicial=param["inversion_inicial"],
-            tasa_descuento=param["tasa_descuento"],
-            flujo=flujo_anual
-        )
-        lista_van.append(van)
-
-        flujos_completos = [param["inversion_inicial"]] + flujo_anual
-        tir = calcular_tir(flujos_completos)
-        lista_tir.append(tir)
-
-    # REEMPLAZADO: claves correctas para app.py
-    resumen = {
-        "media": float(np.mean(lista_van)),
-        "mediana": float(np.median(lista_van)),
-        "desviacion": float(np.std(lista_van)),
-        "minimo": float(np.min(lista_van)),
-        "maximo": float(np.max(lista_van)),
-
-        "media_tir": float(np.mean(lista_tir)),
-        "minimo_tir": float(np.min(lista_tir)),
-        "maximo_tir": float(np.max(lista_tir)),
-    }
-
-    return lista_van, lista_tir, flujos_registrados, resumen
+from statistics import NormalDist
+
+import numpy as np
+from .generadores import generar_uniforme, generar_normal, generar_discreta
+from .muestreo import muestrear_entradas, METODO_MC
+from .flujo_caja import calcular_flujo_proyecto, flujo_anual_lote, matriz_flujos
+from .finanzas import calcular_van, calcular_van_lote, calcular_van_anualidad, calcular_tir_lote
+from .trayectorias import (
+    trayectorias_entradas, flujos_desde_trayectorias, entradas_de_la_distribucion,
+)
+from .validacion import ValidacionEnLinea
+from .paralelo import (
+    dividir_en_bloques, semillas_por_bloque, iterar_bloques, PoolBloques,
+)
+from .estadisticas import AcumuladorMomentos, BosquejoCuantiles, Reservorio
+from .resultados import ResultadoSimulacion, filas_conservadas, CONSERVAR_TODOS
+from .perfil import tramo, contar, medido
+
+
+def calcular_tir(flujos):
+    """
+    TIR de un solo flujo (año 0 primero).
+    Devuelve NaN si los flujos no tienen una TIR única.
+    """
+    tirs, _ = calcular_tir_lote([flujos])
+    return float(tirs[0])
+
+
+@medido("simulacion")
+def correr_simulacion(param, iteraciones=1000):
+
+    contar("iteraciones", iteraciones)
+    lista_van = []
+    lista_tir = []
+    flujos_registrados = []
+
+    for _ in range(iteraciones):
+
+        demanda = generar_uniforme(param["demanda_min"], param["demanda_max"])
+        precio = generar_normal(param["precio_mu"], param["precio_sigma"])
+        costo_variable = generar_uniforme(param["cv_min"], param["cv_max"])
+        costo_fijo = generar_discreta(param["cf_valores"], param["cf_probs"])
+
+        flujo_anual = []
+        for anio in range(1, param["vida"] + 1):
+
+            es_ultimo = (anio == param["vida"])
+
+            flujo, _ = calcular_flujo_proyecto({
+                "demanda": demanda,
+                "precio": precio,
+                "costo_variable": costo_variable,
+                "costo_fijo": costo_fijo,
+                "depreciacion": param["depreciacion"],
+                "tasa_impuesto": param["tasa_impuesto"],
+                "valor_desecho": param["valor_desecho"],
+            }, ultimo_anio=es_ultimo)
+
+            flujo_anual.append(flujo)
+
+        flujos_registrados.append(flujo_anual)
+
+        van = calcular_van(
+            inversion_inicial=param["inversion_inicial"],
+            tasa_descuento=param["tasa_descuento"],
+            flujo=flujo_anual
+        )
+        lista_van.append(van)
+
+        flujos_completos = [param["inversion_inicial"]] + flujo_anual
+        tir = calcular_tir(flujos_completos)
+        lista_tir.append(tir)
+
+    with tramo("resumen"):
+        resumen = resumen_simulacion(lista_van, lista_tir)
+
+    return lista_van, lista_tir, flujos_registrados, resumen
+
+
+def resumen_simulacion(vans, tirs):
+    """Estadísticas del VAN y la TIR con las claves que usa app.py."""
+    vans = np.asarray(vans, dtype=float)
+    tirs = np.asarray(tirs, dtype=float)
+
+    # Las iteraciones sin TIR única (NaN) no entran en el resumen de la TIR
+    tirs_validas = tirs[np.isfinite(tirs)]
+    if tirs_validas.size == 0:
+        tirs_validas = np.array([np.nan])
+
+    return {
+        "media": float(np.mean(vans)),
+        "mediana": float(np.median(vans)),
+        "desviacion": float(np.std(vans)),
+        "percentil_5": float(np.percentile(vans, 5)),
+        "percentil_25": float(np.percentile(vans, 25)),
+        "percentil_75": float(np.percentile(vans, 75)),
+        "percentil_95": float(np.percentile(vans, 95)),
+        "minimo": float(np.min(vans)),
+        "maximo": float(np.max(vans)),
+        "prob_van_negativo": float(np.mean(vans < 0)),
+
+        "media_tir": float(np.mean(tirs_validas)),
+        "minimo_tir": float(np.min(tirs_validas)),
+        "maximo_tir": float(np.max(tirs_validas)),
+        "tir_indefinidas": int(np.count_nonzero(~np.isfinite(tirs))),
+    }
+
+
+
+# MOTOR VECTORIZADO (todas las iteraciones a la vez)
+
+
+def _calcular_bloque(param, n, rng, metodo_muestreo=METODO_MC, validacion=None):
+    """
+    VAN, TIR, códigos de la TIR y flujos de n iteraciones usando rng.
+    Si se pasa un ValidacionEnLinea, acumula en él las entradas sorteadas.
+    """
+    if param.get("dinamica"):
+        # Entradas distintas cada año: tensor (n, vida) y descuento matriz-vector
+        with tramo("muestreo"):
+            entradas = trayectorias_entradas(param, n, rng, metodo_muestreo)
+        if validacion is not None:
+            with tramo("validacion"):
+                validacion.agregar(*entradas_de_la_distribucion(param, entradas))
+        with tramo("flujos"):
+            flujos = flujos_desde_trayectorias(param, *entradas)
+        with tramo("van"):
+            vans = calcular_van_lote(param["inversion_inicial"], param["tasa_descuento"], flujos)
+        with tramo("tir"):
+            tirs, codigos = calcular_tir_lote(flujos, inversion_inicial=param["inversion_inicial"])
+        return vans, tirs, codigos, flujos
+
+    with tramo("muestreo"):
+        demanda, precio, costo_variable, costo_fijo = muestrear_entradas(
+            param, n, rng, metodo_muestreo
+        )
+    if validacion is not None:
+        with tramo("validacion"):
+            validacion.agregar(demanda, precio, costo_variable, costo_fijo)
+
+    with tramo("flujos"):
+        flujo_anual = flujo_anual_lote(
+            demanda, precio, costo_variable, costo_fijo,
+            depreciacion_anual=param["depreciacion"],
+            tasa_impuesto=param["tasa_impuesto"],
+        )
+
+    # El flujo es constante salvo el desecho del último año: VAN en forma cerrada
+    with tramo("van"):
+        vans = calcular_van_anualidad(
+            inversion_inicial=param["inversion_inicial"],
+            tasa_descuento=param["tasa_descuento"],
+            vida=param["vida"],
+            flujo_anual=flujo_anual,
+            valor_desecho=param["valor_desecho"],
+        )
+
+    with tramo("flujos"):
+        flujos = matriz_flujos(flujo_anual, param["valor_desecho"], param["vida"])
+
+    with tramo("tir"):
+        tirs, codigos = calcular_tir_lote(flujos, inversion_inicial=param["inversion_inicial"])
+
+    return vans, tirs, codigos, flujos
+
+
+def _simular_bloque(param, n, semilla_bloque, filas_flujos=None, metodo_muestreo=METODO_MC,
+                    validar=False):
+    """
+    Un bloque de n iteraciones con su propio flujo de números aleatorios.
+    filas_flujos = filas del bloque cuyos flujos se devuelven (None = todas).
+    Con validar=True devuelve también el ValidacionEnLinea del bloque.
+    """
+    validacion = ValidacionEnLinea(param) if validar else None
+    vans, tirs, codigos, flujos = _calcular_bloque(
+        param, n, np.random.default_rng(semilla_bloque), metodo_muestreo, validacion
+    )
+    if filas_flujos is not None:
+        flujos = flujos[filas_flujos]
+    return vans, tirs, codigos, flujos, validacion
+
+
+@medido("simulacion")
+def correr_simulacion_lote(param, iteraciones=1000, semilla=None, workers=1,
+                           conservar_flujos=CONSERVAR_TODOS, muestra_flujos=1000,
+                           dtype=np.float64, metodo_muestreo=METODO_MC, validar=False):
+    """
+    Misma simulación que correr_simulacion, pero con todas las iteraciones
+    en arreglos de NumPy.
+
+    Las iteraciones se reparten en bloques de tamaño fijo, cada uno con un
+    SeedSequence propio; workers > 1 reparte los bloques en un pool de
+    procesos (None = todos los núcleos). Para una misma semilla el resultado
+    es idéntico sin importar el número de procesos.
+
+    conservar_flujos = "todos", "muestra" (muestra_flujos filas repartidas
+    en la corrida) o "ninguno"; dtype=np.float32 reduce la memoria a la mitad.
+
+    metodo_muestreo = "mc", "antitetico", "lhs" o "sobol" (ver muestreo.py);
+    la estratificación de LHS y Sobol se hace dentro de cada bloque.
+
+    validar=True acumula las frecuencias de las entradas usadas en
+    resultado.validacion (ver validacion.ValidacionEnLinea).
+
+    Devuelve un ResultadoSimulacion, que se desempaqueta como
+    (vans, tirs, flujos, resumen) igual que correr_simulacion.
+    """
+    contar("iteraciones", iteraciones)
+    tamanos = dividir_en_bloques(iteraciones)
+    semillas = semillas_por_bloque(semilla, len(tamanos))
+
+    indices = filas_conservadas(iteraciones, conservar_flujos, muestra_flujos)
+    resultado = ResultadoSimulacion.reservar(iteraciones, param["vida"], indices, dtype)
+
+    # Qué filas de flujos aporta cada bloque
+    inicios = np.cumsum([0] + tamanos)
+    tareas = []
+    for b, (n, s) in enumerate(zip(tamanos, semillas)):
+        filas = None
+        if indices is not None:
+            desde, hasta = np.searchsorted(indices, [inicios[b], inicios[b + 1]])
+            filas = indices[desde:hasta] - inicios[b]
+        tareas.append((param, n, s, filas, metodo_muestreo, validar))
+
+    # Copiar cada bloque en su lugar, siempre en el mismo orden
+    fila_flujos = 0
+    for b, (vans, tirs, codigos, flujos, validacion) in enumerate(
+        iterar_bloques(_simular_bloque, tareas, workers=workers)
+    ):
+        if validacion is not None:
+            if resultado.validacion is None:
+                resultado.validacion = validacion
+            else:
+                resultado.validacion.combinar(validacion)
+        inicio, fin = inicios[b], inicios[b + 1]
+        resultado.van[inicio:fin] = vans
+        resultado.tir[inicio:fin] = tirs
+        resultado.codigos_tir[inicio:fin] = codigos
+        resultado.flujos[fila_flujos:fila_flujos + len(flujos)] = flujos
+        fila_flujos += len(flujos)
+
+    with tramo("resumen"):
+        resultado.resumen = resumen_simulacion(resultado.van, resultado.tir)
+
+    return resultado
+
+
+# MODO STREAMING (memoria constante)
+
+
+# Cuantiles que se informan en el resumen: nombre -> probabilidad
+_CUANTILES_RESUMEN = {
+    "mediana": 0.50,
+    "percentil_5": 0.05,
+    "percentil_25": 0.25,
+    "percentil_75": 0.75,
+    "percentil_95": 0.95,
+}
+
+
+class _Acumuladores:
+    """Estado combinable de una corrida en modo streaming."""
+
+    def __init__(self, reservorio=0, precision=0.001, validacion=None):
+        self.validacion = validacion
+        self.van = AcumuladorMomentos()
+        self.cuantiles = BosquejoCuantiles(precision)
+        self.tir = AcumuladorMomentos()
+        self.tir_indefinidas = 0
+        self.van_negativos = 0
+        self.muestra = Reservorio(reservorio)
+
+    @property
+    def n(self):
+        return self.van.n
+
+    def agregar(self, vans, tirs, codigos, flujos, claves=None):
+        validas = np.isfinite(tirs)
+        self.van.agregar(vans)
+        self.cuantiles.agregar(vans)
+        self.tir.agregar(tirs[validas])
+        self.tir_indefinidas += int(validas.size - np.count_nonzero(validas))
+        self.van_negativos += int(np.count_nonzero(vans < 0))
+        if claves is not None:
+            self.muestra.agregar(claves, van=vans, tir=tirs,
+                                 codigos_tir=codigos, flujos=flujos)
+        return self
+
+    def combinar(self, otro):
+        self.van.combinar(otro.van)
+        self.cuantiles.combinar(otro.cuantiles)
+        self.tir.combinar(otro.tir)
+        self.tir_indefinidas += otro.tir_indefinidas
+        self.van_negativos += otro.van_negativos
+        self.muestra.combinar(otro.muestra)
+        if otro.validacion is not None:
+            if self.validacion is None:
+                self.validacion = otro.validacion
+            else:
+                self.validacion.combinar(otro.validacion)
+        return self
+
+    def resumen(self):
+        """Mismas claves que resumen_simulacion, a partir de los acumuladores."""
+        resumen = {"media": float(self.van.media)}
+        cuantiles = self.cuantiles.cuantiles(list(_CUANTILES_RESUMEN.values()))
+        for nombre, valor in zip(_CUANTILES_RESUMEN, cuantiles):
+            resumen[nombre] = float(valor)
+        resumen.update({
+            "desviacion": self.van.desviacion,
+            "minimo": float(self.van.minimo),
+            "maximo": float(self.van.maximo),
+            "prob_van_negativo": self.van_negativos / self.van.n,
+
+            "media_tir": float(self.tir.media) if self.tir.n else np.nan,
+            "minimo_tir": float(self.tir.minimo) if self.tir.n else np.nan,
+            "maximo_tir": float(self.tir.maximo) if self.tir.n else np.nan,
+            "tir_indefinidas": int(self.tir_indefinidas),
+        })
+        return resumen
+
+    def resultado(self, vida, iteraciones):
+        """ResultadoSimulacion con la muestra del reservorio y el resumen."""
+        if self.muestra.columnas is None:
+            return ResultadoSimulacion(
+                van=np.empty(0), tir=np.empty(0), codigos_tir=np.empty(0, dtype=np.int8),
+                flujos=np.empty((0, vida)), resumen=self.resumen(), iteraciones=iteraciones,
+                validacion=self.validacion,
+            )
+
+        return ResultadoSimulacion(
+            van=self.muestra.columna("van"),
+            tir=self.muestra.columna("tir"),
+            codigos_tir=self.muestra.columna("codigos_tir"),
+            flujos=self.muestra.columna("flujos"),
+            resumen=self.resumen(),
+            iteraciones=iteraciones,
+            validacion=self.validacion,
+        )
+
+
+def _resumir_bloque(param, n, semilla_bloque, reservorio, precision,
+                    metodo_muestreo=METODO_MC, validar=False):
+    """
+    Simula un bloque y devuelve solo sus acumuladores, no las iteraciones.
+    Los números del bloque son los mismos que en correr_simulacion_lote.
+    """
+    rng = np.random.default_rng(semilla_bloque)
+    validacion = ValidacionEnLinea(param) if validar else None
+    vans, tirs, codigos, flujos = _calcular_bloque(param, n, rng, metodo_muestreo, validacion)
+
+    with tramo("resumen"):
+        claves = rng.random(n) if reservorio else None
+        return _Acumuladores(reservorio, precision, validacion).agregar(
+            vans, tirs, codigos, flujos, claves
+        )
+
+
+@medido("simulacion")
+def correr_simulacion_streaming(param, iteraciones=1000, semilla=None, workers=1,
+                                reservorio=10000, precision=0.001,
+                                metodo_muestreo=METODO_MC, validar=False):
+    """
+    Simulación por bloques sin guardar todas las iteraciones.
+
+    Cada bloque se resume en acumuladores combinables (Welford para media y
+    desviación, mínimo/máximo y un bosquejo de cuantiles con error relativo
+    menor que precision para la mediana y los percentiles). La memoria no
+    crece con el número de iteraciones.
+
+    reservorio = cuántas iteraciones (VAN, TIR y flujos) se conservan como
+    muestra aleatoria para gráficas; 0 no conserva ninguna. validar=True
+    acumula las frecuencias de las entradas igual que en el modo en lote.
+
+    Devuelve un ResultadoSimulacion cuyos arreglos son la muestra del
+    reservorio y cuyo resumen tiene las claves de resumen_simulacion.
+    """
+    contar("iteraciones", iteraciones)
+    tamanos = dividir_en_bloques(iteraciones)
+    semillas = semillas_por_bloque(semilla, len(tamanos))
+
+    total = _Acumuladores(reservorio, precision)
+
+    # Los bloques se combinan a medida que llegan, siempre en el mismo orden
+    for estado in iterar_bloques(
+        _resumir_bloque,
+        [(param, n, s, reservorio, precision, metodo_muestreo, validar)
+         for n, s in zip(tamanos, semillas)],
+        workers=workers,
+    ):
+        total.combinar(estado)
+
+    return total.resultado(param["vida"], iteraciones)
+
+
+
+# MODO ADAPTATIVO (se detiene al alcanzar la precisión pedida)
+
+
+OBJETIVO_MEDIA_VAN = "media_van"
+OBJETIVO_PROB_VAN_NEGATIVO = "prob_van_negativo"
+
+
+def semiancho_intervalo(acumuladores, objetivo=OBJETIVO_MEDIA_VAN, confianza=0.95):
+    """
+    Semiancho del intervalo de confianza del objetivo con las iteraciones
+    acumuladas: media del VAN (normal) o P(VAN<0) (intervalo de Wilson).
+    """
+    n = acumuladores.n
+    if n < 2:
+        return np.inf
+    z = NormalDist().inv_cdf(0.5 + confianza / 2)
+
+    if objetivo == OBJETIVO_MEDIA_VAN:
+        return z * acumuladores.van.desviacion / np.sqrt(n)
+    if objetivo == OBJETIVO_PROB_VAN_NEGATIVO:
+        p = acumuladores.van_negativos / n
+        return z * np.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    raise ValueError(f"objetivo desconocido: {objetivo}")
+
+
+@medido("simulacion")
+def correr_simulacion_adaptativa(param, precision_objetivo, objetivo=OBJETIVO_MEDIA_VAN,
+                                 confianza=0.95, iteraciones_min=2000,
+                                 max_iteraciones=1_000_000, tamano_bloque=2000,
+                                 semilla=None, workers=1, reservorio=10000,
+                                 precision_cuantiles=0.001, metodo_muestreo=METODO_MC,
+                                 validar=False):
+    """
+    Corre bloques hasta que, con al menos iteraciones_min iteraciones, el
+    semiancho del intervalo de confianza del objetivo ("media_van" en
+    lempiras o "prob_van_negativo" como proporción) sea menor o igual que
+    precision_objetivo, o hasta max_iteraciones. precision_cuantiles es el
+    error relativo del bosquejo de la mediana y los percentiles, como
+    precision en el modo streaming.
+
+    Los bloques y sus semillas son los mismos para cualquier número de
+    procesos; con workers > 1 se evalúa una tanda de bloques a la vez, pero
+    la parada se revisa después de cada bloque (en orden) y el resto de la
+    tanda se descarta, así que el resultado depende solo de la semilla.
+
+    Devuelve un ResultadoSimulacion como el del modo streaming; el resumen
+    agrega iteraciones_usadas, precision_alcanzada y objetivo_cumplido.
+    """
+    tamanos = dividir_en_bloques(max_iteraciones, tamano_bloque)
+    semillas = semillas_por_bloque(semilla, len(tamanos))
+    tareas = [(param, n, s, reservorio, precision_cuantiles, metodo_muestreo, validar)
+              for n, s in zip(tamanos, semillas)]
+
+    total = _Acumuladores(reservorio, precision_cuantiles)
+    alcanzada = np.inf
+
+    cumplido = False
+    with PoolBloques(workers) as pool:
+        for inicio in range(0, len(tareas), pool.workers):
+            for estado in pool.iterar(_resumir_bloque, tareas[inicio:inicio + pool.workers]):
+                total.combinar(estado)
+
+                alcanzada = semiancho_intervalo(total, objetivo, confianza)
+                cumplido = total.n >= iteraciones_min and alcanzada <= precision_objetivo
+                if cumplido:
+                    break
+            if cumplido:
+                break
+
+    contar("iteraciones", total.n)
+    resultado = total.resultado(param["vida"], total.n)
+    resultado.resumen.update({
+        "iteraciones_usadas": int(total.n),
+        "objetivo": objetivo,
+        "precision_objetivo": float(precision_objetivo),
+        "precision_alcanzada": float(alcanzada),
+        "objetivo_cumplido": cumplido,
+    })
+    return resultado
@@ -0,0 +1,183 @@
+# simulador/trayectorias.py
+
+import numpy as np
+from scipy.signal import lfilter
+from scipy.special import ndtri
+
+from simulador.muestreo import (
+    generar_uniformes,
+    correlacionar_uniformes,
+    transformar_entradas,
+    VARIABLES,
+    METODO_MC,
+)
+from simulador.flujo_caja import flujo_caja_anual
+
+
+# DINÁMICA AÑO A AÑO DE LAS VARIABLES ALEATORIAS
+#
+# param["dinamica"] = {"modelo": ..., ...}
+#
+# - "independiente": las cuatro variables se sortean de nuevo cada año con
+#   sus distribuciones de siempre.
+# - "tendencia": el año 1 sale de la distribución de siempre y después cada
+#   variable indicada crece con un paseo aleatorio geométrico:
+#       {"modelo": "tendencia",
+#        "crecimiento": {"demanda": 0.03}, "volatilidad": {"demanda": 0.05}}
+#   El crecimiento es el esperado por año.
+# - "reversion": cada variable indicada vuelve a su media con un AR(1)
+#   de coeficiente phi; la varianza de cada año es la del año 1:
+#       {"modelo": "reversion", "persistencia": {"precio": 0.6}}
+#
+# Las variables que no se nombran quedan fijas durante toda la vida,
+# igual que en el modelo base.
+
+DINAMICA_INDEPENDIENTE = "independiente"
+DINAMICA_TENDENCIA = "tendencia"
+DINAMICA_REVERSION = "reversion"
+
+DINAMICAS = (DINAMICA_INDEPENDIENTE, DINAMICA_TENDENCIA, DINAMICA_REVERSION)
+
+
+def _variables_dinamicas(dinamica):
+    """Variables con trayectoria propia según el modelo (en el orden de VARIABLES)."""
+    modelo = dinamica.get("modelo")
+    if modelo not in DINAMICAS:
+        raise ValueError(f"modelo de dinámica desconocido: {modelo}")
+
+    if modelo == DINAMICA_INDEPENDIENTE:
+        return VARIABLES
+
+    claves = ("crecimiento", "volatilidad") if modelo == DINAMICA_TENDENCIA else ("persistencia",)
+    nombradas = set()
+    for clave in claves:
+        nombradas.update(dinamica.get(clave, {}))
+
+    desconocidas = nombradas - set(VARIABLES)
+    if desconocidas:
+        raise ValueError(f"variables desconocidas en la dinámica: {sorted(desconocidas)}")
+
+    return tuple(v for v in VARIABLES if v in nombradas)
+
+
+def _media_y_desviacion(param, variable):
+    """Media y desviación estándar de la distribución de una variable."""
+    if variable == "precio":
+        return param["precio_mu"], param["precio_sigma"]
+
+    if variable == "costo_fijo":
+        valores = np.asarray(param["cf_valores"], dtype=float)
+        probs = np.asarray(param["cf_probs"], dtype=float)
+        probs = probs / probs.sum()
+        media = float(valores @ probs)
+        return media, float(np.sqrt(((valores - media) ** 2) @ probs))
+
+    a, b = (param["demanda_min"], param["demanda_max"]) if variable == "demanda" \
+        else (param["cv_min"], param["cv_max"])
+    return (a + b) / 2, (b - a) / np.sqrt(12)
+
+
+def _tendencia(inicial, z, crecimiento, volatilidad):
+    """
+    Paseo aleatorio geométrico (n, vida) que parte de inicial (n,):
+    X_t = X_{t-1} · exp(μ + σ·z_t), con μ = ln(1+g) - σ²/2 para que el
+    crecimiento esperado sea g.
+    """
+    mu = np.log1p(crecimiento) - volatilidad ** 2 / 2
+    log_factores = np.zeros((inicial.shape[0], z.shape[1] + 1))
+    np.cumsum(mu + volatilidad * z, axis=1, out=log_factores[:, 1:])
+    return inicial[:, None] * np.exp(log_factores)
+
+
+def _reversion(inicial, z, media, desviacion, phi):
+    """
+    AR(1) alrededor de la media: d_t = phi · d_{t-1} + e_t, con d_1 = X_1 - media
+    y e_t ~ N(0, σ²(1-phi²)). La recursión se hace con un filtro IIR sobre el
+    eje de los años.
+    """
+    if not -1 < phi < 1:
+        raise ValueError("la persistencia debe estar en (-1, 1)")
+
+    innovaciones = np.empty((inicial.shape[0], z.shape[1] + 1))
+    innovaciones[:, 0] = inicial - media
+    innovaciones[:, 1:] = desviacion * np.sqrt(1 - phi ** 2) * z
+
+    return media + lfilter([1.0], [1.0, -phi], innovaciones, axis=1)
+
+
+def trayectorias_entradas(param, n, rng=None, metodo=METODO_MC):
+    """
+    Demanda, precio, costo variable y costo fijo de cada año como matrices
+    (n, vida), según param["dinamica"].
+
+    Todos los números R del bloque se generan juntos con el método de
+    muestreo elegido (una dimensión por variable y año), y la correlación
+    de param["correlacion"] se aplica dentro de cada año.
+    """
+    dinamica = param["dinamica"]
+    vida = int(param["vida"])
+    d = len(VARIABLES)
+    dinamicas = _variables_dinamicas(dinamica)
+    correlacion = param.get("correlacion")
+
+    if dinamica["modelo"] == DINAMICA_INDEPENDIENTE:
+        R = generar_uniformes(n, d * vida, metodo, rng).reshape(n * vida, d)
+        entradas = transformar_entradas(correlacionar_uniformes(R, correlacion), param)
+        return tuple(np.asarray(x, dtype=float).reshape(n, vida) for x in entradas)
+
+    R = generar_uniformes(n, d + len(dinamicas) * (vida - 1), metodo, rng)
+    iniciales = transformar_entradas(correlacionar_uniformes(R[:, :d], correlacion), param)
+    z = ndtri(np.clip(R[:, d:], 1e-12, 1 - 1e-12)).reshape(n, len(dinamicas), vida - 1)
+
+    trayectorias = []
+    for variable, inicial in zip(VARIABLES, iniciales):
+        inicial = np.asarray(inicial, dtype=float)
+
+        if variable not in dinamicas:
+            trayectorias.append(np.broadcast_to(inicial[:, None], (n, vida)))
+            continue
+
+        z_var = z[:, dinamicas.index(variable)]
+        if dinamica["modelo"] == DINAMICA_TENDENCIA:
+            trayectorias.append(_tendencia(
+                inicial, z_var,
+                dinamica.get("crecimiento", {}).get(variable, 0.0),
+                dinamica.get("volatilidad", {}).get(variable, 0.0),
+            ))
+        else:
+            media, desviacion = _media_y_desviacion(param, variable)
+            trayectorias.append(_reversion(
+                inicial, z_var, media, desviacion, dinamica["persistencia"][variable]
+            ))
+
+    return tuple(trayectorias)
+
+
+def flujos_trayectorias(param, n, rng=None, metodo=METODO_MC):
+    """
+    Matriz de flujos (n, vida) con entradas distintas cada año: flujo_caja_anual
+    aplicado elemento a elemento y el valor de desecho en el último año.
+    """
+    return flujos_desde_trayectorias(param, *trayectorias_entradas(param, n, rng, metodo))
+
+
+def flujos_desde_trayectorias(param, demanda, precio, costo_variable, costo_fijo):
+    """Matriz de flujos (n, vida) a partir de las trayectorias de las cuatro variables."""
+    flujos, _ = flujo_caja_anual(
+        demanda, precio, costo_variable, costo_fijo,
+        depreciacion_anual=param["depreciacion"],
+        tasa_impuesto=param["tasa_impuesto"],
+    )
+    flujos[:, -1] += param["valor_desecho"]
+
+    return flujos
+
+
+def entradas_de_la_distribucion(param, trayectorias):
+    """
+    Parte de las trayectorias que sigue las distribuciones de entrada (para
+    validarlas): todos los años si el sorteo es independiente; si no, el año 1.
+    """
+    if param["dinamica"]["modelo"] == DINAMICA_INDEPENDIENTE:
+        return trayectorias
+    return tuple(t[:, 0] for t in trayectorias)
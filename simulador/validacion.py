@@ -1,174 +1,270 @@
-# simulador/validacion.py
-
-import math
-import numpy as np
-
-from simulador.generadores import (
-    generar_uniforme,
-    generar_normal,
-    generar_discreta,
-)
-
-
-def _chi_cuadrado_uniforme(muestra, a, b, k=5):
-    """
-    Prueba Chi-cuadrado para variable uniforme [a,b].
-    Nivel de significancia 5%, usamos valor crítico tabulado.
-    """
-    n = len(muestra)
-    limites = np.linspace(a, b, k + 1)
-    freq_obs, _ = np.histogram(muestra, bins=limites)
-    freq_esp = np.ones(k) * (n / k)
-
-    estadistico = np.sum((freq_obs - freq_esp) ** 2 / freq_esp)
-
-    # gl = k - 1 → para k=5 → gl=4 → chi2_crit ~ 9.49
-    gl = k - 1
-    chi_criticos = {4: 9.49, 5: 11.07, 6: 12.59}
-    valor_critico = chi_criticos.get(gl, 9.49)
-
-    acepta = estadistico < valor_critico
-
-    return estadistico, valor_critico, acepta
-
-
-def _chi_cuadrado_discreta(muestra, valores, probs):
-    """
-    Prueba Chi-cuadrado para distribución discreta (costo fijo).
-    valores: lista de valores posibles
-    probs:   lista de probabilidades teóricas
-    """
-    n = len(muestra)
-    valores = np.array(valores)
-    probs = np.array(probs)
-
-    freq_obs = []
-    freq_esp = []
-    for v, p in zip(valores, probs):
-        freq_obs.append(np.sum(np.array(muestra) == v))
-        freq_esp.append(n * p)
-
-    freq_obs = np.array(freq_obs)
-    freq_esp = np.array(freq_esp)
-
-    estadistico = np.sum((freq_obs - freq_esp) ** 2 / freq_esp)
-
-    # gl = k-1 → aquí k = número de categorías
-    gl = len(valores) - 1
-    chi_criticos = {2: 5.99, 3: 7.81, 4: 9.49}
-    valor_critico = chi_criticos.get(gl, 5.99)
-
-    acepta = estadistico < valor_critico
-
-    return estadistico, valor_critico, acepta
-
-
-def _kolmogorov_smirnov_normal(muestra, mu, sigma):
-    """
-    Prueba de Kolmogorov–Smirnov para normal N(mu, sigma).
-    Usamos nivel de significancia 5% → D_crit ≈ 1.36 / sqrt(n)
-    """
-    n = len(muestra)
-    datos = np.sort(np.array(muestra))
-
-    # CDF teórica normal usando erf
-    def cdf_norm(x):
-        z = (x - mu) / (sigma * math.sqrt(2))
-        return 0.5 * (1 + math.erf(z))
-
-    F_teo = np.array([cdf_norm(x) for x in datos])
-    F_emp = np.arange(1, n + 1) / n
-
-    D = np.max(np.abs(F_emp - F_teo))
-    D_crit = 1.36 / math.sqrt(n)
-    acepta = D < D_crit
-
-    return D, D_crit, acepta
-
-
-def validar_aleatorios(parametros, n=200):
-    """
-    Genera muestras de números aleatorios para cada variable
-    y aplica la prueba correspondiente:
-
-    - Demanda (Uniforme)        → Chi-cuadrado
-    - Costo variable (Uniforme) → Chi-cuadrado
-    - Precio (Normal)           → Kolmogorov–Smirnov
-    - Costo fijo (Discreta)     → Chi-cuadrado
-
-    Devuelve un diccionario con resultados.
-    """
-    resultados = {}
-
-    #Demanda (Uniforme)
-    muestra_demanda = [
-        generar_uniforme(parametros["demanda_min"], parametros["demanda_max"])
-        for _ in range(n)
-    ]
-    estad, crit, acepta = _chi_cuadrado_uniforme(
-        muestra_demanda,
-        parametros["demanda_min"],
-        parametros["demanda_max"],
-    )
-    resultados["Demanda"] = {
-        "prueba": "Chi-cuadrado (Uniforme)",
-        "estadistico": float(estad),
-        "valor_critico": float(crit),
-        "acepta": bool(acepta),
-    }
-
-    #Costo variable (Uniforme)
-    muestra_cv = [
-        generar_uniforme(parametros["cv_min"], parametros["cv_max"])
-        for _ in range(n)
-    ]
-    estad, crit, acepta = _chi_cuadrado_uniforme(
-        muestra_cv,
-        parametros["cv_min"],
-        parametros["cv_max"],
-    )
-    resultados["Costo variable unitario"] = {
-        "prueba": "Chi-cuadrado (Uniforme)",
-        "estadistico": float(estad),
-        "valor_critico": float(crit),
-        "acepta": bool(acepta),
-    }
-
-    #Precio (Normal)
-    muestra_precio = [
-        generar_normal(parametros["precio_mu"], parametros["precio_sigma"])
-        for _ in range(n)
-    ]
-    estad, crit, acepta = _kolmogorov_smirnov_normal(
-        muestra_precio,
-        parametros["precio_mu"],
-        parametros["precio_sigma"],
-    )
-    resultados["Precio de venta"] = {
-        "prueba": "Kolmogorov–Smirnov (Normal)",
-        "estadistico": float(estad),
-        "valor_critico": float(crit),
-        "acepta": bool(acepta),
-    }
-
-    #Costo fijo (Discreta)
-    muestra_cf = [
-        generar_discreta(
-            parametros["cf_valores"],
-            parametros["cf_probs"],
-        )
-        for _ in range(n)
-    ]
-    estad, crit, acepta = _chi_cuadrado_discreta(
-        muestra_cf,
-        parametros["cf_valores"],
-        parametros["cf_probs"],
-    )
-    resultados["Costo fijo mensual"] = {
-        "prueba": "Chi-cuadrado (Discreta)",
-        "estadistico": float(estad),
-        "valor_critico": float(crit),
-        "acepta": bool(acepta),
-    }
-
-    return resultados
+# simulador/validacion.py
+
+import numpy as np
+from scipy.special import ndtr
+from scipy.stats import chi2, kstwo
+
+from simulador.muestreo import muestrear_entradas, METODO_MC
+
+
+# Nivel de significancia de todas las pruebas
+ALFA = 0.05
+
+
+# PRUEBAS A PARTIR DE FRECUENCIAS Y ESTADÍSTICOS
+
+
+def prueba_chi_cuadrado(freq_obs, probs, n=None, alfa=ALFA):
+    """
+    Chi-cuadrado de bondad de ajuste con las frecuencias observadas de k
+    clases y sus probabilidades teóricas (gl = k - 1).
+    n = tamaño de la muestra (por defecto, la suma de freq_obs).
+    Devuelve (estadistico, valor_critico, p_valor, gl).
+    """
+    freq_obs = np.asarray(freq_obs, dtype=float)
+    probs = np.asarray(probs, dtype=float)
+    probs = probs / probs.sum()
+    n = freq_obs.sum() if n is None else n
+
+    freq_esp = n * probs
+    estadistico = float(np.sum((freq_obs - freq_esp) ** 2 / freq_esp))
+    gl = len(probs) - 1
+
+    return estadistico, float(chi2.isf(alfa, gl)), float(chi2.sf(estadistico, gl)), gl
+
+
+def prueba_kolmogorov_smirnov(D, n, alfa=ALFA):
+    """
+    Valor crítico y p-valor exactos de la KS de dos colas para el
+    estadístico D con n observaciones (distribución kstwo).
+    Devuelve (valor_critico, p_valor).
+    """
+    return float(kstwo.isf(alfa, n)), float(kstwo.sf(D, n))
+
+
+def estadistico_ks(F_teo):
+    """
+    D = sup |F_emp - F_teo| a partir de la CDF teórica evaluada en la
+    muestra ordenada (se compara con i/n y con (i-1)/n).
+    """
+    n = len(F_teo)
+    i = np.arange(1, n + 1, dtype=float)
+    d_mas = np.max(i / n - F_teo)
+    d_menos = np.max(F_teo - (i - 1) / n)
+    return float(max(d_mas, d_menos))
+
+
+def _resultado(prueba, estadistico, valor_critico, p_valor, n, gl=None):
+    return {
+        "prueba": prueba,
+        "estadistico": float(estadistico),
+        "valor_critico": float(valor_critico),
+        "p_valor": float(p_valor),
+        "gl": gl,
+        "n": int(n),
+        "acepta": bool(estadistico < valor_critico),
+    }
+
+
+# PRUEBAS SOBRE UNA MUESTRA
+
+
+def _chi_cuadrado_uniforme(muestra, a, b, k=5, alfa=ALFA):
+    """
+    Prueba Chi-cuadrado para variable uniforme [a,b] con k clases iguales.
+    Devuelve (estadistico, valor_critico, p_valor, gl).
+    """
+    freq_obs, _ = np.histogram(muestra, bins=k, range=(a, b))
+    return prueba_chi_cuadrado(freq_obs, np.full(k, 1 / k), n=len(muestra), alfa=alfa)
+
+
+def frecuencias_discretas(muestra, valores):
+    """Cuántas veces aparece cada uno de los valores en la muestra (los demás no cuentan)."""
+    valores = np.asarray(valores, dtype=float)
+    orden = np.argsort(valores)
+    ordenados = valores[orden]
+
+    muestra = np.asarray(muestra, dtype=float)
+    pos = np.minimum(np.searchsorted(ordenados, muestra), len(valores) - 1)
+    coincide = ordenados[pos] == muestra
+
+    return np.bincount(orden[pos[coincide]], minlength=len(valores))
+
+
+def _chi_cuadrado_discreta(muestra, valores, probs, alfa=ALFA):
+    """
+    Prueba Chi-cuadrado para distribución discreta (costo fijo), con
+    cualquier número de categorías.
+    Devuelve (estadistico, valor_critico, p_valor, gl).
+    """
+    freq_obs = frecuencias_discretas(muestra, valores)
+    return prueba_chi_cuadrado(freq_obs, probs, n=len(muestra), alfa=alfa)
+
+
+def _kolmogorov_smirnov_normal(muestra, mu, sigma, alfa=ALFA):
+    """
+    Prueba de Kolmogorov–Smirnov para normal N(mu, sigma), con la CDF
+    normal vectorizada y p-valor exacto.
+    Devuelve (D, valor_critico, p_valor).
+    """
+    datos = np.sort(np.asarray(muestra, dtype=float))
+    D = estadistico_ks(ndtr((datos - mu) / sigma))
+    valor_critico, p_valor = prueba_kolmogorov_smirnov(D, len(datos), alfa)
+    return D, valor_critico, p_valor
+
+
+def validar_aleatorios(parametros, n=200, metodo_muestreo=METODO_MC, semilla=None,
+                       clases=5, alfa=ALFA):
+    """
+    Genera muestras de números aleatorios para cada variable
+    (con el mismo método de muestreo que usará la simulación)
+    y aplica la prueba correspondiente:
+
+    - Demanda (Uniforme)        → Chi-cuadrado con `clases` clases
+    - Costo variable (Uniforme) → Chi-cuadrado con `clases` clases
+    - Precio (Normal)           → Kolmogorov–Smirnov
+    - Costo fijo (Discreta)     → Chi-cuadrado
+
+    Todo es vectorizado, así que n puede ser del orden de 10^7.
+    Devuelve un diccionario con estadístico, valor crítico, p-valor y
+    decisión de cada prueba.
+    """
+    rng = np.random.default_rng(semilla) if semilla is not None else None
+    muestra_demanda, muestra_precio, muestra_cv, muestra_cf = muestrear_entradas(
+        parametros, n, rng, metodo_muestreo
+    )
+
+    resultados = {}
+
+    estad, crit, p, gl = _chi_cuadrado_uniforme(
+        muestra_demanda, parametros["demanda_min"], parametros["demanda_max"], clases, alfa
+    )
+    resultados["Demanda"] = _resultado("Chi-cuadrado (Uniforme)", estad, crit, p, n, gl)
+
+    estad, crit, p, gl = _chi_cuadrado_uniforme(
+        muestra_cv, parametros["cv_min"], parametros["cv_max"], clases, alfa
+    )
+    resultados["Costo variable unitario"] = _resultado("Chi-cuadrado (Uniforme)", estad, crit, p, n, gl)
+
+    estad, crit, p = _kolmogorov_smirnov_normal(
+        muestra_precio, parametros["precio_mu"], parametros["precio_sigma"], alfa
+    )
+    resultados["Precio de venta"] = _resultado("Kolmogorov–Smirnov (Normal)", estad, crit, p, n)
+
+    estad, crit, p, gl = _chi_cuadrado_discreta(
+        muestra_cf, parametros["cf_valores"], parametros["cf_probs"], alfa
+    )
+    resultados["Costo fijo mensual"] = _resultado("Chi-cuadrado (Discreta)", estad, crit, p, n, gl)
+
+    return resultados
+
+
+# VALIDACIÓN DE LAS ENTRADAS QUE USÓ LA SIMULACIÓN
+
+
+class ValidacionEnLinea:
+    """
+    Frecuencias de las entradas que realmente alimentaron el VAN, acumuladas
+    bloque por bloque durante la corrida (combinables entre procesos):
+
+    - demanda y costo variable: `clases` clases iguales (Chi-cuadrado)
+    - precio: u = Φ((x-μ)/σ) en `resolucion` clases finas; la KS se evalúa
+      en los bordes de esas clases (error menor que 1/resolucion más la
+      masa de la clase más cargada)
+    - costo fijo: frecuencia de cada valor (Chi-cuadrado)
+
+    resultados() devuelve el mismo diccionario que validar_aleatorios.
+    """
+
+    __slots__ = ("parametros", "clases", "resolucion", "n",
+                 "demanda", "costo_variable", "precio", "costo_fijo")
+
+    def __init__(self, parametros, clases=5, resolucion=2**14):
+        self.parametros = {
+            clave: parametros[clave]
+            for clave in ("demanda_min", "demanda_max", "cv_min", "cv_max",
+                          "precio_mu", "precio_sigma", "cf_valores", "cf_probs")
+        }
+        self.clases = int(clases)
+        self.resolucion = int(resolucion)
+        self.n = 0
+        self.demanda = np.zeros(self.clases, dtype=np.int64)
+        self.costo_variable = np.zeros(self.clases, dtype=np.int64)
+        self.precio = np.zeros(self.resolucion, dtype=np.int64)
+        self.costo_fijo = np.zeros(len(self.parametros["cf_valores"]), dtype=np.int64)
+
+    @staticmethod
+    def _contar(u, k):
+        """Frecuencias de u (en [0, 1]) en k clases iguales."""
+        clase = np.clip((np.asarray(u, dtype=float) * k).astype(np.int64), 0, k - 1)
+        return np.bincount(clase.ravel(), minlength=k)
+
+    def agregar(self, demanda, precio, costo_variable, costo_fijo):
+        """Incorpora las entradas de un bloque (arreglos de cualquier forma)."""
+        p = self.parametros
+        self.n += np.size(demanda)
+        self.demanda += self._contar(
+            (demanda - p["demanda_min"]) / (p["demanda_max"] - p["demanda_min"]), self.clases
+        )
+        self.costo_variable += self._contar(
+            (costo_variable - p["cv_min"]) / (p["cv_max"] - p["cv_min"]), self.clases
+        )
+        self.precio += self._contar(
+            ndtr((np.asarray(precio, dtype=float) - p["precio_mu"]) / p["precio_sigma"]),
+            self.resolucion,
+        )
+        self.costo_fijo += frecuencias_discretas(np.ravel(costo_fijo), p["cf_valores"])
+        return self
+
+    def combinar(self, otro):
+        self.n += otro.n
+        self.demanda += otro.demanda
+        self.costo_variable += otro.costo_variable
+        self.precio += otro.precio
+        self.costo_fijo += otro.costo_fijo
+        return self
+
+    def resultados(self, alfa=ALFA):
+        """Chi-cuadrado y KS sobre las frecuencias acumuladas."""
+        p = self.parametros
+        uniforme = np.full(self.clases, 1 / self.clases)
+        resultados = {}
+
+        estad, crit, p_valor, gl = prueba_chi_cuadrado(self.demanda, uniforme, self.n, alfa)
+        resultados["Demanda"] = _resultado(
+            "Chi-cuadrado (Uniforme)", estad, crit, p_valor, self.n, gl)
+
+        estad, crit, p_valor, gl = prueba_chi_cuadrado(self.costo_variable, uniforme, self.n, alfa)
+        resultados["Costo variable unitario"] = _resultado(
+            "Chi-cuadrado (Uniforme)", estad, crit, p_valor, self.n, gl)
+
+        bordes = np.arange(1, self.resolucion + 1) / self.resolucion
+        D = float(np.max(np.abs(np.cumsum(self.precio) / self.n - bordes)))
+        crit, p_valor = prueba_kolmogorov_smirnov(D, self.n, alfa)
+        resultados["Precio de venta"] = _resultado(
+            "Kolmogorov–Smirnov (Normal)", D, crit, p_valor, self.n)
+
+        estad, crit, p_valor, gl = prueba_chi_cuadrado(self.costo_fijo, p["cf_probs"], self.n, alfa)
+        resultados["Costo fijo mensual"] = _resultado(
+            "Chi-cuadrado (Discreta)", estad, crit, p_valor, self.n, gl)
+
+        return resultados
+
+    def a_dict(self):
+        """Estado como tipos de JSON (para guardarlo junto al resultado)."""
+        return {
+            "parametros": {k: np.asarray(v).tolist() for k, v in self.parametros.items()},
+            "clases": self.clases,
+            "resolucion": self.resolucion,
+            "n": int(self.n),
+            **{c: getattr(self, c).tolist()
+               for c in ("demanda", "costo_variable", "precio", "costo_fijo")},
+        }
+
+    @classmethod
+    def desde_dict(cls, datos):
+        validacion = cls(datos["parametros"], datos["clases"], datos["resolucion"])
+        validacion.n = datos["n"]
+        for c in ("demanda", "costo_variable", "precio", "costo_fijo"):
+            getattr(validacion, c)[:] = datos[c]
+        return validacion
@@ -0,0 +1,11 @@
+import copy
+
+import pytest
+
+from simulador.datos import PARAMETROS_BASE
+
+
+@pytest.fixture
+def parametros():
+    """Escenario base de app.py (copia nueva en cada prueba)."""
+    return copy.deepcopy(PARAMETROS_BASE)
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+import os
+
+from simulador.archivo import (
+    guardar_corrida, cargar_corrida, listar_corridas, comparar_corridas,
+    momentos_por_tramos, histograma_por_tramos,
+)
+from simulador.cache import CacheResultados
+from simulador.main_engine import ejecutar_simulacion
+from simulador.resultados import CONSERVAR_MUESTRA
+from simulador.simulacion import correr_simulacion_lote
+
+
+def test_ida_y_vuelta(parametros, tmp_path):
+    parametros["correlacion"] = np.eye(4)
+    resultado = correr_simulacion_lote(parametros, 1000, semilla=3,
+                                       conservar_flujos=CONSERVAR_MUESTRA, muestra_flujos=10)
+    ruta = guardar_corrida(resultado, parametros, carpeta=str(tmp_path), nombre="a")
+    leido = cargar_corrida(ruta)
+
+    assert isinstance(leido.van, np.memmap)
+    np.testing.assert_array_equal(leido.van, resultado.van)
+    np.testing.assert_array_equal(leido.codigos_tir, resultado.codigos_tir)
+    np.testing.assert_array_equal(leido.flujos, resultado.flujos)
+    np.testing.assert_array_equal(leido.indices_flujos, resultado.indices_flujos)
+    assert leido.resumen == resultado.resumen
+
+    corridas = listar_corridas(str(tmp_path))
+    assert list(corridas["iteraciones"]) == [1000]
+    assert corridas["media_van"][0] == resultado.resumen["media"]
+
+
+def test_corrida_repetida_se_archiva_una_vez(parametros, tmp_path):
+    cache = CacheResultados(carpeta=str(tmp_path / "cache"))
+    carpeta = str(tmp_path / "corridas")
+    rutas = [
+        guardar_corrida(ejecutar_simulacion(parametros, 500, semilla=3, cache=cache),
+                        parametros, carpeta=carpeta)
+        for _ in range(3)
+    ]
+
+    assert rutas[0] == rutas[1] == rutas[2]
+    assert os.path.basename(rutas[0]) == ejecutar_simulacion(parametros, 500, semilla=3,
+                                                             cache=cache).clave
+    assert len(listar_corridas(carpeta)) == 1
+
+
+def test_limite_de_corridas_borra_las_mas_viejas(parametros, tmp_path):
+    resultado = correr_simulacion_lote(parametros, 100, semilla=3)
+    for i in range(5):
+        ruta = guardar_corrida(resultado, carpeta=str(tmp_path), nombre=f"c{i}", maximo=3)
+        os.utime(ruta, (i, i))
+
+    assert sorted(os.listdir(tmp_path)) == ["c2", "c3", "c4"]
+
+
+def test_lectura_por_tramos_igual_que_en_memoria():
+    x = np.random.default_rng(0).normal(size=10_000)
+    x[5] = np.nan
+
+    momentos = momentos_por_tramos(x, tamano_tramo=777)
+    assert momentos.n == 9_999
+    assert momentos.media == pytest.approx(np.nanmean(x), rel=1e-12)
+
+    conteos, bordes = histograma_por_tramos(x, bins=20, tamano_tramo=777)
+    esperados, bordes_np = np.histogram(x[np.isfinite(x)], bins=20)
+    np.testing.assert_allclose(bordes, bordes_np)
+    np.testing.assert_array_equal(conteos, esperados)
+
+
+def test_comparar_corridas_sobre_los_mismos_bordes(parametros, tmp_path):
+    rutas = [
+        guardar_corrida(correr_simulacion_lote(parametros, 500, semilla=s),
+                        carpeta=str(tmp_path), nombre=f"c{s}")
+        for s in (1, 2)
+    ]
+    tabla = comparar_corridas(rutas, bins=10)
+
+    assert list(tabla.columns) == ["lim_inf", "lim_sup", "c1", "c2"]
+    np.testing.assert_allclose(tabla[["c1", "c2"]].sum(), 1.0)
@@ -0,0 +1,63 @@
+import json
+
+import benchmarks.ejecutar
+from benchmarks.casos import CASOS, CASOS_POR_NOMBRE, faltantes
+from benchmarks.ejecutar import comparar, ejecutar, medir, DIFERENCIA_MINIMA_S
+
+
+def _resultado(caso, n, tiempo):
+    return {"caso": caso, "iteraciones": n, "estado": "ok", "tiempo_s": tiempo}
+
+
+def test_comparar_marca_solo_regresiones_reales():
+    base = {"resultados": [_resultado("a", 10, 1.0), _resultado("b", 10, 0.001),
+                           _resultado("c", 10, 1.0)]}
+    actuales = [
+        _resultado("a", 10, 1.3),            # 30 % más lento
+        _resultado("b", 10, 0.001 + DIFERENCIA_MINIMA_S / 2),  # más lento, pero es ruido
+        _resultado("c", 10, 1.1),            # dentro del umbral
+        _resultado("a", 100, 5.0),           # sin línea base
+    ]
+    regresiones = comparar(actuales, base, umbral=0.20)
+
+    assert [(r["caso"], r["iteraciones"]) for r in regresiones] == [("a", 10)]
+    assert actuales[1]["regresion"] is False
+    assert "cambio_vs_base" not in actuales[3]
+
+
+def test_casos_con_nombres_unicos():
+    assert len(CASOS_POR_NOMBRE) == len(CASOS)
+    assert faltantes(CASOS_POR_NOMBRE["calcular_van_lote"]) == []
+
+
+def test_medir_en_el_proceso():
+    resultado = medir("calcular_van_lote", 1000, repeticiones=2)
+    assert resultado["estado"] == "ok"
+    assert len(resultado["tiempos_s"]) == 2
+    assert resultado["tiempo_s"] == min(resultado["tiempos_s"])
+    if resultado["rss_medicion_mb"] is not None:
+        assert resultado["rss_medicion_mb"] >= 0
+        assert resultado["rss_max_mb"] >= resultado["rss_medicion_mb"]
+
+
+def test_ejecutar_guarda_historial_y_detecta_regresion(tmp_path, monkeypatch):
+    # El caso más chico puede tardar menos que el margen de ruido
+    monkeypatch.setattr(benchmarks.ejecutar, "DIFERENCIA_MINIMA_S", 0.0)
+    historial = tmp_path / "historial.json"
+    linea_base = tmp_path / "linea_base.json"
+    argumentos = dict(nombres=["calcular_van_lote"], max_iteraciones=10**5, repeticiones=1,
+                      ruta_historial=str(historial), ruta_linea_base=str(linea_base),
+                      salida=lambda *_: None)
+
+    corrida, regresiones = ejecutar(guardar_linea_base=True, **argumentos)
+    assert corrida["resultados"][0]["estado"] == "ok"
+    assert regresiones == []
+
+    # Una línea base imposible de igualar
+    base = json.loads(linea_base.read_text(encoding="utf-8"))
+    base["resultados"][0]["tiempo_s"] = 1e-9
+    linea_base.write_text(json.dumps(base), encoding="utf-8")
+
+    _, regresiones = ejecutar(**argumentos)
+    assert len(regresiones) == 1
+    assert len(json.loads(historial.read_text(encoding="utf-8"))) == 2
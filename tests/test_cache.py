@@ -0,0 +1,76 @@
+import numpy as np
+
+from simulador.cache import CacheResultados, clave_simulacion, normalizar
+from simulador.main_engine import ejecutar_simulacion
+from simulador.simulacion import correr_simulacion_lote
+
+
+def test_clave_estable_al_reordenar_y_cambiar_tipos(parametros):
+    reordenado = dict(reversed(list(parametros.items())))
+    retipado = dict(parametros, vida=10.0, demanda_min=np.int64(9061),
+                    precio_mu=np.float64(26.48), cf_valores=np.array([28000, 30000, 32000]))
+
+    base = clave_simulacion(parametros, 10, 7)
+    assert clave_simulacion(reordenado, 10, 7) == base
+    assert clave_simulacion(retipado, 10.0, np.int64(7)) == base
+
+
+def test_clave_distingue_semillas_grandes(parametros):
+    assert clave_simulacion(parametros, 10, 2**60) != clave_simulacion(parametros, 10, 2**60 + 1)
+    assert normalizar(2**63 - 1) == 2**63 - 1
+    assert clave_simulacion(parametros, 10, 1) != clave_simulacion(parametros, 10, 2)
+    assert clave_simulacion(parametros, 10, 1) != clave_simulacion(parametros, 11, 1)
+
+
+def test_guardar_y_leer_de_disco(parametros, tmp_path):
+    clave = clave_simulacion(parametros, 500, 3)
+    resultado = correr_simulacion_lote(parametros, 500, semilla=3)
+
+    CacheResultados(carpeta=str(tmp_path)).guardar(clave, resultado)
+    cache = CacheResultados(carpeta=str(tmp_path))
+    leido = cache.obtener(clave)
+
+    assert cache.estadisticas()["aciertos_disco"] == 1
+    np.testing.assert_array_equal(leido.van, resultado.van)
+    np.testing.assert_array_equal(leido.tir, resultado.tir)
+    assert leido.resumen == resultado.resumen
+    assert not leido.van.flags.writeable
+    assert cache.obtener(clave_simulacion(parametros, 500, 4)) is None
+
+
+def test_ejecutar_simulacion_reutiliza_la_corrida(parametros, tmp_path):
+    cache = CacheResultados(carpeta=str(tmp_path))
+    primera = ejecutar_simulacion(parametros, 800, semilla=3, validar=True, cache=cache)
+    segunda = ejecutar_simulacion(dict(parametros), 800.0, semilla=3, validar=True, cache=cache,
+                                  workers=2)
+    ejecutar_simulacion(parametros, 800, cache=cache)  # sin semilla no se guarda
+
+    assert cache.estadisticas()["aciertos_memoria"] == 1
+    assert cache.estadisticas()["guardados"] == 1
+    np.testing.assert_array_equal(segunda.van, primera.van)
+    assert segunda.validacion.a_dict() == primera.validacion.a_dict()
+
+
+def test_resultado_mas_grande_que_el_disco_no_borra_la_cache(parametros, tmp_path):
+    chico = correr_simulacion_lote(parametros, 200, semilla=1)
+    grande = correr_simulacion_lote(parametros, 5000, semilla=2)
+    cache = CacheResultados(carpeta=str(tmp_path), max_bytes_memoria=0,
+                            max_bytes_disco=grande.memoria_bytes - 1)
+
+    cache.guardar("chico", chico)
+    cache.guardar("grande", grande)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["chico.npz"]
+    assert cache.obtener("chico") is not None
+    assert cache.obtener("grande") is None
+
+
+def test_la_validacion_no_se_comparte_entre_llamadas(parametros, tmp_path):
+    cache = CacheResultados(carpeta=str(tmp_path))
+    primera = ejecutar_simulacion(parametros, 800, semilla=3, validar=True, cache=cache)
+    n = primera.validacion.n
+    primera.validacion.combinar(primera.validacion)
+
+    segunda = ejecutar_simulacion(parametros, 800, semilla=3, validar=True, cache=cache)
+    assert segunda.validacion is not primera.validacion
+    assert segunda.validacion.n == n
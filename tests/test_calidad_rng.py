@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from simulador.calidad_rng import (
+    EstadoCalidad, adinf, bateria_calidad, resumen_calidad,
+    PRUEBA_ANDERSON_DARLING, PRUEBA_AUTOCORRELACION, PRUEBA_RACHAS,
+)
+
+
+def _a2_exacto(u):
+    u = np.sort(u)
+    n = u.size
+    i = np.arange(1, n + 1)
+    return -n - np.mean((2 * i - 1) * (np.log(u) + np.log1p(-u[::-1])))
+
+
+def test_adinf_en_los_valores_criticos_conocidos():
+    assert adinf(2.492) == pytest.approx(0.95, abs=0.001)
+    assert adinf(3.857) == pytest.approx(0.99, abs=0.001)
+    assert adinf(0) == 0.0
+
+
+def test_anderson_darling_por_clases_cerca_del_exacto():
+    u = np.random.default_rng(0).random(200_000)
+    estadistico = EstadoCalidad().agregar(u)._anderson_darling()[0]
+    assert estadistico == pytest.approx(_a2_exacto(u), rel=0.02)
+
+
+def test_combinar_bloques_suma_las_frecuencias():
+    u = np.random.default_rng(1).random(10_000)
+    junto = EstadoCalidad().agregar(u)
+    partes = EstadoCalidad().agregar(u[:4000]).combinar(EstadoCalidad().agregar(u[4000:]))
+
+    assert partes.n == junto.n
+    np.testing.assert_array_equal(partes.frecuencias_ad, junto.frecuencias_ad)
+
+
+def test_detecta_un_flujo_con_dependencia_serial():
+    rng = np.random.default_rng(2)
+    u = np.empty(50_000)
+    u[0] = rng.random()
+    for i in range(1, u.size):
+        u[i] = (u[i - 1] + 0.1 * rng.random()) % 1.0
+
+    pruebas = {f["prueba"]: f for f in EstadoCalidad().agregar(u).resultados()}
+    assert not pruebas[PRUEBA_RACHAS]["acepta"]
+    assert not pruebas[PRUEBA_AUTOCORRELACION]["acepta"]
+
+
+def test_bateria_por_metodo():
+    tabla = bateria_calidad(200_000, metodos=("mc", "lhs"), dimensiones=2, semilla=3,
+                            tamano_bloque=65536)
+
+    assert len(tabla) == 2 * 2 * 5
+    assert (tabla["n"] == 200_000).all()
+    assert tabla.loc[tabla["metodo"] == "mc", "p_valor"].min() > 0.001
+    ad_lhs = tabla[(tabla["metodo"] == "lhs") & (tabla["prueba"] == PRUEBA_ANDERSON_DARLING)]
+    assert (ad_lhs["p_valor"] > 0.99).all()
+
+    resumen = resumen_calidad(tabla)
+    assert len(resumen) == 2 * 5
+    assert (resumen["variables"] == 2).all()
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from simulador.escenarios import comparar_escenarios, diferencia_pareada
+
+
+def test_numeros_comunes_cancelan_el_ruido(parametros):
+    mas_inversion = dict(parametros, inversion_inicial=parametros["inversion_inicial"] - 1000)
+    comparacion = comparar_escenarios(
+        {"base": parametros, "igual": dict(parametros), "mas_inversion": mas_inversion},
+        iteraciones=3000, semilla=2,
+    )
+
+    igual = comparacion.diferencias["igual"]
+    assert igual["media_diferencia"] == 0 and igual["desviacion_diferencia"] == 0
+
+    # Con los mismos R, cambiar la inversión mueve cada VAN exactamente lo mismo
+    diferencia = comparacion.resultados["mas_inversion"].van - comparacion.resultados["base"].van
+    np.testing.assert_allclose(diferencia, 1000, rtol=1e-9)
+    assert len(comparacion.tabla_diferencias()) == 2
+
+
+def test_base_y_flujos_conservados(parametros):
+    precio_alto = dict(parametros, precio_mu=parametros["precio_mu"] * 1.1)
+    comparacion = comparar_escenarios({"a": parametros, "b": precio_alto}, iteraciones=500,
+                                      semilla=2, base="b", muestra_flujos=20)
+
+    assert comparacion.base == "b"
+    assert comparacion.diferencias["a"]["media_diferencia"] < 0
+    assert comparacion.resultados["a"].flujos.shape == (20, parametros["vida"])
+
+
+def test_diferencia_pareada():
+    estad = diferencia_pareada([3.0, 5.0, 7.0], [1.0, 2.0, 3.0])
+    assert estad["media_diferencia"] == pytest.approx(3.0)
+    assert estad["desviacion_diferencia"] == pytest.approx(1.0)
+    assert estad["ic_inf"] < 3.0 < estad["ic_sup"]
+    assert estad["prob_mejora"] == 1.0
+
+
+def test_escenarios_con_y_sin_dinamica(parametros):
+    reversion = dict(parametros, dinamica={"modelo": "reversion", "persistencia": {"precio": 0.6}})
+    with pytest.raises(ValueError, match="dinámica"):
+        comparar_escenarios({"base": parametros, "reversion": reversion}, iteraciones=200, semilla=1)
+
+    tendencia = dict(parametros, dinamica={"modelo": "tendencia", "crecimiento": {"precio": 0.02}})
+    with pytest.raises(ValueError, match="dinámica"):
+        comparar_escenarios({"a": reversion, "b": tendencia}, iteraciones=200, semilla=1)
+
+    # Con la misma dinámica los escenarios comparten los números aleatorios
+    mas_inversion = dict(reversion, inversion_inicial=parametros["inversion_inicial"] - 1000)
+    comparacion = comparar_escenarios({"base": reversion, "mas_inversion": mas_inversion},
+                                      iteraciones=500, semilla=1)
+    diferencia = comparacion.resultados["mas_inversion"].van - comparacion.resultados["base"].van
+    np.testing.assert_allclose(diferencia, 1000, rtol=1e-9)
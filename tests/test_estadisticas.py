@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from simulador.estadisticas import AcumuladorMomentos, BosquejoCuantiles, Reservorio
+from simulador.simulacion import correr_simulacion_lote, correr_simulacion_streaming
+
+
+def test_momentos_por_bloques_igual_que_numpy():
+    x = np.random.default_rng(0).normal(1e6, 5e4, 10_001)
+    acumulado = AcumuladorMomentos()
+    for bloque in np.array_split(x, 7):
+        acumulado.combinar(AcumuladorMomentos().agregar(bloque))
+
+    assert acumulado.n == x.size
+    assert acumulado.media == pytest.approx(x.mean(), rel=1e-13)
+    assert acumulado.desviacion == pytest.approx(x.std(), rel=1e-10)
+    assert (acumulado.minimo, acumulado.maximo) == (x.min(), x.max())
+
+
+def test_bosquejo_respeta_el_error_relativo():
+    x = np.random.default_rng(1).normal(0, 1, 20_000)
+    bosquejo = BosquejoCuantiles(precision=0.001)
+    for bloque in np.array_split(x, 3):
+        bosquejo.combinar(BosquejoCuantiles(0.001).agregar(bloque))
+
+    ordenados = np.sort(x)
+    for q in (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99):
+        exacto = ordenados[int(q * (x.size - 1))]
+        assert bosquejo.cuantil(q) == pytest.approx(exacto, rel=0.001)
+
+
+def test_reservorio_conserva_las_menores_claves():
+    claves = np.random.default_rng(2).random(1000)
+    valores = np.arange(1000.0)
+    a = Reservorio(50).agregar(claves[:600], valor=valores[:600])
+    b = Reservorio(50).agregar(claves[600:], valor=valores[600:])
+    esperados = np.sort(valores[np.argsort(claves)[:50]])
+    np.testing.assert_array_equal(np.sort(a.combinar(b).columna("valor")), esperados)
+
+
+def test_streaming_coincide_con_lote(parametros):
+    lote = correr_simulacion_lote(parametros, 5000, semilla=9).resumen
+    streaming = correr_simulacion_streaming(parametros, 5000, semilla=9, reservorio=100).resumen
+
+    for clave in ("media", "desviacion", "minimo", "maximo", "prob_van_negativo",
+                  "media_tir", "tir_indefinidas"):
+        assert streaming[clave] == pytest.approx(lote[clave], rel=1e-9)
+    for clave in ("mediana", "percentil_5", "percentil_95"):
+        assert streaming[clave] == pytest.approx(lote[clave], rel=0.002)
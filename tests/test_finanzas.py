@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from scipy.optimize import brentq
+
+from simulador.finanzas import (
+    calcular_tir_lote, calcular_van, calcular_van_lote, calcular_van_anualidad,
+    TIR_VALIDA, TIR_SIN_RAIZ, TIR_RAICES_MULTIPLES,
+)
+
+
+def _tir_brentq(flujos):
+    return brentq(lambda r: sum(f / (1 + r) ** t for t, f in enumerate(flujos)), -0.99, 10.0,
+                  xtol=1e-14)
+
+
+@pytest.mark.parametrize("flujos", [
+    [-100, 110],            # un solo período, raíz exacta 10%
+    [-100, 100],            # punto de equilibrio: TIR 0
+    [-200, 100, 100],
+    [-1000, 500, 500],
+    [-100, 0, 0, 133.1],    # raíz exacta 10% a tres años
+    [-812500, 150000, 150000, 150000, 674000],
+])
+def test_tir_coincide_con_brentq(flujos):
+    tirs, codigos = calcular_tir_lote([flujos])
+    assert codigos[0] == TIR_VALIDA
+    assert tirs[0] == pytest.approx(_tir_brentq(flujos), abs=1e-9)
+
+
+def test_tir_lote_aleatorio_coincide_con_brentq():
+    rng = np.random.default_rng(0)
+    flujos = np.column_stack([-rng.uniform(500, 1500, 200), rng.uniform(50, 400, (200, 8))])
+    tirs, codigos = calcular_tir_lote(flujos)
+    assert (codigos == TIR_VALIDA).all()
+    esperadas = [_tir_brentq(f) for f in flujos]
+    np.testing.assert_allclose(tirs, esperadas, atol=1e-9)
+
+
+def test_tir_con_inversion_inicial_aparte():
+    tirs, _ = calcular_tir_lote([[110.0]], inversion_inicial=-100)
+    assert tirs[0] == pytest.approx(0.10)
+
+
+def test_tir_codigos_sin_tir_unica():
+    tirs, codigos = calcular_tir_lote([[100, 100, 100], [-100, 230, -132]])
+    assert np.isnan(tirs).all()
+    assert codigos.tolist() == [TIR_SIN_RAIZ, TIR_RAICES_MULTIPLES]
+
+
+def test_van_lote_y_anualidad_igual_que_van_escalar():
+    flujo_anual = np.array([150000.0, 90000.0])
+    desecho, vida, tasa, inversion = 524000.0, 10, 0.2, -812500.0
+    flujos = np.repeat(flujo_anual[:, None], vida, axis=1)
+    flujos[:, -1] += desecho
+
+    esperado = [calcular_van(inversion, tasa, list(f)) for f in flujos]
+    np.testing.assert_allclose(calcular_van_lote(inversion, tasa, flujos), esperado)
+    np.testing.assert_allclose(
+        calcular_van_anualidad(inversion, tasa, vida, flujo_anual, desecho), esperado
+    )
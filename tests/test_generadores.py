@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from simulador.generadores import (
+    DistribucionDiscreta, discreta_desde_R, normal_desde_R, fijar_semilla, generar_discreta,
+    generar_uniforme_lote, generar_normal_lote, generar_discreta_lote,
+)
+
+
+def test_normaliza_probabilidades_dentro_de_la_tolerancia():
+    dist = DistribucionDiscreta([28000, 30000, 32000], [0.3, 0.3, 0.3999])
+    np.testing.assert_allclose(dist.probabilidades, np.array([0.3, 0.3, 0.3999]) / 0.9999)
+    assert dist.probabilidades.sum() == pytest.approx(1.0, abs=1e-15)
+    assert dist.acumulada[-1] == 1.0
+
+
+@pytest.mark.parametrize("valores, probs", [
+    ([1, 2], [0.5, 0.6]),               # no suman 1
+    ([1, 2, 3], [0.5, -0.1, 0.6]),      # negativa
+    ([1, 2, 3], [0.5, np.nan, 0.5]),
+    ([1, 2, 3], [0.5, 0.5]),            # largos distintos
+    ([], []),
+])
+def test_rechaza_parametros_invalidos(valores, probs):
+    with pytest.raises(ValueError):
+        DistribucionDiscreta(valores, probs)
+
+
+def test_no_congela_el_arreglo_de_quien_llama():
+    valores = np.array([28000.0, 30000.0, 32000.0])
+    dist = DistribucionDiscreta(valores, [0.3, 0.4, 0.3])
+
+    assert valores.flags.writeable
+    valores[0] = 0.0
+    assert dist.valores[0] == 28000.0
+    assert not dist.valores.flags.writeable
+
+
+def test_tabla_como_excel_y_alias_con_las_mismas_frecuencias():
+    dist = DistribucionDiscreta([1, 2, 3], [0.2, 0.5, 0.3])
+    np.testing.assert_array_equal(
+        dist.desde_uniformes(np.array([0.0, 0.2, 0.2001, 0.7, 0.7001, 0.9999])),
+        [1, 1, 2, 2, 3, 3],
+    )
+    np.testing.assert_array_equal(
+        discreta_desde_R([1, 2, 3], [0.2, 0.5, 0.3], np.array([0.1, 0.5, 0.8])), [1, 2, 3]
+    )
+
+    rng = np.random.default_rng(5)
+    frecuencias = np.bincount(dist.muestrear_indices(200_000, rng, "alias"), minlength=3) / 200_000
+    np.testing.assert_allclose(frecuencias, [0.2, 0.5, 0.3], atol=0.005)
+
+
+def test_lote_como_excel_con_los_mismos_r():
+    R = np.random.default_rng(3).random(1000)
+    np.testing.assert_array_equal(
+        generar_uniforme_lote(5, 9, 1000, np.random.default_rng(3)), 5 + R * (9 - 5)
+    )
+    np.testing.assert_allclose(normal_desde_R(10, 2, [0.5, 0.975]), [10, 13.919927969080108])
+    assert np.isfinite(normal_desde_R(0, 1, [0.0, 1.0])).all()
+
+
+def test_semilla_compartida_repite_los_lotes():
+    fijar_semilla(11)
+    a = (generar_normal_lote(0, 1, 5), generar_discreta_lote([1, 2], [0.5, 0.5], 5))
+    fijar_semilla(11)
+    b = (generar_normal_lote(0, 1, 5), generar_discreta_lote([1, 2], [0.5, 0.5], 5))
+    np.testing.assert_array_equal(a[0], b[0])
+    np.testing.assert_array_equal(a[1], b[1])
+    assert generar_discreta([28000, 30000], [0.5, 0.5]) in (28000, 30000)
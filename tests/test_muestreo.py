@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from scipy.stats import spearmanr
+
+from simulador.muestreo import (
+    generar_uniformes, correlacionar_uniformes, factor_cholesky, muestrear_entradas,
+    METODOS_MUESTREO, METODO_ANTITETICO, METODO_LHS, METODO_SOBOL,
+)
+from simulador.simulacion import correr_simulacion_lote
+
+
+@pytest.mark.parametrize("metodo", METODOS_MUESTREO)
+def test_uniformes_en_el_intervalo(metodo):
+    R = generar_uniformes(1000, 4, metodo, np.random.default_rng(0))
+    assert R.shape == (1000, 4)
+    assert R.min() >= 0 and R.max() < 1
+
+
+def test_antitetico_son_pares_r_y_1_menos_r():
+    R = generar_uniformes(10, 3, METODO_ANTITETICO, np.random.default_rng(0))
+    np.testing.assert_array_equal(R[5:], 1 - R[:5])
+
+
+def test_lhs_un_valor_por_franja():
+    n = 500
+    R = generar_uniformes(n, 4, METODO_LHS, np.random.default_rng(0))
+    for j in range(4):
+        np.testing.assert_array_equal(np.sort(np.floor(R[:, j] * n)), np.arange(n))
+
+
+def test_sobol_reduce_el_error_de_la_media(parametros):
+    # Error de la media del VAN en varias réplicas frente a una referencia grande
+    referencia = correr_simulacion_lote(parametros, 2**17, semilla=0).resumen["media"]
+    errores = {
+        metodo: np.mean([
+            abs(correr_simulacion_lote(parametros, 2**10, semilla=s,
+                                       metodo_muestreo=metodo).resumen["media"] - referencia)
+            for s in range(8)
+        ])
+        for metodo in ("mc", METODO_SOBOL)
+    }
+    assert errores[METODO_SOBOL] < errores["mc"]
+
+
+def test_copula_conserva_la_correlacion_de_rangos(parametros):
+    correlacion = np.eye(4)
+    correlacion[0, 1] = correlacion[1, 0] = -0.6
+    correlacion[2, 3] = correlacion[3, 2] = 0.3
+    parametros["correlacion"] = correlacion.tolist()
+
+    R = correlacionar_uniformes(generar_uniformes(50_000, 4, rng=np.random.default_rng(3)),
+                                correlacion)
+    rs = spearmanr(R).statistic
+    np.testing.assert_allclose(rs, correlacion, atol=0.02)
+
+    # Las marginales no cambian
+    demanda, *_ = muestrear_entradas(parametros, 50_000, np.random.default_rng(3))
+    assert demanda.min() >= parametros["demanda_min"] and demanda.max() <= parametros["demanda_max"]
+    assert spearmanr(demanda, R[:, 0]).statistic == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("correlacion", [
+    np.eye(3),                                   # tamaño equivocado
+    [[1, .5, 0, 0], [.4, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]],   # no simétrica
+    [[1, .9, .9, 0], [.9, 1, -.9, 0], [.9, -.9, 1, 0], [0, 0, 0, 1]],  # no definida positiva
+])
+def test_correlacion_invalida(correlacion):
+    with pytest.raises(ValueError):
+        factor_cholesky(correlacion)
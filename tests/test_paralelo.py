@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from simulador.paralelo import TAMANO_BLOQUE, dividir_en_bloques, semillas_por_bloque
+from simulador.simulacion import correr_simulacion_lote
+
+
+def test_dividir_en_bloques():
+    assert dividir_en_bloques(10, 4) == [4, 4, 2]
+    assert dividir_en_bloques(8, 4) == [4, 4]
+    assert dividir_en_bloques(0, 4) == []
+
+
+def test_semillas_reproducibles_e_independientes():
+    a = [s.generate_state(2) for s in semillas_por_bloque(42, 3)]
+    b = [s.generate_state(2) for s in semillas_por_bloque(42, 3)]
+    np.testing.assert_array_equal(a, b)
+    assert len({tuple(x) for x in a}) == 3
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_lote_igual_con_cualquier_numero_de_procesos(parametros, workers):
+    iteraciones = 2 * TAMANO_BLOQUE + 100
+    serie = correr_simulacion_lote(parametros, iteraciones, semilla=5, workers=1)
+    paralelo = correr_simulacion_lote(parametros, iteraciones, semilla=5, workers=workers)
+
+    np.testing.assert_array_equal(paralelo.van, serie.van)
+    np.testing.assert_array_equal(paralelo.tir, serie.tir)
+    np.testing.assert_array_equal(paralelo.flujos, serie.flujos)
+    assert paralelo.resumen == serie.resumen
+
+
+def test_semillas_distintas_dan_corridas_distintas(parametros):
+    a = correr_simulacion_lote(parametros, 1000, semilla=5)
+    b = correr_simulacion_lote(parametros, 1000, semilla=6)
+    assert not np.array_equal(a.van, b.van)
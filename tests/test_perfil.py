@@ -0,0 +1,50 @@
+import numpy as np
+
+from simulador.perfil import perfilar, perfil_activo, tramo, contar, medido
+from simulador.persistencia import BackendSQLite, RepositorioSimulacion, ColaPersistencia
+
+
+RESUMEN = {"media": 1.0, "mediana": 1.0, "desviacion": 0.5, "minimo": 0.0, "maximo": 2.0}
+
+
+@medido("doble")
+def _doble(x):
+    return 2 * x
+
+
+def test_sin_medicion_activa_no_mide():
+    assert perfil_activo() is None
+    with tramo("nada"):
+        contar("nada")
+    assert _doble(2) == 4
+
+
+def test_perfilar_anidado_suma_al_padre():
+    with perfilar() as externo:
+        with perfilar() as interno:
+            with tramo("fase"):
+                contar("iteraciones", 10)
+            _doble(1)
+        with tramo("fase"):
+            pass
+
+    resumen = externo.resumen()
+    assert interno.resumen()["tramos"]["fase"]["llamadas"] == 1
+    assert resumen["tramos"]["fase"]["llamadas"] == 2
+    assert resumen["tramos"]["doble"]["llamadas"] == 1
+    assert resumen["contadores"] == {"iteraciones": 10}
+    assert externo.resumen()["total_s"] == resumen["total_s"]
+
+
+def test_cola_suma_el_guardado_a_la_medicion_que_encolo(tmp_path, parametros):
+    cola = ColaPersistencia(RepositorioSimulacion(BackendSQLite(str(tmp_path / "bd.db"))))
+    with perfilar() as perfil:
+        trabajo = cola.encolar(parametros, 10, RESUMEN, np.zeros(10), [("pdf", "r.pdf")])
+    cola.cerrar(timeout=30)
+
+    resumen = perfil.resumen()
+    assert resumen["tramos"]["bd.cola"]["segundos"] == trabajo.segundos
+    assert resumen["tramos"]["bd.insertar"]["llamadas"] == 4
+    # parámetros + resumen + 10 iteraciones + archivo
+    assert resumen["contadores"]["filas_insertadas"] == 13
+    assert resumen["tasas"]["filas_insertadas_por_s"] > 0
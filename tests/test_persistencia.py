@@ -0,0 +1,140 @@
+import sqlite3
+import time
+
+import numpy as np
+import pytest
+
+from simulador.persistencia import (
+    BackendSQLite, RepositorioSimulacion, ColaPersistencia, crear_backend, insertar_lotes,
+    TRABAJO_GUARDADO, TRABAJO_FALLIDO,
+)
+
+
+RESUMEN = {"media": 1.0, "mediana": 1.0, "desviacion": 0.5, "minimo": 0.0, "maximo": 2.0}
+
+
+def _contar(backend, tabla):
+    with sqlite3.connect(backend.ruta) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0]
+
+
+@pytest.fixture
+def backend(tmp_path):
+    return BackendSQLite(str(tmp_path / "devimulator.db"))
+
+
+def test_insertar_lotes_divide_en_lotes_y_conserva_el_orden(backend):
+    valores = np.random.default_rng(0).normal(size=(4, 2345))
+    conn = backend.conectar()
+    total = insertar_lotes(backend, conn, "VariablesAleatorias",
+                           ("demanda", "costo_variable", "precio", "costo_fijo"), 7, valores,
+                           tamano_lote=1000)
+    conn.commit()
+    filas = conn.execute(
+        "SELECT simulacion_id, demanda, costo_variable, precio, costo_fijo "
+        "FROM VariablesAleatorias ORDER BY id"
+    ).fetchall()
+    conn.close()
+
+    assert total == 2345
+    assert {f[0] for f in filas} == {7}
+    np.testing.assert_array_equal(np.array(filas)[:, 1:].T, valores)
+
+
+def test_crear_backend(tmp_path):
+    assert crear_backend("sqlite", ruta=str(tmp_path / "a.db")).nombre == "sqlite"
+    with pytest.raises(ValueError):
+        crear_backend("oracle")
+
+
+def test_guardar_simulacion_en_una_transaccion(backend, parametros):
+    repo = RepositorioSimulacion(backend)
+    simulacion_id = repo.guardar_simulacion(parametros, 2500, RESUMEN, np.arange(2500.0),
+                                            [("pdf", "reporte.pdf")])
+    repo.cerrar()
+
+    assert simulacion_id == 1
+    assert _contar(backend, "IteracionesVAN") == 2500
+    assert _contar(backend, "ResultadosVAN") == 1
+    assert _contar(backend, "ArchivosGenerados") == 1
+
+
+def test_error_en_la_sesion_revierte_todo(backend, parametros):
+    repo = RepositorioSimulacion(backend, tamano_lote=100)
+    with pytest.raises(RuntimeError):
+        with repo.sesion() as sesion:
+            sesion.guardar_parametros(parametros, 1000)
+            sesion.guardar_iteraciones_van(np.arange(1000.0))
+            raise RuntimeError("falla a mitad de la corrida")
+    repo.cerrar()
+
+    assert _contar(backend, "ParametrosSimulacion") == 0
+    assert _contar(backend, "IteracionesVAN") == 0
+
+
+def test_cola_aisla_la_corrida_mala_sin_reintentar(backend, parametros):
+    cola = ColaPersistencia(RepositorioSimulacion(backend), espera_inicial=5.0)
+    mala = dict(parametros)
+    del mala["cf_probs"]
+
+    inicio = time.perf_counter()
+    trabajos = [cola.encolar(p, 10, RESUMEN, np.zeros(10)) for p in (parametros, mala, parametros)]
+    cola.cerrar(timeout=30)
+
+    # KeyError no es transitorio: no hay esperas entre intentos
+    assert time.perf_counter() - inicio < 4.0
+    assert [t.estado for t in trabajos] == [TRABAJO_GUARDADO, TRABAJO_FALLIDO, TRABAJO_GUARDADO]
+    assert isinstance(trabajos[1].error, KeyError)
+    assert trabajos[0].segundos is not None
+    assert _contar(backend, "ParametrosSimulacion") == 2
+    assert _contar(backend, "IteracionesVAN") == 20
+    assert cola.estado()["fallidos"] == 1
+
+
+class _BackendInestable(BackendSQLite):
+    """Falla las primeras conexiones con un error transitorio."""
+
+    def __init__(self, ruta, fallas):
+        super().__init__(ruta)
+        self.fallas = fallas
+
+    def conectar(self):
+        if self.fallas:
+            self.fallas -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return super().conectar()
+
+
+def test_cola_reintenta_errores_transitorios(tmp_path, parametros):
+    backend = _BackendInestable(str(tmp_path / "devimulator.db"), fallas=2)
+    cola = ColaPersistencia(RepositorioSimulacion(backend), espera_inicial=0.01)
+
+    trabajo = cola.encolar(parametros, 10, RESUMEN)
+    cola.cerrar(timeout=30)
+
+    assert trabajo.estado == TRABAJO_GUARDADO
+    assert trabajo.intentos == 3
+    assert _contar(backend, "ParametrosSimulacion") == 1
+
+
+def test_tabla_inexistente_falla_en_el_primer_intento(backend, parametros):
+    with sqlite3.connect(backend.ruta) as conn:
+        conn.execute("DROP TABLE ResultadosVAN")
+    conn.close()
+    cola = ColaPersistencia(RepositorioSimulacion(backend), espera_inicial=5.0)
+
+    trabajo = cola.encolar(parametros, 10, RESUMEN)
+    cola.cerrar(timeout=30)
+
+    assert not backend.es_transitorio(trabajo.error)
+    assert "no such table" in str(trabajo.error)
+    assert trabajo.estado == TRABAJO_FALLIDO
+    assert trabajo.intentos == 1
+
+
+def test_encolar_despues_de_cerrar_falla(backend, parametros):
+    cola = ColaPersistencia(RepositorioSimulacion(backend))
+    cola.cerrar(timeout=30)
+    cola.cerrar(timeout=30)
+    with pytest.raises(RuntimeError, match="cerrada"):
+        cola.encolar(parametros, 10, RESUMEN)
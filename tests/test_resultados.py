@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from simulador.resultados import (
+    filas_conservadas, CONSERVAR_MUESTRA, CONSERVAR_NINGUNO, CONSERVAR_TODOS,
+)
+from simulador.simulacion import correr_simulacion_lote
+
+
+def test_filas_conservadas():
+    assert filas_conservadas(100, CONSERVAR_TODOS) is None
+    assert filas_conservadas(100, CONSERVAR_NINGUNO).size == 0
+    muestra = filas_conservadas(100, CONSERVAR_MUESTRA, 10)
+    assert muestra[0] == 0 and muestra[-1] == 99 and muestra.size == 10
+    with pytest.raises(ValueError):
+        filas_conservadas(100, "algunos")
+
+
+def test_muestra_de_flujos_son_las_filas_de_la_corrida_completa(parametros):
+    completo = correr_simulacion_lote(parametros, 2000, semilla=4)
+    muestra = correr_simulacion_lote(parametros, 2000, semilla=4,
+                                     conservar_flujos=CONSERVAR_MUESTRA, muestra_flujos=25)
+
+    np.testing.assert_array_equal(muestra.van, completo.van)
+    np.testing.assert_array_equal(muestra.flujos, completo.flujos[muestra.indices_flujos])
+    assert list(muestra.flujos_dataframe().index) == list(muestra.indices_flujos)
+
+
+def test_desempaqueta_como_tupla(parametros):
+    resultado = correr_simulacion_lote(parametros, 100, semilla=4, dtype=np.float32)
+    vans, tirs, flujos, resumen = resultado
+
+    assert len(resultado) == 100
+    assert vans.dtype == np.float32
+    assert resultado.a_dataframe().shape == (100, 2)
+    assert resultado.memoria_bytes == vans.nbytes + tirs.nbytes + flujos.nbytes + 100
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from simulador.sensibilidad import (
+    perturbar, barrido_sensibilidad, indices_sobol, PARAMETROS_PERTURBABLES,
+)
+
+
+@pytest.mark.parametrize("clave", ["cf_probs", "vida", "correlacion", "dinamica"])
+def test_perturbar_rechaza_claves_no_escalables(parametros, clave):
+    parametros["correlacion"] = np.eye(4).tolist()
+    parametros["dinamica"] = {"modelo": "tendencia", "crecimiento": {"precio": 0.02}}
+    with pytest.raises(ValueError, match=clave):
+        perturbar(parametros, clave, 0.10)
+
+
+def test_perturbar_escala_numeros_y_listas(parametros):
+    esc = perturbar(parametros, "cf_valores", 0.10)
+    assert esc["cf_valores"] == pytest.approx([30800, 33000, 35200])
+    assert parametros["cf_valores"] == [28000, 30000, 32000]
+
+    esc = perturbar(parametros, "precio_mu", -0.20)
+    assert esc["precio_mu"] == pytest.approx(26.48 * 0.8)
+
+
+def test_todos_los_perturbables_se_pueden_barrer(parametros):
+    claves = [k for k in PARAMETROS_PERTURBABLES if k in parametros]
+    barrido = barrido_sensibilidad(parametros, claves, niveles=(-0.10, 0.10),
+                                   iteraciones=2000, semilla=3)
+    assert len(barrido) == 1 + 2 * len(claves)
+    assert np.isfinite(barrido["media_van"]).all()
+
+
+def test_barrido_con_dinamica_comparte_los_numeros_aleatorios(parametros):
+    parametros["dinamica"] = {"modelo": "reversion", "persistencia": {"precio": 0.6}}
+    barrido = barrido_sensibilidad(parametros, {"inversion_inicial": (0.10,)},
+                                   iteraciones=1000, semilla=3).set_index("parametro")
+
+    # Solo cambia la inversión: la diferencia pareada no tiene ruido
+    punto = barrido.loc["inversion_inicial"]
+    assert punto["delta_media_van"] == pytest.approx(-0.10 * parametros["inversion_inicial"])
+    assert punto["delta_ic_sup"] - punto["delta_ic_inf"] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_sobol_con_una_sola_variable_aleatoria(parametros):
+    parametros.update(precio_sigma=0.0, cv_min=10.0, cv_max=10.0,
+                      cf_valores=[30000], cf_probs=[1.0])
+    tabla = indices_sobol(parametros, iteraciones=2**12, semilla=1, n_bootstrap=20)
+    tabla = tabla.set_index("variable")
+
+    assert tabla.loc["demanda", "S1"] == pytest.approx(1.0, abs=0.02)
+    assert tabla.loc["demanda", "ST"] == pytest.approx(1.0, abs=0.02)
+    np.testing.assert_allclose(tabla.drop("demanda")[["S1", "ST"]], 0.0, atol=1e-9)
+
+
+def test_sobol_escenario_base(parametros):
+    tabla = indices_sobol(parametros, iteraciones=2**13, semilla=1, n_bootstrap=50)
+
+    assert 0.9 < tabla["S1"].sum() <= 1.05
+    assert (tabla["ST"] >= tabla["S1"] - 0.02).all()
+    assert (tabla["S1_ic_inf"] <= tabla["S1"]).all() and (tabla["S1"] <= tabla["S1_ic_sup"]).all()
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from simulador.finanzas import calcular_van
+from simulador.simulacion import (
+    correr_simulacion_adaptativa, correr_simulacion_lote, calcular_tir,
+)
+
+
+def test_lote_coincide_con_el_calculo_escalar_por_fila(parametros):
+    vans, tirs, flujos, resumen = correr_simulacion_lote(parametros, 300, semilla=1)
+
+    assert flujos.shape == (300, parametros["vida"])
+    assert (flujos[:, :-1] == flujos[:, :1]).all()
+    np.testing.assert_allclose(flujos[:, -1] - flujos[:, 0], parametros["valor_desecho"])
+    for i in range(0, 300, 30):
+        assert vans[i] == pytest.approx(
+            calcular_van(parametros["inversion_inicial"], parametros["tasa_descuento"], flujos[i]),
+            rel=1e-12,
+        )
+        assert tirs[i] == pytest.approx(calcular_tir([parametros["inversion_inicial"], *flujos[i]]))
+    assert resumen["media"] == pytest.approx(np.mean(vans))
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_adaptativa_para_en_el_mismo_bloque_con_cualquier_workers(parametros, workers):
+    argumentos = dict(precision_objetivo=2300, iteraciones_min=1000,
+                      max_iteraciones=20000, tamano_bloque=500, semilla=11)
+    serie = correr_simulacion_adaptativa(parametros, workers=1, **argumentos)
+    paralelo = correr_simulacion_adaptativa(parametros, workers=workers, **argumentos)
+
+    assert serie.resumen["objetivo_cumplido"]
+    assert serie.resumen["iteraciones_usadas"] % (500 * workers) != 0
+    assert paralelo.resumen["iteraciones_usadas"] == serie.resumen["iteraciones_usadas"]
+    assert paralelo.resumen["media"] == serie.resumen["media"]
+    assert paralelo.resumen["precision_alcanzada"] == serie.resumen["precision_alcanzada"]
+
+
+def test_adaptativa_sin_iteraciones_minimas_no_cumple_el_objetivo(parametros):
+    resultado = correr_simulacion_adaptativa(parametros, precision_objetivo=1e9,
+                                             iteraciones_min=5000, max_iteraciones=1000,
+                                             tamano_bloque=500, semilla=11)
+
+    assert resultado.resumen["precision_alcanzada"] <= 1e9
+    assert resultado.resumen["iteraciones_usadas"] == 1000
+    assert not resultado.resumen["objetivo_cumplido"]
+
+
+def test_adaptativa_usa_la_precision_de_cuantiles(parametros):
+    argumentos = dict(precision_objetivo=1e9, iteraciones_min=1000, max_iteraciones=1000,
+                      semilla=11, reservorio=0)
+    fina = correr_simulacion_adaptativa(parametros, precision_cuantiles=1e-4, **argumentos)
+    gruesa = correr_simulacion_adaptativa(parametros, precision_cuantiles=0.05, **argumentos)
+    exacta = np.median(correr_simulacion_lote(parametros, 1000, semilla=11).van)
+
+    assert fina.resumen["mediana"] == pytest.approx(exacta, rel=2e-4)
+    assert fina.resumen["mediana"] != gruesa.resumen["mediana"]
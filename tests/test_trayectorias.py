@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from simulador.simulacion import correr_simulacion_lote
+from simulador.trayectorias import trayectorias_entradas, flujos_trayectorias
+
+
+def test_tendencia_sin_volatilidad_crece_a_la_tasa_pedida(parametros):
+    parametros["dinamica"] = {"modelo": "tendencia", "crecimiento": {"demanda": 0.03}}
+    demanda, precio, _, _ = trayectorias_entradas(parametros, 100, np.random.default_rng(0))
+
+    assert demanda.shape == (100, parametros["vida"])
+    np.testing.assert_allclose(demanda, demanda[:, :1] * 1.03 ** np.arange(parametros["vida"]))
+    assert (precio == precio[:, :1]).all()
+
+
+def test_tendencia_con_volatilidad_mantiene_el_crecimiento_esperado(parametros):
+    parametros["dinamica"] = {"modelo": "tendencia", "crecimiento": {"precio": 0.05},
+                              "volatilidad": {"precio": 0.2}}
+    _, precio, _, _ = trayectorias_entradas(parametros, 200_000, np.random.default_rng(1))
+    crecimiento = precio[:, -1].mean() / precio[:, 0].mean()
+    assert crecimiento == pytest.approx(1.05 ** (parametros["vida"] - 1), rel=0.02)
+
+
+def test_reversion_tiene_la_persistencia_y_varianza_pedidas(parametros):
+    parametros["dinamica"] = {"modelo": "reversion", "persistencia": {"precio": 0.6}}
+    _, precio, _, _ = trayectorias_entradas(parametros, 200_000, np.random.default_rng(2))
+
+    desvios = precio - parametros["precio_mu"]
+    assert np.corrcoef(desvios[:, 4], desvios[:, 5])[0, 1] == pytest.approx(0.6, abs=0.01)
+    np.testing.assert_allclose(precio.std(axis=0), parametros["precio_sigma"], rtol=0.01)
+
+
+def test_independiente_sortea_cada_anio(parametros):
+    parametros["dinamica"] = {"modelo": "independiente"}
+    demanda, *_ = trayectorias_entradas(parametros, 50_000, np.random.default_rng(3))
+
+    assert abs(np.corrcoef(demanda[:, 0], demanda[:, 1])[0, 1]) < 0.02
+    media = (parametros["demanda_min"] + parametros["demanda_max"]) / 2
+    np.testing.assert_allclose(demanda.mean(axis=0), media, rtol=0.01)
+
+
+def test_dinamica_en_el_motor(parametros):
+    parametros["dinamica"] = {"modelo": "reversion", "persistencia": {"demanda": 0.5}}
+    vans, tirs, flujos, _ = correr_simulacion_lote(parametros, 500, semilla=4)
+
+    np.testing.assert_array_equal(flujos, flujos_trayectorias(
+        parametros, 500, np.random.default_rng(np.random.SeedSequence(4).spawn(1)[0])
+    ))
+    assert np.isfinite(vans).all()
+
+
+@pytest.mark.parametrize("dinamica", [
+    {"modelo": "caotico"},
+    {"modelo": "tendencia", "crecimiento": {"inflacion": 0.1}},
+])
+def test_dinamica_invalida(parametros, dinamica):
+    parametros["dinamica"] = dinamica
+    with pytest.raises(ValueError):
+        trayectorias_entradas(parametros, 10, np.random.default_rng(0))
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from simulador.muestreo import muestrear_entradas
+from simulador.paralelo import TAMANO_BLOQUE
+from simulador.simulacion import correr_simulacion_lote
+from simulador.validacion import (
+    validar_aleatorios, prueba_chi_cuadrado, prueba_kolmogorov_smirnov, ValidacionEnLinea,
+)
+
+
+def test_p_valores_iguales_a_scipy(parametros):
+    n = 5000
+    resultados = validar_aleatorios(parametros, n, semilla=8)
+    demanda, precio, costo_variable, costo_fijo = muestrear_entradas(
+        parametros, n, np.random.default_rng(8)
+    )
+
+    frecuencias = np.histogram(demanda, bins=5,
+                               range=(parametros["demanda_min"], parametros["demanda_max"]))[0]
+    esperado = stats.chisquare(frecuencias)
+    assert resultados["Demanda"]["estadistico"] == pytest.approx(esperado.statistic, rel=1e-12)
+    assert resultados["Demanda"]["p_valor"] == pytest.approx(esperado.pvalue, rel=1e-9)
+
+    frecuencias = [np.count_nonzero(costo_fijo == v) for v in parametros["cf_valores"]]
+    probs = np.array(parametros["cf_probs"]) / np.sum(parametros["cf_probs"])
+    esperado = stats.chisquare(frecuencias, n * probs)
+    assert resultados["Costo fijo mensual"]["p_valor"] == pytest.approx(esperado.pvalue, rel=1e-9)
+
+    esperado = stats.kstest(precio, "norm", method="exact",
+                            args=(parametros["precio_mu"], parametros["precio_sigma"]))
+    ks = resultados["Precio de venta"]
+    assert ks["estadistico"] == pytest.approx(esperado.statistic, rel=1e-12)
+    assert ks["p_valor"] == pytest.approx(esperado.pvalue, rel=1e-6)
+
+
+def test_valores_criticos():
+    _, critico, p_valor, gl = prueba_chi_cuadrado([10, 10, 10, 10], [0.25] * 4)
+    assert critico == pytest.approx(7.814727903251178)
+    assert (p_valor, gl) == (1.0, 3)
+
+    critico, p_valor = prueba_kolmogorov_smirnov(0.0, 100)
+    assert critico == pytest.approx(stats.kstwo.ppf(0.95, 100))
+    assert p_valor == 1.0
+
+
+def test_validacion_en_linea_igual_a_la_muestra_completa(parametros):
+    n = 6000
+    muestra = muestrear_entradas(parametros, n, np.random.default_rng(8))
+    directa = validar_aleatorios(parametros, n, semilla=8)
+
+    en_linea = ValidacionEnLinea(parametros)
+    for desde in range(0, n, 2500):
+        bloque = (x[desde:desde + 2500] for x in muestra)
+        en_linea.combinar(ValidacionEnLinea(parametros).agregar(*bloque))
+    resultados = ValidacionEnLinea.desde_dict(en_linea.a_dict()).resultados()
+
+    for variable in ("Demanda", "Costo variable unitario", "Costo fijo mensual"):
+        assert resultados[variable]["estadistico"] == pytest.approx(directa[variable]["estadistico"])
+        assert resultados[variable]["p_valor"] == pytest.approx(directa[variable]["p_valor"])
+    # KS evaluada en los bordes de las clases finas
+    tolerancia = 1 / en_linea.resolucion + en_linea.precio.max() / n
+    assert resultados["Precio de venta"]["estadistico"] == pytest.approx(
+        directa["Precio de venta"]["estadistico"], abs=tolerancia)
+
+
+def test_la_simulacion_valida_las_entradas_que_uso(parametros):
+    serie = correr_simulacion_lote(parametros, 2 * TAMANO_BLOQUE + 10, semilla=1, validar=True)
+    paralelo = correr_simulacion_lote(parametros, 2 * TAMANO_BLOQUE + 10, semilla=1, validar=True,
+                                      workers=2)
+
+    assert serie.validacion.n == 2 * TAMANO_BLOQUE + 10
+    assert serie.validacion.a_dict() == paralelo.validacion.a_dict()
+    assert all(r["acepta"] for r in serie.validacion.resultados().values())